@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+World Bank Availability Probe
+Answers "does this country have recent data for this indicator?" for a
+whole country x indicator grid at once
+
+Answered from the history store (see history_store.py): each indicator's
+full history is fetched once for every country, so a 40 x 50 grid costs at
+most 50 requests instead of 2,000, and re-running a probe with any other
+year window or country list costs none. Duplicate indicator codes are
+probed once.
+
+Results come back as NumPy matrices (rows = countries, columns = indicators):
+- available: bool, a non-empty value exists in the window
+- years:     int16, year of the most recent value (0 where unavailable)
+- values:    float64, the most recent value (NaN where unavailable)
+
+Usage:
+    from availability_probe import probe_availability
+    grid = probe_availability(["USA", "CHN"], ["SP.POP.TOTL", "IT.NET.USER.ZS"], 2020, 2024)
+    grid.available.sum(axis=1)                  # indicators available per country
+    has_data, value, year = grid.cell("USA", "SP.POP.TOTL")
+"""
+
+import numpy as np
+
+from history_store import get_history_store
+
+
+class AvailabilityGrid:
+    def __init__(self, countries, indicators):
+        self.countries = list(countries)
+        self.indicators = list(indicators)
+        self.country_index = {code: i for i, code in enumerate(self.countries)}
+        self.indicator_index = {code: j for j, code in enumerate(self.indicators)}
+
+        shape = (len(self.countries), len(self.indicators))
+        self.available = np.zeros(shape, dtype=bool)
+        self.years = np.zeros(shape, dtype=np.int16)
+        self.values = np.full(shape, np.nan)
+        self.failed = []  # (indicator, [countries]) that could not be fetched
+
+    def set(self, country, indicator, value, year):
+        i = self.country_index[country]
+        j = self.indicator_index[indicator]
+        self.available[i, j] = True
+        self.years[i, j] = int(year[:4])
+        self.values[i, j] = value
+
+    def cell(self, country, indicator):
+        """(has_data, value, year) for one pair, like the old per-pair helpers"""
+        i = self.country_index[country]
+        j = self.indicator_index[indicator]
+        if not self.available[i, j]:
+            return False, None, None
+        return True, float(self.values[i, j]), str(self.years[i, j])
+
+    def columns(self, indicators):
+        """Column indices for a list of indicator codes (repeats allowed)"""
+        return [self.indicator_index[code] for code in indicators]
+
+    def coverage(self, indicators=None, min_year=None):
+        """Available count per country, optionally over a subset of indicators
+        (repeated codes count once per occurrence) and newer than min_year"""
+        mask = self.available
+        if min_year is not None:
+            mask = mask & (self.years >= min_year)
+        if indicators is not None:
+            mask = mask[:, self.columns(indicators)]
+        return mask.sum(axis=1)
+
+
+def probe_availability(country_codes, indicator_codes, start_year=2020, end_year=2024,
+                       max_workers=8, store=None):
+    """Probe every country x indicator pair in start_year..end_year
+
+    Returns an AvailabilityGrid. Indicators that could not be fetched are
+    left unavailable and listed in grid.failed.
+    """
+    store = store or get_history_store()
+    countries = list(dict.fromkeys(country_codes))
+    indicators = list(dict.fromkeys(indicator_codes))
+    grid = AvailabilityGrid(countries, indicators)
+
+    failed = set(store.ensure(indicators, max_workers=max_workers))
+    for indicator in indicators:
+        if indicator in failed:
+            grid.failed.append((indicator, countries))
+            continue
+        for country, latest in store.latest(indicator, countries, start_year, end_year).items():
+            if latest is not None:
+                grid.set(country, indicator, *latest)
+
+    return grid
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+HTTP/2 vs HTTP/1.1 Benchmark
+Fires the same batch of indicator requests through the shared client's
+HTTP/1.1 pool and through the HTTP/2 transport, and compares them
+
+Reports wall time, throughput, latency percentiles, status counts and, when
+the server is the local stand-in, how many connections it had to accept.
+The response cache is off, so every request goes over the wire.
+
+Usage:
+    # Against the live API (both protocols on the same URL)
+    python benchmark_http2.py --requests 200 --concurrency 32
+
+    # Against the stand-in: one HTTP/1.1 and one HTTP/2 instance
+    python world_bank_stand_in.py --latency 80 &
+    python world_bank_stand_in.py --latency 80 --port 8766 --http2 &
+    python benchmark_http2.py --http1-url http://127.0.0.1:8765/v2 --http2-url http://127.0.0.1:8766/v2
+"""
+
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from http_client import HttpClient
+from world_bank_batch import BASE_URL
+
+
+def server_connections(client, base_url):
+    """Connections the stand-in has accepted so far (None for other servers)"""
+    root = base_url.rsplit("/v2", 1)[0]
+    try:
+        response = client.fetch(f"{root}/__stats", timeout=5)
+        return response.json().get("connections") if response.status_code == 200 else None
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def indicator_codes(client, base_url, count):
+    """First `count` indicator codes of the catalogue, to spread requests"""
+    response = client.fetch(f"{base_url}/indicator", {"format": "json", "per_page": count})
+    response.raise_for_status()
+    data = response.json()
+    return [indicator["id"] for indicator in data[1]] if len(data) > 1 and data[1] else ["SP.POP.TOTL"]
+
+
+def run_benchmark(base_url, http2, n_requests, concurrency, rate, codes):
+    """Time n_requests GETs at the given concurrency; returns a result dict"""
+    client = HttpClient(
+        cache=None,
+        http2=http2,
+        pool_size=concurrency,
+        per_host_limit=concurrency,
+        limiter_options={"rate": rate, "concurrency": concurrency, "max_concurrency": concurrency}
+    )
+    connections_before = server_connections(client, base_url)
+
+    def timed_get(i):
+        url = f"{base_url}/country/all/indicator/{codes[i % len(codes)]}"
+        # Distinct pages keep every URL unique, so nothing is coalesced
+        params = {"format": "json", "date": "2020:2024", "per_page": 1000, "page": 1 + i // len(codes)}
+        start = time.perf_counter()
+        try:
+            response = client.get(url, params)
+            response.content
+            return time.perf_counter() - start, response.status_code, getattr(response, "http_version", "HTTP/1.1")
+        except requests.RequestException as e:
+            return time.perf_counter() - start, type(e).__name__, None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed_get, range(n_requests)))
+    elapsed = time.perf_counter() - start
+
+    connections_after = server_connections(client, base_url)
+    client.session.close()
+
+    latencies = sorted(latency for latency, _, _ in results)
+    opened = None
+    if connections_before is not None and connections_after is not None:
+        opened = connections_after - connections_before
+
+    return {
+        "transport": "HTTP/2" if http2 else "HTTP/1.1",
+        "elapsed": elapsed,
+        "throughput": n_requests / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "statuses": Counter(status for _, status, _ in results),
+        "versions": Counter(version for _, _, version in results if version),
+        "connections": opened
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTTP/2 against HTTP/1.1 pooling")
+    parser.add_argument("--http1-url", default=BASE_URL, help="API base URL for the HTTP/1.1 run")
+    parser.add_argument("--http2-url", default=BASE_URL, help="API base URL for the HTTP/2 run")
+    parser.add_argument("--requests", type=int, default=200, help="requests per run")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight")
+    parser.add_argument("--rate", type=float, default=100.0, help="starting requests/second for the rate limiter")
+    parser.add_argument("--indicators", type=int, default=50, help="distinct indicators to spread requests over")
+    args = parser.parse_args()
+
+    print("⚡ HTTP/2 vs HTTP/1.1 benchmark")
+    print(f"   {args.requests} requests, {args.concurrency} in flight\n")
+
+    codes = indicator_codes(HttpClient(cache=None), args.http1_url, args.indicators)
+    runs = [
+        run_benchmark(args.http1_url, False, args.requests, args.concurrency, args.rate, codes),
+        run_benchmark(args.http2_url, True, args.requests, args.concurrency, args.rate, codes)
+    ]
+
+    print(f"{'Transport':10} {'Time':>8} {'Req/s':>8} {'p50':>8} {'p95':>8} {'Conns':>6}  Statuses")
+    print("-" * 70)
+    for run in runs:
+        connections = "n/a" if run["connections"] is None else str(run["connections"])
+        print(f"{run['transport']:10} {run['elapsed']:7.2f}s {run['throughput']:8.1f} "
+              f"{run['p50'] * 1000:6.0f}ms {run['p95'] * 1000:6.0f}ms {connections:>6}  "
+              f"{dict(run['statuses'])}")
+    for run in runs:
+        if run["versions"]:
+            print(f"   {run['transport']} responses by protocol: {dict(run['versions'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,17 @@
 Check if 2024 data is available from World Bank
 """
 
-import urllib.request
-import json
 from datetime import datetime
+from http_client import get_json
+from world_bank_batch import BASE_URL
 
 def check_latest_data(country_iso3, indicator_code):
     """Check what years have data available"""
-    url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator_code}"
+    url = f"{BASE_URL}/country/{country_iso3}/indicator/{indicator_code}"
     params = "?format=json&date=2020:2024&per_page=10"
     
     try:
-        with urllib.request.urlopen(url + params, timeout=10) as response:
-            data = json.loads(response.read().decode())
+        data = get_json(url + params, timeout=10)
             
         if len(data) > 1 and data[1]:
             available_years = []
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Check the WDI bulk reader and ingest against a small fixture archive
+fixtures/wdi_sample.zip: 3 countries x 3 indicators, 2019-2022, in the
+WDI_CSV.zip layout (BOM-prefixed CSVs, trailing empty column, one
+all-empty series)
+
+Runs offline; the ingest writes into a temporary directory.
+
+Usage:
+    python check_wdi_bulk.py
+"""
+
+import os
+import sys
+import tempfile
+
+from wdi_bulk import WdiArchive
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "wdi_sample.zip")
+
+EXPECTED_SERIES = {
+    ("FRA", "EG.ELC.ACCS.ZS"): {"2020": 100.0, "2021": 100.0},
+    ("FRA", "NY.GDP.PCAP.CD"): {"2020": 39169.9, "2021": 43659.0},
+    ("FRA", "SP.POP.TOTL"): {"2020": 67571107.0, "2021": 67764304.0},
+    ("KEN", "EG.ELC.ACCS.ZS"): {"2020": 71.4, "2021": 76.5},
+    ("KEN", "NY.GDP.PCAP.CD"): {},
+    ("KEN", "SP.POP.TOTL"): {"2020": 52217334.0, "2021": 53005614.0},
+    ("USA", "EG.ELC.ACCS.ZS"): {"2020": 100.0, "2021": 100.0},
+    ("USA", "NY.GDP.PCAP.CD"): {"2020": 63528.6, "2021": 70219.5},
+    ("USA", "SP.POP.TOTL"): {"2020": 331526933.0, "2021": 332048977.0},
+}
+
+
+def check(label, actual, expected):
+    """Print one result line; True if it matched"""
+    if actual == expected:
+        print(f"✅ {label}")
+        return True
+    print(f"❌ {label}\n   expected: {expected}\n   got:      {actual}")
+    return False
+
+
+def check_archive():
+    """WdiArchive metadata and iter_series on the fixture"""
+    print("🔍 WdiArchive")
+    with WdiArchive(FIXTURE) as wdi:
+        countries = wdi.countries()
+        indicators = wdi.indicators()
+        series = list(wdi.iter_series(2020, 2021))
+
+    results = [
+        check("countries", sorted(countries), ["FRA", "KEN", "USA"]),
+        check("country metadata", countries["KEN"]["name"] + " / " + countries["KEN"]["iso2Code"], "Kenya / KE"),
+        check("indicators", sorted(indicators), ["EG.ELC.ACCS.ZS", "NY.GDP.PCAP.CD", "SP.POP.TOTL"]),
+        check("indicator topics", indicators["SP.POP.TOTL"]["topics"], ["Health: Population: Structure"]),
+        check("rows grouped by country", [country for country, _, _ in series][::3], ["FRA", "KEN", "USA"]),
+        check("series for 2020-2021", {(country, ind): values for country, ind, values in series}, EXPECTED_SERIES),
+    ]
+    return all(results)
+
+
+def check_ingest():
+    """ingest_wdi_archive into a scratch directory, read back from the cube"""
+    print("\n🔍 WorldBankCompleteDownloader.ingest_wdi_archive")
+    # Imported here: the ingest needs pyarrow, the reader check does not
+    from world_bank_full_download import WorldBankCompleteDownloader
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        # Unsharded progress files are written to the working directory
+        os.chdir(scratch)
+        try:
+            downloader = WorldBankCompleteDownloader()
+            downloader.ingest_wdi_archive(FIXTURE, 2020, 2021)
+            downloader.journal.close()
+            usa = downloader.cube.country("USA")
+            population = downloader.cube.indicator("SP.POP.TOTL")
+            results = [
+                check("completed pairs", downloader.done.completed_count, 8),
+                check("empty pairs recorded as failed", downloader.done.failed_count, 1),
+                check("pending pairs", downloader.is_pending("KEN", "NY.GDP.PCAP.CD"), False),
+                check("by-country view", usa, {
+                    ind: values for (country, ind), values in EXPECTED_SERIES.items() if country == "USA"
+                }),
+                check("by-indicator view", population, {
+                    country: values for (country, ind), values in EXPECTED_SERIES.items() if ind == "SP.POP.TOTL"
+                }),
+                check("one compacted file per indicator",
+                      [len(downloader.cube._files(ind)) for ind in downloader.cube.indicators()], [1, 1, 1]),
+            ]
+        finally:
+            os.chdir(cwd)
+    return all(results)
+
+
+def main():
+    passed = check_archive()
+    passed = check_ingest() and passed
+    print("\n🎉 All WDI bulk checks passed" if passed else "\n❌ WDI bulk checks failed")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
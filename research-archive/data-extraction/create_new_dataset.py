@@ -4,48 +4,23 @@ Create New Verified Dataset: 40 Countries + 40 Fun Ranking Challenges
 Based on actual World Bank data availability and user preference for "interesting and fun" challenges
 """
 
-import urllib.request
 import json
-import time
 from datetime import datetime
+from availability_probe import probe_availability
 
-def test_indicator_data(country_iso3, indicator_code, timeout=5):
-    """Test if country has data for this indicator"""
-    if country_iso3 == "TWN":  # Taiwan not in World Bank
-        return False, None, None
-        
-    url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator_code}"
-    params = "?format=json&date=2020:2024&per_page=5"
-    
-    try:
-        with urllib.request.urlopen(url + params, timeout=timeout) as response:
-            data = json.loads(response.read().decode())
-            
-        if len(data) > 1 and data[1]:
-            # Find most recent non-null value
-            for entry in data[1]:
-                if entry["value"] is not None:
-                    return True, entry["value"], entry["date"]
-        return False, None, None
-        
-    except:
-        return False, None, None
-
-def get_data_coverage_score(country_iso3, indicators):
+def get_data_coverage_score(grid, country_iso3, indicators):
     """Calculate data coverage score for a country across all indicators"""
+    indicators = list(indicators)
     total_indicators = len(indicators)
-    available_count = 0
-    recent_count = 0  # 2022+ data
     
     print(f"    Testing {total_indicators} indicators...", end=" ")
     
-    for wb_code in indicators:
-        has_data, value, year = test_indicator_data(country_iso3, wb_code)
-        if has_data:
-            available_count += 1
-            if year and int(year) >= 2022:
-                recent_count += 1
-        time.sleep(0.1)  # Rate limiting
+    if country_iso3 not in grid.country_index:  # Taiwan not in World Bank
+        available_count = recent_count = 0
+    else:
+        i = grid.country_index[country_iso3]
+        available_count = int(grid.coverage(indicators)[i])
+        recent_count = int(grid.coverage(indicators, min_year=2022)[i])  # 2022+ data
     
     coverage_score = (available_count / total_indicators) * 100
     recency_score = (recent_count / total_indicators) * 100 if available_count > 0 else 0
@@ -129,11 +104,13 @@ def main():
     
     print(f"\n🌍 Testing data coverage for {len(candidate_countries)} candidate countries...")
     
+    grid = probe_availability([iso3 for iso3 in candidate_countries if iso3 != "TWN"],
+                              fun_indicators.keys(), 2020, 2024)
     country_scores = {}
     
     for iso3, name in candidate_countries.items():
         print(f"\n🌍 {name} ({iso3}):")
-        coverage, recency, available = get_data_coverage_score(iso3, fun_indicators.keys())
+        coverage, recency, available = get_data_coverage_score(grid, iso3, fun_indicators.keys())
         
         # Calculate composite score (coverage weighted higher than recency)
         composite_score = (coverage * 0.7) + (recency * 0.3)
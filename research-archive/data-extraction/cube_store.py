@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Columnar Cube Store
+Every downloaded (country, indicator, date) observation in one Parquet
+dataset, partitioned by indicator
+
+The complete downloader used to write each result twice in two
+orientations (by_country/*.json + .csv, by_indicator/*.json + .csv), so
+any question across countries or indicators meant re-reading thousands
+of files. The cube keeps one copy and answers both views as queries:
+
+    <root>/indicator=SP.POP.TOTL/part-<seq>.parquet   columns: country, date, value
+
+- country and date are dictionary-encoded (and indicator, in query
+  results), values are float64; files are zstd-compressed
+- append() buffers series in memory and writes them out as new part files
+  once flush_rows observations are pending (or on flush())
+- A pair written again replaces its older rows: within a partition, the
+  newest part file holding a country wins
+- compact() rewrites each partition into a single file; absorb() copies
+  another cube's parts in (shard merge)
+- on_flush, if given, is called after every flush (with the cube's lock
+  held), so an owner can record as done only what is already on disk
+
+Needs pyarrow: pip install pyarrow
+
+Usage:
+    cube = CubeStore("world_bank_complete_data/cube")
+    cube.append("USA", "SP.POP.TOTL", {"2023": 334914895, "2022": 333271411})
+    cube.flush()
+    cube.country("USA")           # {indicator: {date: value}}
+    cube.indicator("SP.POP.TOTL") # {country: {date: value}}
+    cube.table(indicator_codes=[...], country_codes=[...])   # pyarrow Table
+"""
+
+import itertools
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+DEFAULT_FLUSH_ROWS = 500_000
+PARTITION_PREFIX = "indicator="
+
+
+class CubeStore:
+    def __init__(self, root, flush_rows=DEFAULT_FLUSH_ROWS, on_flush=None):
+        if pa is None:
+            raise ImportError("The cube store needs pyarrow: pip install pyarrow")
+        self.root = root
+        self.flush_rows = flush_rows
+        self.on_flush = on_flush
+        self.pending = {}  # indicator -> {country: {date: value}}
+        self.pending_rows = 0
+        self.lock = threading.Lock()
+        self.sequence = itertools.count()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _partition_dir(self, indicator_code):
+        return os.path.join(self.root, f"{PARTITION_PREFIX}{indicator_code}")
+
+    def _part_path(self, indicator_code):
+        """New part file name; names sort in write order"""
+        name = f"part-{time.time_ns():020d}-{os.getpid()}-{next(self.sequence):06d}.parquet"
+        return os.path.join(self._partition_dir(indicator_code), name)
+
+    def _files(self, indicator_code):
+        """Part files of a partition, oldest first"""
+        try:
+            names = os.listdir(self._partition_dir(indicator_code))
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(self._partition_dir(indicator_code), name)
+            for name in sorted(names) if name.startswith("part-") and name.endswith(".parquet")
+        ]
+
+    def indicators(self):
+        """Indicators with data on disk"""
+        return sorted(
+            entry.name[len(PARTITION_PREFIX):] for entry in os.scandir(self.root)
+            if entry.is_dir() and entry.name.startswith(PARTITION_PREFIX)
+            and self._files(entry.name[len(PARTITION_PREFIX):])
+        )
+
+    def is_empty(self):
+        with self.lock:
+            return not self.pending and not self.indicators()
+
+    def append(self, country_code, indicator_code, series):
+        """Queue a pair's {date: value} series (replacing any earlier one)"""
+        if not series:
+            return
+        with self.lock:
+            by_country = self.pending.setdefault(indicator_code, {})
+            self.pending_rows += len(series) - len(by_country.get(country_code, {}))
+            by_country[country_code] = series
+            if self.pending_rows >= self.flush_rows:
+                self._flush()
+
+    def flush(self):
+        """Write every queued series to disk"""
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        for indicator_code, by_country in self.pending.items():
+            countries, dates, values = [], [], []
+            for country_code in sorted(by_country):
+                for date, value in sorted(by_country[country_code].items()):
+                    countries.append(country_code)
+                    dates.append(date)
+                    values.append(value)
+            self._write(indicator_code, pa.table({
+                "country": pa.array(countries).dictionary_encode(),
+                "date": pa.array(dates).dictionary_encode(),
+                "value": pa.array(values, pa.float64())
+            }))
+        self.pending = {}
+        self.pending_rows = 0
+        if self.on_flush is not None:
+            self.on_flush()
+
+    def _write(self, indicator_code, table):
+        path = self._part_path(indicator_code)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Dot-prefixed temp files are skipped by _files and by pyarrow datasets
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+
+    def _read_partition(self, indicator_code, country_codes=None):
+        """(country, date, value) rows of a partition, newest pair versions only"""
+        filters = [("country", "in", list(country_codes))] if country_codes is not None else None
+        tables = []
+        seen = set()
+        for path in reversed(self._files(indicator_code)):
+            table = pq.read_table(path, filters=filters, partitioning=None)
+            countries = set(pc.unique(table["country"]).to_pylist())
+            if seen & countries:
+                stale = pc.is_in(table["country"].cast(pa.string()), value_set=pa.array(sorted(seen)))
+                table = table.filter(pc.invert(stale))
+            seen |= countries
+            tables.append(table)
+        if not tables:
+            return None
+        return pa.concat_tables(reversed(tables)) if len(tables) > 1 else tables[0]
+
+    def compact(self, indicator_codes=None):
+        """Rewrite partitions with several part files as one file each"""
+        self.flush()
+        compacted = 0
+        for indicator_code in indicator_codes if indicator_codes is not None else self.indicators():
+            files = self._files(indicator_code)
+            if len(files) < 2:
+                continue
+            table = self._read_partition(indicator_code)
+            # Arrow can't sort dictionary columns; re-encoding also drops replaced entries
+            table = pa.table({
+                "country": table["country"].cast(pa.string()),
+                "date": table["date"].cast(pa.string()),
+                "value": table["value"]
+            }).sort_by([("country", "ascending"), ("date", "ascending")]).combine_chunks()
+            table = pa.table({
+                "country": table["country"].dictionary_encode(),
+                "date": table["date"].dictionary_encode(),
+                "value": table["value"]
+            })
+            # The new file is the newest, so readers see the same data before the old ones go
+            self._write(indicator_code, table)
+            for path in files:
+                os.remove(path)
+            compacted += 1
+        return compacted
+
+    def absorb(self, other):
+        """Copy another cube's part files in, as newer than everything here"""
+        other.flush()
+        copied = 0
+        for indicator_code in other.indicators():
+            for source in other._files(indicator_code):
+                path = self._part_path(indicator_code)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+                shutil.copyfile(source, tmp_path)
+                os.replace(tmp_path, path)
+                copied += 1
+        return copied
+
+    def table(self, indicator_codes=None, country_codes=None, max_workers=8):
+        """(indicator, country, date, value) Table for the given indicators/countries (all if None)
+
+        Single-file partitions (all of them after compact()) are read in one
+        dataset scan; partitions with several parts are deduplicated one by one.
+        """
+        self.flush()
+        indicator_codes = self.indicators() if indicator_codes is None else list(indicator_codes)
+        single, multiple = [], []
+        for indicator_code in indicator_codes:
+            files = self._files(indicator_code)
+            if len(files) == 1:
+                single.extend(files)
+            elif files:
+                multiple.append(indicator_code)
+
+        tables = []
+        if single:
+            dataset = ds.dataset(single, format="parquet", partition_base_dir=self.root,
+                                 partitioning=ds.HivePartitioning.discover(infer_dictionary=True))
+            condition = ds.field("country").isin(list(country_codes)) if country_codes is not None else None
+            tables.append(dataset.to_table(columns=["indicator", "country", "date", "value"], filter=condition))
+
+        def read(indicator_code):
+            table = self._read_partition(indicator_code, country_codes)
+            indicator = pa.repeat(pa.scalar(indicator_code), table.num_rows).dictionary_encode()
+            return table.add_column(0, "indicator", indicator)
+
+        if multiple:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(multiple)))) as executor:
+                tables.extend(executor.map(read, multiple))
+
+        dictionary = pa.dictionary(pa.int32(), pa.string())
+        schema = pa.schema([("indicator", dictionary), ("country", dictionary),
+                            ("date", dictionary), ("value", pa.float64())])
+        if not tables:
+            return schema.empty_table()
+        return pa.concat_tables([table.cast(schema) for table in tables]).unify_dictionaries()
+
+    def country(self, country_code, indicator_codes=None):
+        """By-country view: {indicator: {date: value}}"""
+        table = self.table(indicator_codes, [country_code])
+        view = {}
+        for indicator_code, date, value in zip(table["indicator"].to_pylist(), table["date"].to_pylist(),
+                                               table["value"].to_pylist()):
+            view.setdefault(indicator_code, {})[date] = value
+        return view
+
+    def indicator(self, indicator_code, country_codes=None):
+        """By-indicator view: {country: {date: value}}"""
+        table = self.table([indicator_code], country_codes)
+        view = {}
+        for country_code, date, value in zip(table["country"].to_pylist(), table["date"].to_pylist(),
+                                             table["value"].to_pylist()):
+            view.setdefault(country_code, {})[date] = value
+        return view
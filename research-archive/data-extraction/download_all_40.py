@@ -3,21 +3,20 @@
 Download World Bank data for ALL 40 countries
 """
 
-import urllib.request
 import json
-import time
+from http_client import get_json
+from world_bank_batch import BASE_URL
 
 def fetch_world_bank_data(country_iso3, indicator_code):
     """Fetch data from World Bank API"""
     if country_iso3 == "TWN":  # Taiwan not in World Bank
         return None
         
-    url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator_code}"
+    url = f"{BASE_URL}/country/{country_iso3}/indicator/{indicator_code}"
     params = "?format=json&date=2020:2023&per_page=10"
     
     try:
-        with urllib.request.urlopen(url + params, timeout=10) as response:
-            data = json.loads(response.read().decode())
+        data = get_json(url + params, timeout=10)
             
         if len(data) > 1 and data[1]:
             # Find most recent non-null value
@@ -69,8 +68,6 @@ def main():
                 print(f"✓ {value}")
             else:
                 print("❌ No data")
-            
-            time.sleep(0.5)  # Rate limiting
         
         if country_data:
             results[code] = country_data
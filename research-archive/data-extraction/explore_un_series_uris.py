@@ -4,9 +4,9 @@ Explore UN Series URIs to understand correct data endpoint format
 Step 5c: Analyze Series List to find data endpoint patterns
 """
 
-import urllib.request
 import json
 import time
+from http_client import get
 
 def analyze_series_uris():
     """Analyze URI patterns from UN Series List"""
@@ -15,8 +15,8 @@ def analyze_series_uris():
     
     # Get series list
     try:
-        with urllib.request.urlopen("https://unstats.un.org/SDGAPI/v1/sdg/Series/List", timeout=15) as response:
-            series_data = json.loads(response.read().decode())
+        response = get("https://unstats.un.org/SDGAPI/v1/sdg/Series/List", timeout=15)
+        series_data = response.json()
         
         print(f"✅ Retrieved {len(series_data)} series")
         
@@ -84,37 +84,35 @@ def test_data_endpoints_from_uris(series_data):
             print(f"\n  Format {i}: {endpoint}")
             
             try:
-                with urllib.request.urlopen(endpoint, timeout=10) as response:
-                    if response.status == 200:
-                        content = response.read().decode()
-                        print(f"    ✅ SUCCESS - Response length: {len(content)} chars")
+                response = get(endpoint, timeout=10)
+                if response.status_code == 200:
+                    content = response.text
+                    print(f"    ✅ SUCCESS - Response length: {len(content)} chars")
+                    
+                    try:
+                        data = json.loads(content)
+                        if isinstance(data, dict):
+                            print(f"    📊 JSON object with keys: {list(data.keys())}")
+                            if 'data' in data:
+                                print(f"        Data records: {len(data['data'])}")
+                        elif isinstance(data, list):
+                            print(f"    📊 JSON array with {len(data)} items")
                         
-                        try:
-                            data = json.loads(content)
-                            if isinstance(data, dict):
-                                print(f"    📊 JSON object with keys: {list(data.keys())}")
-                                if 'data' in data:
-                                    print(f"        Data records: {len(data['data'])}")
-                            elif isinstance(data, list):
-                                print(f"    📊 JSON array with {len(data)} items")
-                            
-                            working_endpoints.append({
-                                "series_code": code,
-                                "endpoint": endpoint, 
-                                "format": format_template,
-                                "response_length": len(content)
-                            })
-                            
-                        except json.JSONDecodeError:
-                            print("    📊 Not JSON format")
-                            
-                    else:
-                        print(f"    ❌ HTTP {response.status}")
+                        working_endpoints.append({
+                            "series_code": code,
+                            "endpoint": endpoint, 
+                            "format": format_template,
+                            "response_length": len(content)
+                        })
                         
+                    except json.JSONDecodeError:
+                        print("    📊 Not JSON format")
+                        
+                else:
+                    print(f"    ❌ HTTP {response.status_code}")
+                    
             except Exception as e:
                 print(f"    ❌ ERROR: {e}")
-            
-            time.sleep(0.5)
     
     return working_endpoints
 
@@ -136,30 +134,28 @@ def test_alternative_approaches():
     for endpoint in alternative_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            with urllib.request.urlopen(endpoint, timeout=10) as response:
-                if response.status == 200:
-                    content = response.read().decode()
-                    print(f"✅ SUCCESS - Response length: {len(content)} chars")
+            response = get(endpoint, timeout=10)
+            if response.status_code == 200:
+                content = response.text
+                print(f"✅ SUCCESS - Response length: {len(content)} chars")
+                
+                try:
+                    data = json.loads(content)
+                    if isinstance(data, dict):
+                        print(f"📊 JSON object with keys: {list(data.keys())}")
+                    elif isinstance(data, list):
+                        print(f"📊 JSON array with {len(data)} items")
                     
-                    try:
-                        data = json.loads(content)
-                        if isinstance(data, dict):
-                            print(f"📊 JSON object with keys: {list(data.keys())}")
-                        elif isinstance(data, list):
-                            print(f"📊 JSON array with {len(data)} items")
-                        
-                        working_alternatives.append(endpoint)
-                        
-                    except json.JSONDecodeError:
-                        print("📊 Not JSON format")
-                        
-                else:
-                    print(f"❌ HTTP {response.status}")
+                    working_alternatives.append(endpoint)
                     
+                except json.JSONDecodeError:
+                    print("📊 Not JSON format")
+                    
+            else:
+                print(f"❌ HTTP {response.status_code}")
+                
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(1)
     
     return working_alternatives
 
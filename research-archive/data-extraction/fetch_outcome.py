@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Fetch Outcomes
+Classifies a failed World Bank fetch so it is neither skipped for good nor
+re-downloaded for nothing
+
+- empty:     the API answered but there is no data -> record the pair as
+             done (a re-run would get the same answer)
+- transient: throttled after retries, 5xx, timeout, dropped connection,
+             truncated body -> retry later, never record as done
+- permanent: other 4xx -> record as done, don't retry
+
+World Bank error payloads ([{"message": [{"id", "key", "value"}]}]) come
+with status 200 and are classified by message id: service unavailable
+and unexpected errors are transient, invalid values/indicators permanent.
+Only a real [meta, null] page is empty.
+
+Fetch helpers raise TransientFetchError / PermanentFetchError (both are
+IOErrors, so existing `except IOError` handlers keep working).
+"""
+
+import requests
+
+EMPTY = "empty"
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+TRANSIENT_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+# World Bank API message ids: 105 service currently unavailable, 199 unexpected error
+TRANSIENT_MESSAGE_IDS = ("105", "199")
+
+
+class FetchError(IOError):
+    kind = TRANSIENT
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class TransientFetchError(FetchError):
+    """Worth retrying later"""
+    kind = TRANSIENT
+
+
+class PermanentFetchError(FetchError):
+    """Will fail the same way on retry"""
+    kind = PERMANENT
+
+
+def classify_status(status):
+    """Outcome of a non-200 HTTP status"""
+    if status in TRANSIENT_STATUSES or status >= 500:
+        return TRANSIENT
+    return PERMANENT
+
+
+def classify_error(error):
+    """Outcome of an exception raised while fetching"""
+    if isinstance(error, FetchError):
+        return error.kind
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return classify_status(error.response.status_code)
+    # requests errors are IOErrors; ValueError is an unparseable (cut off) body
+    if isinstance(error, (IOError, TimeoutError, ValueError)):
+        return TRANSIENT
+    return PERMANENT
+
+
+def fetch_error(message, status=None, cause=None):
+    """FetchError of the right kind for a status code or an exception"""
+    if status is not None:
+        kind = classify_status(status)
+    elif cause is not None:
+        kind = classify_error(cause)
+    else:
+        kind = TRANSIENT
+    error_class = TransientFetchError if kind == TRANSIENT else PermanentFetchError
+    return error_class(message, status)
+
+
+def api_error_messages(data):
+    """The message list of a World Bank error payload, or None for any other body"""
+    if isinstance(data, list) and data and isinstance(data[0], dict) and "message" in data[0]:
+        return data[0]["message"] or []
+    return None
+
+
+def api_error(message, api_messages):
+    """FetchError for a World Bank error payload, classified by message id"""
+    ids = [str(entry.get("id")) for entry in api_messages]
+    details = "; ".join(f"{entry.get('id')} {entry.get('value') or entry.get('key')}" for entry in api_messages)
+    if not ids or any(message_id in TRANSIENT_MESSAGE_IDS for message_id in ids):
+        return TransientFetchError(f"{message}: {details or 'API error'}")
+    return PermanentFetchError(f"{message}: {details}")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Pre-Flight Fetch Planner
+Works out exactly which requests a complete download still needs before
+sending any of them
+
+For every indicator the planner takes the pairs still pending (progress
+bitmap, journal and shard ownership via downloader.is_pending), which is
+everything a resumed run reuses, then picks the cheaper of two ways to
+fetch them:
+- batch: multi-country requests for just the pending countries
+  (DEFAULT_BATCH_SIZE countries each, 1,000 rows per page)
+- bulk:  country/all pages (20,000 rows each), one or two requests for
+  every country at once
+
+Indicators with no pending pairs get no requests at all.
+
+The estimate uses the requests/second observed on the last planned run
+(stored in the progress file), falling back to the rate limiter's rate.
+
+Usage:
+    plan = plan_fetch(downloader)
+    plan.describe(downloader.planned_throughput())
+    downloader.download_all_parallel(plan=plan)
+"""
+
+import math
+from datetime import timedelta
+
+from history_store import CURRENT_YEAR, FIRST_YEAR
+from world_bank_batch import DEFAULT_BATCH_SIZE, chunked
+
+BATCH = "batch"
+BULK = "bulk"
+BATCH_PER_PAGE = 1000
+BULK_PER_PAGE = 20000
+
+
+class PlanUnit:
+    """One scheduler unit: an indicator for some countries, fetched one way"""
+
+    def __init__(self, indicator, countries, mode, requests):
+        self.indicator = indicator
+        self.countries = countries
+        self.mode = mode
+        self.requests = requests
+
+
+class FetchPlan:
+    def __init__(self, start_year, end_year, batch_size):
+        self.start_year = start_year
+        self.end_year = end_year
+        self.batch_size = batch_size
+        self.units = []
+        self.skipped_indicators = 0
+
+    @property
+    def pairs(self):
+        return sum(len(unit.countries) for unit in self.units)
+
+    @property
+    def requests(self):
+        return sum(unit.requests for unit in self.units)
+
+    def count(self, mode):
+        """(units, requests) using one fetch mode"""
+        units = [unit for unit in self.units if unit.mode == mode]
+        return len(units), sum(unit.requests for unit in units)
+
+    def estimate_seconds(self, requests_per_second):
+        return self.requests / requests_per_second if requests_per_second else None
+
+    def describe(self, requests_per_second=None):
+        """Print the plan summary"""
+        print(f"\n🧭 Fetch plan ({self.start_year}-{self.end_year})")
+        print(f"   Pairs to fetch: {self.pairs:,} "
+              f"({self.skipped_indicators:,} indicators already complete)")
+        batch_units, batch_requests = self.count(BATCH)
+        bulk_units, bulk_requests = self.count(BULK)
+        print(f"   Multi-country batches: {batch_units:,} units, {batch_requests:,} requests")
+        print(f"   country/all bulk:      {bulk_units:,} indicators, {bulk_requests:,} requests")
+        seconds = self.estimate_seconds(requests_per_second)
+        if seconds is not None:
+            print(f"   Estimated time: {timedelta(seconds=round(seconds))} "
+                  f"at {requests_per_second:.1f} requests/s")
+
+
+def pages(rows, per_page):
+    return max(1, math.ceil(rows / per_page))
+
+
+def plan_fetch(downloader, start_year=FIRST_YEAR, end_year=CURRENT_YEAR, batch_size=DEFAULT_BATCH_SIZE):
+    """Plan the remaining requests of a WorldBankCompleteDownloader run"""
+    plan = FetchPlan(start_year, end_year, batch_size)
+    years = end_year - start_year + 1
+    # country/all returns every country and aggregate in the catalogue
+    bulk_rows = len(downloader.countries) * years
+
+    for ind_code in downloader.indicators:
+        pending = [
+            country_code for country_code in downloader.countries
+            if downloader.is_pending(country_code, ind_code)
+        ]
+        if not pending:
+            plan.skipped_indicators += 1
+            continue
+
+        batch_units = [
+            PlanUnit(ind_code, batch, BATCH, pages(len(batch) * years, BATCH_PER_PAGE))
+            for batch in chunked(pending, batch_size)
+        ]
+        bulk_unit = PlanUnit(ind_code, pending, BULK, pages(bulk_rows, BULK_PER_PAGE))
+
+        # Ties go to batches: smaller responses holding only pending countries
+        if bulk_unit.requests < sum(unit.requests for unit in batch_units):
+            plan.units.append(bulk_unit)
+        else:
+            plan.units.extend(batch_units)
+
+    return plan
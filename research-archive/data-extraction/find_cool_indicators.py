@@ -3,18 +3,16 @@
 Find the most interesting and fun World Bank indicators
 """
 
-import urllib.request
-import json
-import time
+from http_client import get_json
+from world_bank_batch import BASE_URL
 
 def search_indicators(keyword):
     """Search for indicators by keyword"""
-    url = f"https://api.worldbank.org/v2/indicator"
+    url = f"{BASE_URL}/indicator"
     params = f"?format=json&per_page=50&source=2"  # World Development Indicators
     
     try:
-        with urllib.request.urlopen(url + params, timeout=30) as response:
-            data = json.loads(response.read().decode())
+        data = get_json(url + params, timeout=30)
             
         if len(data) > 1:
             results = []
@@ -31,11 +29,10 @@ def search_indicators(keyword):
 
 def get_all_topics():
     """Get all available topics"""
-    url = "https://api.worldbank.org/v2/topic?format=json&per_page=50"
+    url = f"{BASE_URL}/topic?format=json&per_page=50"
     
     try:
-        with urllib.request.urlopen(url, timeout=30) as response:
-            data = json.loads(response.read().decode())
+        data = get_json(url, timeout=30)
             
         if len(data) > 1:
             return [(t["id"], t["value"]) for t in data[1]]
@@ -86,8 +83,6 @@ def main():
                 print(f"  ✓ {r['name']}")
         else:
             print(f"  ❌ No results")
-        
-        time.sleep(0.5)  # Rate limit
     
     # Get some specific known cool indicators
     print("\n\n🌟 KNOWN AWESOME INDICATORS:")
@@ -4,28 +4,9 @@ Full Data Coverage Check: Test all 40 countries against all 40 challenge indicat
 Report exactly which countries are missing which variables
 """
 
-import urllib.request
 import json
 import time
-
-def test_indicator(country_iso3, indicator_code):
-    """Test if country has data for this specific indicator"""
-    url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator_code}"
-    params = "?format=json&date=2020:2024&per_page=3"
-    
-    try:
-        with urllib.request.urlopen(url + params, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            
-        if len(data) > 1 and data[1]:
-            # Find most recent non-null value
-            for entry in data[1]:
-                if entry["value"] is not None:
-                    return True, entry["value"], entry["date"]
-        return False, None, None
-        
-    except:
-        return False, None, None
+from availability_probe import probe_availability
 
 def main():
     print("📊 FULL DATA COVERAGE CHECK: 40 Countries × 40 Indicators")
@@ -90,6 +71,11 @@ def main():
     print(f"Total data points to check: {len(countries) * len(challenge_indicators)}")
     print()
     
+    # One batched probe for the whole grid instead of a request per pair
+    grid = probe_availability([iso3 for iso3, _ in countries],
+                              [wb_code for wb_code, _ in challenge_indicators.values()],
+                              2020, 2024)
+    
     country_results = {}
     overall_missing = {}
     
@@ -100,7 +86,7 @@ def main():
         available_count = 0
         
         for challenge_id, (wb_code, description) in challenge_indicators.items():
-            has_data, value, year = test_indicator(iso3, wb_code)
+            has_data, value, year = grid.cell(iso3, wb_code)
             
             if has_data:
                 available_count += 1
@@ -116,8 +102,6 @@ def main():
                     overall_missing[wb_code] = {"count": 0, "countries": []}
                 overall_missing[wb_code]["count"] += 1
                 overall_missing[wb_code]["countries"].append(country_name)
-            
-            time.sleep(0.05)  # Rate limiting
         
         missing_count = len(missing_indicators)
         coverage_percent = (available_count / len(challenge_indicators)) * 100
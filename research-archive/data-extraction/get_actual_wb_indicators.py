@@ -4,55 +4,31 @@ Get ACTUAL World Bank indicators - no assumptions
 Query the World Bank API to see what indicators actually exist
 """
 
-import urllib.request
 import json
 import time
+from world_bank_catalogue import load_indicator_catalogue
 
 def get_all_wb_indicators():
     """Get all available World Bank indicators from their API"""
     print("🔍 Fetching ALL World Bank indicators from API...")
     
     all_indicators = []
-    page = 1
-    per_page = 1000
     
-    while True:
-        url = f"https://api.worldbank.org/v2/indicator?format=json&per_page={per_page}&page={page}"
+    try:
+        catalogue = load_indicator_catalogue()
+    except Exception as e:
+        print(f"Error: {e}")
+        return all_indicators
         
-        try:
-            print(f"  Fetching page {page}...", end=" ")
-            with urllib.request.urlopen(url, timeout=10) as response:
-                data = json.loads(response.read().decode())
-            
-            if len(data) > 1 and data[1]:
-                indicators_on_page = len(data[1])
-                print(f"Got {indicators_on_page} indicators")
-                
-                for indicator in data[1]:
-                    all_indicators.append({
-                        "id": indicator["id"],
-                        "name": indicator["name"],
-                        "source": indicator.get("source", {}).get("value", ""),
-                        "topics": [t.get("value", "") for t in indicator.get("topics", [])],
-                        "unit": indicator.get("unit", ""),
-                        "sourceNote": indicator.get("sourceNote", "")[:200]  # Truncate long descriptions
-                    })
-                
-                # Check if we have more pages
-                total_pages = data[0]["pages"]
-                print(f"    (Page {page} of {total_pages})")
-                
-                if page >= total_pages:
-                    break
-                    
-                page += 1
-                time.sleep(0.5)  # Rate limiting
-            else:
-                break
-                
-        except Exception as e:
-            print(f"Error: {e}")
-            break
+    for indicator in catalogue.values():
+        all_indicators.append({
+            "id": indicator["id"],
+            "name": indicator["name"],
+            "source": indicator.get("source", {}).get("value", ""),
+            "topics": [t.get("value", "") for t in indicator.get("topics", [])],
+            "unit": indicator.get("unit", ""),
+            "sourceNote": indicator.get("sourceNote", "")[:200]  # Truncate long descriptions
+        })
     
     return all_indicators
 
@@ -4,32 +4,9 @@ Get latest data for life expectancy and internet penetration only
 Track which year each data point is from
 """
 
-import urllib.request
 import json
-import time
 from datetime import datetime
-
-def fetch_latest_data(country_iso3, indicator_code):
-    """Fetch the most recent available data and its year"""
-    if country_iso3 == "TWN":  # Taiwan not in World Bank
-        return None, None
-        
-    url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator_code}"
-    params = "?format=json&date=2020:2024&per_page=10"
-    
-    try:
-        with urllib.request.urlopen(url + params, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            
-        if len(data) > 1 and data[1]:
-            # Find most recent non-null value
-            for entry in data[1]:
-                if entry["value"] is not None:
-                    return entry["value"], entry["date"]
-        return None, None
-        
-    except Exception as e:
-        return None, None
+from world_bank_latest import fetch_latest_matrix
 
 def main():
     print("🌍 Getting LATEST Life Expectancy & Internet Data")
@@ -52,6 +29,13 @@ def main():
     
     print("\n📊 Checking data years for sample countries:")
     
+    # Taiwan is not in the World Bank
+    sample_iso3 = [
+        countries[code]["iso3"] for code in test_countries
+        if code in countries and countries[code]["iso3"] not in (None, "TWN")
+    ]
+    latest = fetch_latest_matrix(indicators, sample_iso3, min_year=2020)
+    
     for code in test_countries:
         if code in countries:
             country_info = countries[code]
@@ -63,7 +47,7 @@ def main():
             country_data = {}
             
             for wb_code, game_prop in indicators.items():
-                value, year = fetch_latest_data(iso3, wb_code)
+                value, year = latest[wb_code].get(iso3) or (None, None)
                 
                 if value is not None:
                     country_data[f"{game_prop}_value"] = round(float(value), 1)
@@ -71,8 +55,6 @@ def main():
                     print(f"  {game_prop}: {value} ({year})")
                 else:
                     print(f"  {game_prop}: No data")
-                
-                time.sleep(0.5)
             
             results[code] = country_data
     
@@ -4,33 +4,9 @@ Get the LATEST available World Bank data for each indicator
 Tracks which year the data is from
 """
 
-import urllib.request
 import json
-import time
 from datetime import datetime
-
-def fetch_latest_data(country_iso3, indicator_code):
-    """Fetch the most recent available data and its year"""
-    if country_iso3 == "TWN":  # Taiwan not in World Bank
-        return None, None
-        
-    url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator_code}"
-    params = "?format=json&date=2020:2024&per_page=10"
-    
-    try:
-        with urllib.request.urlopen(url + params, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            
-        if len(data) > 1 and data[1]:
-            # Find most recent non-null value
-            for entry in data[1]:
-                if entry["value"] is not None:
-                    return entry["value"], entry["date"]
-        return None, None
-        
-    except Exception as e:
-        print(f"    ❌ Error: {e}")
-        return None, None
+from world_bank_latest import fetch_latest_matrix
 
 def main():
     print("🌍 Getting LATEST World Bank Data for ALL Countries")
@@ -56,6 +32,14 @@ def main():
     results = {}
     data_years = {}  # Track which year each data point is from
     
+    # One server-side "latest value" request per indicator covers every country
+    # (Taiwan is not in the World Bank)
+    api_countries = [
+        info["iso3"] for info in countries.values()
+        if info["iso3"] and info["iso3"] != "TWN"
+    ]
+    latest = fetch_latest_matrix(indicators, api_countries, min_year=2020)
+    
     for code, country_info in countries.items():
         name = country_info["name"]
         iso3 = country_info["iso3"]
@@ -70,8 +54,8 @@ def main():
         country_years = {}
         
         for wb_code, game_prop in indicators.items():
-            print(f"    Fetching {game_prop}...", end=" ")
-            value, year = fetch_latest_data(iso3, wb_code)
+            print(f"    {game_prop}...", end=" ")
+            value, year = latest[wb_code].get(iso3) or (None, None)
             
             if value is not None:
                 # Round appropriately based on indicator type
@@ -86,8 +70,6 @@ def main():
                 print(f"✓ {value} ({year})")
             else:
                 print("❌ No data")
-            
-            time.sleep(0.3)  # Rate limiting
         
         if country_data:
             results[code] = country_data
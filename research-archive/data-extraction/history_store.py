@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+World Bank History Store
+Full time series per (country, indicator), fetched once and queried locally
+
+Fetchers used to bake their own date window into every request
+(2015:2024, 2020:2024, ...), so asking for a different window meant
+downloading again. The store instead fetches an indicator's whole history
+for every country in one country/all request and keeps it on disk; any
+window or latest-value query is then answered without touching the
+network.
+
+- One JSON file per indicator: {"indicator", "base_url", "fetched_at",
+  "series": {country: {year: value}}} with empty values dropped
+- Any base URL other than the public API (e.g. the local stand-in) gets
+  its own subdirectory, and entries fetched from another base URL are
+  never read, so test data can't pass for real data
+- Files older than max_age (default: the response cache TTL) are
+  re-fetched on next use; if that fails the old copy is served
+- refresh=True re-fetches past the response cache
+- Concurrent requests for the same indicator share one fetch
+
+Usage:
+    from history_store import get_history_store
+    store = get_history_store()
+    store.window("SP.POP.TOTL", ["USA", "CHN"], 2015, 2024)   # {country: {year: value}}
+    store.latest("SP.POP.TOTL", ["USA", "CHN"], min_year=2020) # {country: (value, year) or None}
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from http_client import HttpClient, get_client
+from response_cache import DEFAULT_TTL
+from single_flight import SingleFlight
+from world_bank_batch import BASE_URL, PUBLIC_API_URL, entry_country_code, iter_indicator_all_countries
+
+FIRST_YEAR = 1960  # earliest year in World Development Indicators
+CURRENT_YEAR = datetime.now().year
+DEFAULT_HISTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wb_history")
+
+
+def full_history_date():
+    """API date range covering every year the World Bank publishes"""
+    return f"{FIRST_YEAR}:{CURRENT_YEAR}"
+
+
+def store_namespace(base_url):
+    """Subdirectory for a base URL's entries ("" for the public API)"""
+    if base_url.rstrip("/") == PUBLIC_API_URL:
+        return ""
+    parts = urlsplit(base_url)
+    return re.sub(r"[^A-Za-z0-9.-]+", "_", f"{parts.netloc}{parts.path}").strip("_")
+
+
+def in_window(year, start_year=None, end_year=None):
+    """True if an API date string ("2020", "2020Q1", ...) is within the years"""
+    year = int(year[:4])
+    return (start_year is None or year >= start_year) and (end_year is None or year <= end_year)
+
+
+class HistoryStore:
+    def __init__(self, store_dir=DEFAULT_HISTORY_DIR, client=None, base_url=BASE_URL,
+                 max_age=DEFAULT_TTL, timeout=60, max_retries=3, refresh_client=None):
+        self.store_dir = os.path.join(store_dir, store_namespace(base_url))
+        self.http = client or get_client()
+        # No response cache: a forced refresh must reach the network
+        self.refresh_client = refresh_client or HttpClient()
+        self.base_url = base_url.rstrip("/")
+        self.max_age = max_age
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.loaded = {}
+        self.lock = threading.Lock()
+        self.flights = SingleFlight()
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def _path(self, indicator_code):
+        return os.path.join(self.store_dir, f"{indicator_code}.json")
+
+    def _read(self, indicator_code):
+        try:
+            with open(self._path(indicator_code), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Entries from before the stamp are only found in the public API's directory
+        if entry.get("base_url", PUBLIC_API_URL) != self.base_url:
+            return None
+        return entry
+
+    def is_current(self, entry):
+        return self.max_age is None or time.time() - entry["fetched_at"] < self.max_age
+
+    def fetch(self, indicator_code, refresh=False):
+        """Download an indicator's full history for every country and save it
+
+        refresh=True skips the response cache. Raises IOError if the
+        download fails.
+        """
+        series = {}
+        for rows in iter_indicator_all_countries(
+            indicator_code,
+            date=full_history_date(),
+            client=self.refresh_client if refresh else self.http,
+            base_url=self.base_url,
+            timeout=self.timeout,
+            max_retries=self.max_retries
+        ):
+            for entry in rows:
+                if entry["value"] is not None:
+                    series.setdefault(entry_country_code(entry), {})[entry["date"]] = entry["value"]
+
+        entry = {"indicator": indicator_code, "base_url": self.base_url, "fetched_at": time.time(),
+                 "series": series}
+        tmp_path = f"{self._path(indicator_code)}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(indicator_code))
+        return entry
+
+    def _load(self, indicator_code, refresh):
+        entry = None if refresh else self._read(indicator_code)
+        if entry is None or not self.is_current(entry):
+            stale = entry or self._read(indicator_code)
+            try:
+                entry = self.fetch(indicator_code, refresh)
+            except IOError as e:
+                if stale is None:
+                    raise
+                print(f"⚠️  Could not refresh {indicator_code} ({e}), using the stored copy")
+                entry = stale
+        with self.lock:
+            self.loaded[indicator_code] = entry
+        return entry
+
+    def series(self, indicator_code, refresh=False):
+        """{country: {year: value}} for an indicator, fetching it if needed
+
+        Raises IOError if the indicator is not stored and cannot be fetched.
+        """
+        with self.lock:
+            entry = self.loaded.get(indicator_code)
+        if refresh or entry is None or not self.is_current(entry):
+            entry = self.flights.do(indicator_code, lambda: self._load(indicator_code, refresh))
+        return entry["series"]
+
+    def ensure(self, indicator_codes, max_workers=8, refresh=False):
+        """Load (fetching concurrently where needed) several indicators
+
+        Returns the indicators that could not be loaded.
+        """
+        indicator_codes = list(dict.fromkeys(indicator_codes))
+
+        def load(code):
+            try:
+                self.series(code, refresh)
+                return None
+            except IOError as e:
+                print(f"Could not fetch {code}: {e}")
+                return code
+
+        if not indicator_codes:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(indicator_codes)))) as executor:
+            return [code for code in executor.map(load, indicator_codes) if code is not None]
+
+    def window(self, indicator_code, country_codes, start_year=None, end_year=None):
+        """{country: {year: value}} within start_year..end_year (empty dict if none)"""
+        series = self.series(indicator_code)
+        return {
+            country: {
+                year: value for year, value in series.get(country, {}).items()
+                if in_window(year, start_year, end_year)
+            }
+            for country in country_codes
+        }
+
+    def rows(self, indicator_code, country_codes, start_year=None, end_year=None):
+        """{country: [{"date", "value"}]} newest first, like API rows"""
+        return {
+            country: [{"date": year, "value": value} for year, value in sorted(values.items(), reverse=True)]
+            for country, values in self.window(indicator_code, country_codes, start_year, end_year).items()
+        }
+
+    def latest(self, indicator_code, country_codes, min_year=None, max_year=None):
+        """{country: (value, year) or None}: newest value within the years"""
+        latest = {}
+        for country, values in self.window(indicator_code, country_codes, min_year, max_year).items():
+            year = max(values) if values else None
+            latest[country] = (values[year], year) if values else None
+        return latest
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_history_store():
+    """Shared process-wide store (on the shared HTTP client)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore()
+        return _store
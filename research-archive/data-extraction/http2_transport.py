@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+HTTP/2 Transport for the Shared HTTP Client
+Multiplexes concurrent requests over a few connections instead of one
+socket (and handshake) per in-flight request
+
+Drop-in for the requests.Session the client normally uses: get() takes the
+same arguments and returns a requests.Response (streamed or not), and
+httpx errors are re-raised as the matching requests exceptions, so the
+cache, rate limiter and every caller work unchanged.
+
+- https:// negotiates HTTP/2 via ALPN (falls back to HTTP/1.1)
+- http:// uses HTTP/2 with prior knowledge (cleartext h2c), e.g. the local
+  stand-in started with --http2
+- Connection errors and 500/502/504 are retried with exponential back-off,
+  like the urllib3 retry policy on the HTTP/1.1 path
+
+Optional dependency: pip install 'httpx[http2]'
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+RETRY_STATUSES = (500, 502, 504)
+# Connection-specific headers are not allowed in HTTP/2
+HOP_BY_HOP_HEADERS = ("connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade")
+
+
+def translate_error(error):
+    """requests exception equivalent to an httpx exception"""
+    if isinstance(error, httpx.TimeoutException):
+        return requests.Timeout(str(error))
+    if isinstance(error, httpx.TransportError):
+        return requests.ConnectionError(str(error))
+    return requests.RequestException(str(error))
+
+
+class StreamedBody:
+    """Stands in for response.raw so requests' iter_content reads from httpx"""
+
+    def __init__(self, response):
+        self.response = response
+
+    def stream(self, chunk_size, decode_content=True):
+        try:
+            yield from self.response.iter_bytes(chunk_size)
+        except httpx.HTTPError as e:
+            raise translate_error(e) from e
+        finally:
+            self.response.close()
+
+    def close(self):
+        self.response.close()
+
+
+def to_requests_response(response, stream=False):
+    """Wrap an httpx response as a requests.Response"""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.headers = CaseInsensitiveDict(response.headers.items())
+    converted.encoding = get_encoding_from_headers(converted.headers)
+    converted.url = str(response.url)
+    converted.http_version = response.http_version
+    if stream:
+        converted.raw = StreamedBody(response)
+    else:
+        converted._content = response.content
+    return converted
+
+
+class Http2Session:
+    def __init__(self, pool_size=32, max_retries=3, backoff_factor=1.0, headers=None):
+        if httpx is None:
+            raise ImportError("HTTP/2 transport needs httpx: pip install 'httpx[http2]'")
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.headers = {
+            name: value for name, value in (headers or {}).items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        }
+        self.clients = {}
+        self.lock = threading.Lock()
+
+    def client_for(self, url):
+        """One multiplexing client per scheme (h2c needs prior knowledge)"""
+        scheme = urlsplit(url).scheme
+        with self.lock:
+            if scheme not in self.clients:
+                transport = httpx.HTTPTransport(
+                    http1=(scheme == "https"),
+                    http2=True,
+                    limits=httpx.Limits(max_connections=self.pool_size,
+                                        max_keepalive_connections=self.pool_size),
+                    # get() is the only retry loop; transport retries would multiply it
+                    retries=0
+                )
+                self.clients[scheme] = httpx.Client(headers=self.headers, transport=transport)
+            return self.clients[scheme]
+
+    def get(self, url, params=None, headers=None, timeout=None, stream=False):
+        """GET a URL over HTTP/2 (returns a requests.Response)"""
+        client = self.client_for(url)
+        request_headers = {
+            name: value for name, value in (headers or {}).items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        }
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                request = client.build_request(
+                    "GET", url, params=params, headers=request_headers,
+                    timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+                )
+                response = client.send(request, stream=stream)
+            except httpx.HTTPError as e:
+                if attempt == self.max_retries:
+                    raise translate_error(e) from e
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return to_requests_response(response, stream)
+                response.close()
+            time.sleep(min(120.0, self.backoff_factor * 2 ** attempt))
+
+    def close(self):
+        with self.lock:
+            for client in self.clients.values():
+                client.close()
+            self.clients.clear()
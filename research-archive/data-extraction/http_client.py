@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client for Data Extraction Scripts
+One pooled, keep-alive session for every fetcher
+
+Features:
+- Keep-alive connection pooling (no fresh TCP+TLS handshake per call)
+- gzip/deflate negotiation
+- Configurable default timeout
+- Shared retry policy (connection errors and 5xx via urllib3; 429/503
+  retried after the rate limiter's back-off, honouring Retry-After)
+- Per-host concurrency caps, safe to share across threads
+- Per-host adaptive (AIMD) rate limiting instead of fixed sleeps
+- Persistent response cache with ETag/Last-Modified revalidation
+  (shared client only; see response_cache.py)
+- Single-flight coalescing: concurrent identical GETs share one network
+  call and one parsed JSON body (see single_flight.py)
+- Streamed bodies (iter_body) for incremental parsing of large pages
+- Optional HTTP/2 transport (http2=True; see http2_transport.py)
+
+Environment:
+    HTTP_CACHE_ONLY=1     serve from the cache only, never touch the network
+    HTTP_CACHE_DISABLE=1  no response cache for the shared client
+    HTTP_CACHE_TTL=<sec>  freshness lifetime (default 7 days)
+    HTTP_CACHE_DIR=<dir>  cache location (default data-extraction/http_cache)
+    HTTP_TRANSPORT=http2  multiplex requests over HTTP/2 (needs httpx[http2])
+
+Usage:
+    from http_client import get_json, fetch
+    data = get_json("https://api.worldbank.org/v2/country/USA/indicator/SP.POP.TOTL?format=json")
+    response = fetch(url)   # live request, never answered from the cache
+"""
+
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import AdaptiveRateLimiter, THROTTLE_STATUSES
+from response_cache import ResponseCache, CacheMissError, DEFAULT_TTL, normalize_url
+from single_flight import SingleFlight
+from http2_transport import Http2Session
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "http_cache")
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "User-Agent": "outrank-data-extraction/1.0"
+}
+
+
+class HttpClient:
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=3, backoff_factor=1.0,
+                 pool_size=32, per_host_limit=8, limiter_options=None, cache=None,
+                 http2=False):
+        self.timeout = timeout
+        self.cache = cache
+        self.max_retries = max_retries
+        self.per_host_limit = per_host_limit
+        self.limiter_options = limiter_options or {}
+        self.host_slots = {}
+        self.limiters = {}
+        self.host_slots_lock = threading.Lock()
+        self.flights = SingleFlight()
+        self.json_flights = SingleFlight()
+
+        if http2:
+            self.session = Http2Session(pool_size, max_retries, backoff_factor, DEFAULT_HEADERS)
+        else:
+            self.session = self.http1_session(pool_size, max_retries, backoff_factor)
+
+    @staticmethod
+    def http1_session(pool_size, max_retries, backoff_factor):
+        """Pooled keep-alive requests.Session with the shared retry policy"""
+        # 429/503 are left to the rate limiter so it sees every throttle
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 504),
+            allowed_methods=("GET", "HEAD"),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def host_semaphore(self, url):
+        """Get (or create) the concurrency cap for a URL's host"""
+        host = urlsplit(url).netloc
+        with self.host_slots_lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self.host_slots[host]
+
+    def limiter_for(self, url):
+        """Get (or create) the adaptive rate limiter for a URL's host"""
+        host = urlsplit(url).netloc
+        with self.host_slots_lock:
+            if host not in self.limiters:
+                self.limiters[host] = AdaptiveRateLimiter(**self.limiter_options)
+            return self.limiters[host]
+
+    def get(self, url, params=None, timeout=None, headers=None, cacheable=None):
+        """GET a URL, answering from the response cache when possible
+
+        Concurrent calls for the same URL + params share one request and
+        the same Response object (calls with custom headers are not shared).
+        cacheable(body) can veto caching a 200 whose body is really an
+        error (it is given the start of the body).
+        """
+        if headers:
+            return self._get(url, params, timeout, headers, cacheable)
+        return self.flights.do(normalize_url(url, params),
+                               lambda: self._get(url, params, timeout, headers, cacheable))
+
+    def _get(self, url, params=None, timeout=None, headers=None, cacheable=None):
+        if self.cache is None:
+            return self.fetch(url, params, timeout, headers)
+
+        key = self.cache.key(url, params)
+        cached = self.cache.lookup(key)
+
+        if cached:
+            meta, body = cached
+            if self.cache.offline or self.cache.is_fresh(meta):
+                self.cache.count("hits")
+                return self.cache.to_response(meta, body)
+            # Stale: ask the server whether our copy is still current
+            headers = dict(headers or {}, **self.cache.validators(meta))
+        elif self.cache.offline:
+            raise CacheMissError(f"Not in cache (cache-only mode): {url}")
+
+        response = self.fetch(url, params, timeout, headers)
+
+        if cached and response.status_code == 304:
+            self.cache.count("revalidated")
+            self.cache.refresh(key, meta)
+            return self.cache.to_response(meta, body)
+
+        self.cache.count("misses")
+        if response.status_code == 200 and (cacheable is None or cacheable(response.content)):
+            self.cache.store(key, response.url, response)
+        return response
+
+    def iter_body(self, url, params=None, timeout=None, chunk_size=64 * 1024, cacheable=None):
+        """GET a URL and yield its body in chunks as they arrive
+
+        Uses the response cache like get() (a streamed 200 is cached once
+        it has been read to the end, if cacheable(first chunk) allows).
+        Raises requests.HTTPError on any other status. Not coalesced:
+        every call streams its own body.
+        """
+        cached = None
+        if self.cache is not None:
+            key = self.cache.key(url, params)
+            cached = self.cache.lookup(key)
+            if cached and (self.cache.offline or self.cache.is_fresh(cached[0])):
+                self.cache.count("hits")
+                yield cached[1]
+                return
+            if not cached and self.cache.offline:
+                raise CacheMissError(f"Not in cache (cache-only mode): {url}")
+
+        headers = self.cache.validators(cached[0]) if cached else None
+        response = self.fetch(url, params, timeout, headers, stream=True)
+        with response:
+            if cached and response.status_code == 304:
+                self.cache.count("revalidated")
+                self.cache.refresh(key, cached[0])
+                yield cached[1]
+                return
+            response.raise_for_status()
+            if response.status_code != 200 or self.cache is None:
+                yield from response.iter_content(chunk_size=chunk_size)
+                return
+            self.cache.count("misses")
+            yield from self.cache.store_stream(key, response.url, response, chunk_size, cacheable)
+
+    def fetch(self, url, params=None, timeout=None, headers=None, stream=False):
+        """GET a URL through the pooled session (returns a requests.Response)
+
+        With stream=True the body is left unread for the caller (close the
+        response when done).
+        """
+        limiter = self.limiter_for(url)
+
+        with self.host_semaphore(url):
+            for attempt in range(self.max_retries + 1):
+                limiter.acquire()
+                try:
+                    response = self.session.get(
+                        url,
+                        params=params,
+                        headers=headers,
+                        timeout=timeout or self.timeout,
+                        stream=stream
+                    )
+                except requests.RequestException:
+                    limiter.release(None)
+                    raise
+
+                limiter.release(response.status_code, response.headers.get("Retry-After"))
+                if response.status_code not in THROTTLE_STATUSES or attempt == self.max_retries:
+                    return response
+                response.close()
+
+    def get_json(self, url, params=None, timeout=None, headers=None, cacheable=None):
+        """GET a URL and decode the JSON body (raises requests.HTTPError on 4xx/5xx)
+
+        Concurrent callers for the same URL + params get the same decoded
+        object; treat it as read-only.
+        """
+        def load():
+            response = self.get(url, params=params, timeout=timeout, headers=headers, cacheable=cacheable)
+            response.raise_for_status()
+            return response.json()
+
+        if headers:
+            return load()
+        return self.json_flights.do(normalize_url(url, params), load)
+
+    def coalescing_stats(self):
+        """GETs executed vs. avoided by joining an identical one in flight"""
+        executed = self.flights.stats()
+        return {
+            "calls": executed["calls"],
+            "coalesced": executed["coalesced"] + self.json_flights.stats()["coalesced"]
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def default_cache():
+    """Response cache for the shared client, configured from the environment"""
+    if os.environ.get("HTTP_CACHE_DISABLE"):
+        return None
+    return ResponseCache(
+        cache_dir=os.environ.get("HTTP_CACHE_DIR", DEFAULT_CACHE_DIR),
+        ttl=float(os.environ.get("HTTP_CACHE_TTL", DEFAULT_TTL)),
+        offline=bool(os.environ.get("HTTP_CACHE_ONLY"))
+    )
+
+
+def get_client():
+    """Shared process-wide client (with the persistent response cache)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(
+                cache=default_cache(),
+                http2=os.environ.get("HTTP_TRANSPORT", "").lower() == "http2"
+            )
+        return _client
+
+
+def get(url, params=None, timeout=None, headers=None):
+    """GET through the shared client"""
+    return get_client().get(url, params=params, timeout=timeout, headers=headers)
+
+
+def get_json(url, params=None, timeout=None, headers=None):
+    """GET JSON through the shared client"""
+    return get_client().get_json(url, params=params, timeout=timeout, headers=headers)
+
+
+def fetch(url, params=None, timeout=None, headers=None):
+    """GET through the shared client, bypassing the response cache
+
+    For probes that must see the live endpoint (status and all headers).
+    """
+    return get_client().fetch(url, params=params, timeout=timeout, headers=headers)
+
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Bitmap Download Progress
+Tracks which (country, indicator) pairs are done as dense bit rows
+
+Replaces the "completed"/"failed" lists of "{country}_{indicator}" keys:
+- O(1) membership checks instead of scanning a list of millions of keys
+- One row per country, one bit per indicator; ids get a fixed index the
+  first time they are seen, so new countries/indicators can be added later
+- Binary checkpoint (zlib-compressed) that is typically under a megabyte
+  for the full ~300 x ~17,000 catalogue and loads in milliseconds
+
+Checkpoint layout:
+    MAGIC | u32 header length | JSON header (country and indicator ids
+    in index order) | zlib(completed rows + failed rows)
+"""
+
+import json
+import os
+import struct
+import zlib
+
+MAGIC = b"WBPB1\n"
+
+
+class ProgressBitmap:
+    def __init__(self, countries=(), indicators=()):
+        self.country_index = {}
+        self.indicator_index = {}
+        self.completed_rows = []
+        self.failed_rows = []
+        self.completed_count = 0
+        self.failed_count = 0
+        for country_code in countries:
+            self.add_country(country_code)
+        for indicator_code in indicators:
+            self.add_indicator(indicator_code)
+
+    @property
+    def row_bytes(self):
+        return (len(self.indicator_index) + 7) // 8
+
+    def add_country(self, country_code):
+        """Index of a country, assigning the next row if it is new"""
+        index = self.country_index.get(country_code)
+        if index is None:
+            index = len(self.country_index)
+            self.country_index[country_code] = index
+            self.completed_rows.append(bytearray(self.row_bytes))
+            self.failed_rows.append(bytearray(self.row_bytes))
+        return index
+
+    def add_indicator(self, indicator_code):
+        """Index of an indicator, assigning the next column if it is new"""
+        index = self.indicator_index.get(indicator_code)
+        if index is None:
+            index = len(self.indicator_index)
+            self.indicator_index[indicator_code] = index
+            if index % 8 == 0:
+                for row in self.completed_rows + self.failed_rows:
+                    row.append(0)
+        return index
+
+    def _position(self, country_code, indicator_code):
+        """(row, byte, mask) for a pair, or None if either id is unknown"""
+        row = self.country_index.get(country_code)
+        column = self.indicator_index.get(indicator_code)
+        if row is None or column is None:
+            return None
+        return row, column >> 3, 1 << (column & 7)
+
+    def _test(self, rows, country_code, indicator_code):
+        position = self._position(country_code, indicator_code)
+        if position is None:
+            return False
+        row, byte, mask = position
+        return bool(rows[row][byte] & mask)
+
+    def is_completed(self, country_code, indicator_code):
+        return self._test(self.completed_rows, country_code, indicator_code)
+
+    def is_failed(self, country_code, indicator_code):
+        return self._test(self.failed_rows, country_code, indicator_code)
+
+    def is_done(self, country_code, indicator_code):
+        """True if the pair is completed or has failed"""
+        position = self._position(country_code, indicator_code)
+        if position is None:
+            return False
+        row, byte, mask = position
+        return bool((self.completed_rows[row][byte] | self.failed_rows[row][byte]) & mask)
+
+    def _set(self, country_code, indicator_code, completed):
+        self.add_country(country_code)
+        self.add_indicator(indicator_code)
+        row, byte, mask = self._position(country_code, indicator_code)
+
+        # A retried pair moves between the two sets rather than being in both
+        target, other = (self.completed_rows, self.failed_rows) if completed else \
+                        (self.failed_rows, self.completed_rows)
+        if other[row][byte] & mask:
+            other[row][byte] &= ~mask
+            if completed:
+                self.failed_count -= 1
+            else:
+                self.completed_count -= 1
+        if not target[row][byte] & mask:
+            target[row][byte] |= mask
+            if completed:
+                self.completed_count += 1
+            else:
+                self.failed_count += 1
+
+    def mark_completed(self, country_code, indicator_code):
+        self._set(country_code, indicator_code, completed=True)
+
+    def mark_failed(self, country_code, indicator_code):
+        self._set(country_code, indicator_code, completed=False)
+
+    def clear_failed(self):
+        """Forget every failure so those pairs are retried"""
+        for row in self.failed_rows:
+            row[:] = bytes(len(row))
+        self.failed_count = 0
+
+    def _iter_set(self, rows):
+        """(country, indicator) for every set bit, skipping empty bytes"""
+        countries = list(self.country_index)
+        indicators = list(self.indicator_index)
+        for row_index, row in enumerate(rows):
+            for byte_index, byte in enumerate(row):
+                if not byte:
+                    continue
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield countries[row_index], indicators[(byte_index << 3) | bit]
+
+    def update(self, other):
+        """Merge another bitmap in (e.g. from a download shard)
+
+        Ids are matched by code, not index, so the two bitmaps may have
+        seen countries and indicators in a different order. A pair
+        completed in either bitmap ends up completed.
+        """
+        for country_code, indicator_code in other._iter_set(other.failed_rows):
+            if not self.is_completed(country_code, indicator_code):
+                self.mark_failed(country_code, indicator_code)
+        for country_code, indicator_code in other._iter_set(other.completed_rows):
+            self.mark_completed(country_code, indicator_code)
+
+    def copy(self):
+        """Independent copy (e.g. to checkpoint while downloads continue)"""
+        bitmap = ProgressBitmap()
+        bitmap.country_index = dict(self.country_index)
+        bitmap.indicator_index = dict(self.indicator_index)
+        bitmap.completed_rows = [bytearray(row) for row in self.completed_rows]
+        bitmap.failed_rows = [bytearray(row) for row in self.failed_rows]
+        bitmap.completed_count = self.completed_count
+        bitmap.failed_count = self.failed_count
+        return bitmap
+
+    def save(self, path):
+        """Write a binary checkpoint (atomically)"""
+        header = json.dumps({
+            "countries": list(self.country_index),
+            "indicators": list(self.indicator_index)
+        }).encode()
+        bits = zlib.compress(b"".join(self.completed_rows + self.failed_rows))
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a checkpoint written by save()"""
+        with open(path, 'rb') as f:
+            blob = f.read()
+        if not blob.startswith(MAGIC):
+            raise ValueError(f"{path} is not a progress bitmap checkpoint")
+
+        offset = len(MAGIC)
+        (header_len,) = struct.unpack_from("<I", blob, offset)
+        offset += 4
+        header = json.loads(blob[offset:offset + header_len])
+        bits = zlib.decompress(blob[offset + header_len:])
+
+        bitmap = cls(header["countries"], header["indicators"])
+        row_bytes = bitmap.row_bytes
+        n_rows = len(bitmap.country_index)
+        for i in range(n_rows):
+            bitmap.completed_rows[i][:] = bits[i * row_bytes:(i + 1) * row_bytes]
+            bitmap.failed_rows[i][:] = bits[(n_rows + i) * row_bytes:(n_rows + i + 1) * row_bytes]
+
+        bitmap.completed_count = int.from_bytes(bits[:n_rows * row_bytes], "little").bit_count()
+        bitmap.failed_count = int.from_bytes(bits[n_rows * row_bytes:], "little").bit_count()
+        return bitmap
+
+    @classmethod
+    def from_keys(cls, completed=(), failed=()):
+        """Build a bitmap from legacy "{country}_{indicator}" key lists"""
+        bitmap = cls()
+        for key in completed:
+            bitmap.mark_completed(*key.split("_", 1))
+        for key in failed:
+            bitmap.mark_failed(*key.split("_", 1))
+        return bitmap
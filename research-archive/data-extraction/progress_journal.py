@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Append-Only Progress Journal
+Records each completed/failed key as one line instead of rewriting a
+whole progress file
+
+- record() is O(1): lines are buffered and appended in batches
+- Every flush is fsync'd, so a kill -9 loses at most the unflushed batch
+  (those pairs are simply fetched again)
+- Compaction rotates the live journal to a numbered segment, writes a
+  snapshot of the owner's state in a background thread, then deletes the
+  segments the snapshot covers
+- On startup the owner loads its snapshot and replays the remaining
+  segments and the live journal (replay is idempotent; a torn last line
+  from a crash is ignored)
+
+Usage:
+    journal = ProgressJournal("progress.journal", snapshot=make_snapshot)
+    for status, key in journal.replay():
+        apply(status, key)
+    journal.record("completed", "USA_SP.POP.TOTL")
+
+snapshot() is called with the owner's progress lock held (the same lock
+held around record()), must freeze the current state and return a
+zero-argument function that writes it to disk.
+"""
+
+import glob
+import os
+import threading
+
+STATUSES = ("completed", "failed")
+
+
+class ProgressJournal:
+    def __init__(self, path, snapshot, flush_every=100, compact_every=100_000):
+        self.path = path
+        self.snapshot = snapshot
+        self.flush_every = flush_every
+        self.compact_every = compact_every
+        self.buffer = []
+        self.records_since_compact = 0
+        self.lock = threading.Lock()
+        self.compactor = None
+        self.file = open(self.path, 'a')
+
+    def segments(self):
+        """Rotated journal segments awaiting compaction, oldest first"""
+        numbered = []
+        for path in glob.glob(f"{glob.escape(self.path)}.*"):
+            suffix = path[len(self.path) + 1:]
+            if suffix.isdigit():
+                numbered.append((int(suffix), path))
+        return [path for _, path in sorted(numbered)]
+
+    def replay(self):
+        """Yield (status, key) for every journalled record, oldest first"""
+        for path in self.segments() + [self.path]:
+            with open(path, 'r') as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break  # torn write from a crash
+                    status, _, key = line.rstrip("\n").partition("\t")
+                    if status in STATUSES and key:
+                        yield status, key
+                        self.records_since_compact += 1
+
+    def record(self, status, key):
+        """Journal one key (status is "completed" or "failed")"""
+        with self.lock:
+            self.buffer.append(f"{status}\t{key}\n")
+            self.records_since_compact += 1
+            if len(self.buffer) >= self.flush_every:
+                self._flush()
+            compact = self.records_since_compact >= self.compact_every
+        if compact:
+            self.compact()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            self.file.write("".join(self.buffer))
+            self.buffer = []
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def compact(self, wait=False):
+        """Fold the journal into a fresh snapshot"""
+        if self.compactor is not None:
+            self.compactor.join()
+
+        with self.lock:
+            self._flush()
+            self.file.close()
+            segments = self.segments()
+            last = int(segments[-1].rsplit(".", 1)[1]) if segments else 0
+            os.replace(self.path, f"{self.path}.{last + 1}")
+            self.file = open(self.path, 'a')
+            self.records_since_compact = 0
+            covered = segments + [f"{self.path}.{last + 1}"]
+
+        write_snapshot = self.snapshot()
+
+        def run():
+            write_snapshot()
+            for path in covered:
+                os.remove(path)
+
+        self.compactor = threading.Thread(target=run)
+        self.compactor.start()
+        if wait:
+            self.compactor.join()
+
+    def close(self):
+        """Flush outstanding records and wait for any running compaction"""
+        if self.compactor is not None:
+            self.compactor.join()
+        with self.lock:
+            self._flush()
+            self.file.close()
@@ -4,10 +4,13 @@ Pull World Bank data for all 20 indicators across 40 countries
 Complete the dataset with actual values from World Bank API
 """
 
-import requests
 import json
-import time
+import sys
 from datetime import datetime
+from world_bank_latest import fetch_latest_values
+from world_bank_refresh import DeltaRefresher
+
+REFRESH_STATE_FILE = "wb_refresh_state_40.json"
 
 # World Bank indicator codes we need
 WORLD_BANK_INDICATORS = {
@@ -77,64 +80,43 @@ COUNTRIES = {
     "PAK": "Pakistan"
 }
 
-def get_world_bank_data(indicator_code, countries, year_range="2020:2023"):
-    """
-    Fetch data from World Bank API for a specific indicator
+def get_latest_values(indicator_code, countries, min_year=2020, refresher=None):
     """
-    base_url = "https://api.worldbank.org/v2/country"
-    
-    # Create country string (semicolon-separated ISO3 codes)
-    country_string = ";".join(countries.keys())
-    
-    # Construct API URL
-    url = f"{base_url}/{country_string}/indicator/{indicator_code}"
-    
-    params = {
-        "format": "json",
-        "date": year_range,
-        "per_page": 500
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        # World Bank API returns metadata as first element
-        if len(data) > 1 and data[1]:
-            return data[1]
-        else:
-            return []
-            
-    except Exception as e:
-        print(f"Error fetching {indicator_code}: {str(e)}")
-        return []
+    Fetch the most recent non-null value since min_year for every country
 
-def extract_latest_value(country_data, country_code):
+    The API picks the latest value server-side (mrnev); returns
+    {iso3: {'value', 'year'} or None}. With a refresher the fetch bypasses
+    the response cache and leaves out countries that failed.
     """
-    Extract the most recent non-null value for a country
-    """
-    # Filter data for specific country
-    country_entries = [d for d in country_data if d.get('countryiso3code') == country_code]
-    
-    # Sort by year (descending) and get first non-null value
-    for entry in sorted(country_entries, key=lambda x: x.get('date', ''), reverse=True):
-        if entry.get('value') is not None:
-            return {
-                'value': entry['value'],
-                'year': entry.get('date', 'Unknown')
-            }
-    
-    return None
+    if refresher is not None:
+        latest = refresher.fetch_latest(indicator_code, list(countries), min_year=min_year)
+    else:
+        latest = fetch_latest_values(indicator_code, list(countries), min_year=min_year)
+    
+    return {
+        iso3: {'value': found[0], 'year': found[1]} if found else None
+        for iso3, found in latest.items()
+    }
 
-def pull_all_world_bank_data():
+def pull_all_world_bank_data(incremental=False):
     """
     Pull all World Bank data for our 40 countries and 20 indicators
+
+    With incremental=True only indicators whose World Bank source has been
+    updated since the previous run are fetched; the rest reuse the values
+    recorded in the refresh state.
     """
     print("🌍 Pulling World Bank Data for 40 Countries")
     print("=" * 60)
     
+    refresher = DeltaRefresher(REFRESH_STATE_FILE)
+    if incremental:
+        to_fetch = set(refresher.stale_indicators(WORLD_BANK_INDICATORS))
+        print(f"🔄 Incremental refresh: {len(to_fetch)}/{len(WORLD_BANK_INDICATORS)} indicators have new source data")
+    else:
+        to_fetch = set(WORLD_BANK_INDICATORS)
+    changes = 0
+    
     # Initialize results structure
     world_bank_data = {
         "extraction_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
@@ -156,21 +138,29 @@ def pull_all_world_bank_data():
     total_indicators = len(WORLD_BANK_INDICATORS)
     
     for idx, (indicator_code, indicator_name) in enumerate(WORLD_BANK_INDICATORS.items(), 1):
-        print(f"\n📊 [{idx}/{total_indicators}] Fetching: {indicator_name}")
-        print(f"   Code: {indicator_code}")
-        
-        # Fetch data from API
-        data = get_world_bank_data(indicator_code, COUNTRIES)
-        
-        if not data:
-            print(f"   ❌ No data returned")
-            continue
+        if indicator_code in to_fetch:
+            print(f"\n📊 [{idx}/{total_indicators}] Fetching: {indicator_name}")
+            print(f"   Code: {indicator_code}")
+            
+            # Fetch data from API
+            values = get_latest_values(indicator_code, COUNTRIES, refresher=refresher)
+            
+            if not any(values.values()):
+                print(f"   ❌ No data returned")
+                continue
+                
+            changes += len(refresher.update(indicator_code, values))
+            # Countries that failed this time keep their last-seen values
+            values = refresher.values[indicator_code]
+        else:
+            print(f"\n📊 [{idx}/{total_indicators}] Unchanged: {indicator_name}")
+            values = refresher.values[indicator_code]
         
         # Extract values for each country
         countries_with_data = 0
         
         for iso3 in COUNTRIES.keys():
-            value_info = extract_latest_value(data, iso3)
+            value_info = values.get(iso3)
             
             if value_info:
                 world_bank_data['countries'][iso3]['indicators'][indicator_code] = {
@@ -188,9 +178,12 @@ def pull_all_world_bank_data():
         }
         
         print(f"   ✅ Coverage: {countries_with_data}/{len(COUNTRIES)} countries ({coverage_pct:.1f}%)")
-        
-        # Rate limiting - be nice to the API
-        time.sleep(1)
+    
+    refresher.save()
+    if incremental and not changes:
+        print(f"\n✅ No changes since the last run - nothing to write")
+        return None
+    print(f"\n🔄 {changes} changed values")
     
     # Calculate overall coverage
     total_data_points = 0
@@ -232,4 +225,4 @@ def pull_all_world_bank_data():
     return filename
 
 if __name__ == "__main__":
-    pull_all_world_bank_data()
\ No newline at end of file
+    pull_all_world_bank_data(incremental="--incremental" in sys.argv)
\ No newline at end of file
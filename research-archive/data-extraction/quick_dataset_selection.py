@@ -4,38 +4,18 @@ Quick Dataset Selection: 40 Countries + 40 Fun Challenges
 Efficient approach - test core indicators only
 """
 
-import urllib.request
 import json
 import time
+from availability_probe import probe_availability
 
-def test_key_indicators(country_iso3):
-    """Test just 5 key indicators for speed"""
-    key_indicators = [
-        "SP.POP.TOTL",        # Population  
-        "NY.GDP.PCAP.CD",     # GDP per capita
-        "SP.DYN.LE00.IN",     # Life expectancy
-        "IT.NET.USER.ZS",     # Internet users
-        "ST.INT.ARVL"         # Tourist arrivals
-    ]
-    
-    available = 0
-    for indicator in key_indicators:
-        url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator}"
-        params = "?format=json&date=2022:2024&per_page=1"
-        
-        try:
-            with urllib.request.urlopen(url + params, timeout=3) as response:
-                data = json.loads(response.read().decode())
-                
-            if len(data) > 1 and data[1] and data[1][0]["value"] is not None:
-                available += 1
-                
-        except:
-            pass
-        
-        time.sleep(0.1)
-    
-    return available, len(key_indicators)
+# Just 5 key indicators for speed
+KEY_INDICATORS = [
+    "SP.POP.TOTL",        # Population  
+    "NY.GDP.PCAP.CD",     # GDP per capita
+    "SP.DYN.LE00.IN",     # Life expectancy
+    "IT.NET.USER.ZS",     # Internet users
+    "ST.INT.ARVL"         # Tourist arrivals
+]
 
 def main():
     print("🚀 Quick Dataset Selection - Testing Core Indicators Only")
@@ -71,11 +51,15 @@ def main():
     
     print(f"Testing {len(excellent_countries)} pre-selected countries...")
     
+    grid = probe_availability(excellent_countries.keys(), KEY_INDICATORS, 2022, 2024)
+    # Count an indicator only if the newest year in the window has a value
+    # (as the per_page=1 check did), not any year 2022-2024
+    latest_coverage = grid.coverage(min_year=2024)
     country_scores = {}
     
     for iso3, name in excellent_countries.items():
         print(f"🌍 {name[:20]:20} ({iso3})...", end=" ")
-        available, total = test_key_indicators(iso3)
+        available, total = int(latest_coverage[grid.country_index[iso3]]), len(KEY_INDICATORS)
         score = (available / total) * 100
         
         country_scores[iso3] = {
@@ -4,25 +4,8 @@ Quick Missing Count: Simple count of missing indicators per country
 Focus on speed rather than detailed analysis
 """
 
-import urllib.request
 import json
-import time
-
-def quick_test(country_iso3, indicator_code):
-    """Quick test - just return True/False"""
-    url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator_code}"
-    params = "?format=json&date=2022:2024&per_page=1"
-    
-    try:
-        with urllib.request.urlopen(url + params, timeout=3) as response:
-            data = json.loads(response.read().decode())
-            
-        if len(data) > 1 and data[1] and data[1][0]["value"] is not None:
-            return True
-        return False
-        
-    except:
-        return False
+from availability_probe import probe_availability
 
 def main():
     print("⚡ QUICK MISSING COUNT: All 40 Countries")
@@ -56,16 +39,13 @@ def main():
     print(f"Testing {len(countries)} countries with {len(key_indicators)} key indicators")
     print("(Sampling approach for speed)\n")
     
+    grid = probe_availability([iso3 for iso3, _ in countries], key_indicators, 2022, 2024)
     results = []
     
     for i, (iso3, country_name) in enumerate(countries, 1):
         print(f"{i:2d}/40 {country_name:25} ({iso3})...", end=" ")
         
-        available = 0
-        for indicator in key_indicators:
-            if quick_test(iso3, indicator):
-                available += 1
-            time.sleep(0.02)  # Minimal delay
+        available = int(grid.available[grid.country_index[iso3]].sum())
         
         missing = len(key_indicators) - available
         coverage = (available / len(key_indicators)) * 100
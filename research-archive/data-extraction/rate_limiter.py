@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Adaptive Rate Limiter
+Token bucket + AIMD concurrency control, replacing fixed sleeps between calls
+
+- Slow start: until the first throttle, every success adds a full step
+- Additive increase: afterwards each success nudges the request rate
+  and the concurrency window up
+- Multiplicative decrease: a 429/503 (or timeout) cuts both, at most once
+  per cool-down period
+- Retry-After is honoured: nobody gets a token until it has passed
+- One limiter is shared by threads (acquire) and asyncio tasks (acquire_async)
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, rate=5.0, min_rate=0.5, max_rate=1000.0, burst=None,
+                 concurrency=4, min_concurrency=1, max_concurrency=256,
+                 increase=1.0, decrease=0.5, cooldown=1.0):
+        self.rate = float(rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.window = float(concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+
+        self.tokens = 1.0
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.last_refill = time.monotonic()
+        self.last_decrease = 0.0
+        self.successes = 0
+        self.throttles = 0
+        self.lock = threading.Lock()
+        self.released = threading.Condition(self.lock)
+
+    def _refill(self, now):
+        capacity = self.burst or max(1.0, self.rate)
+        self.tokens = min(capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def _try_take(self):
+        """Take a token and a concurrency slot, or return seconds to wait"""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.in_flight >= int(self.window):
+            return None  # wait for a release
+        if self.tokens < 1.0:
+            return (1.0 - self.tokens) / self.rate
+        self.tokens -= 1.0
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent"""
+        with self.lock:
+            while True:
+                wait = self._try_take()
+                if wait == 0.0:
+                    return
+                self.released.wait(timeout=wait)
+
+    async def acquire_async(self):
+        """Wait (without blocking the event loop) until a request may be sent"""
+        while True:
+            with self.lock:
+                wait = self._try_take()
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait if wait is not None else 0.01)
+
+    def release(self, status=None, retry_after=None):
+        """Report the outcome of a request and free its concurrency slot
+
+        status is the HTTP status code, or None for a timeout/connection error.
+        """
+        with self.lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            now = time.monotonic()
+
+            if status is None or status in THROTTLE_STATUSES:
+                self.throttles += 1
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    self.blocked_until = max(self.blocked_until, now + delay)
+                if now - self.last_decrease >= self.cooldown:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self.window = max(self.min_concurrency, self.window * self.decrease)
+                    self.last_decrease = now
+            elif status < 500:
+                self.successes += 1
+                if self.throttles == 0:
+                    # Slow start: grow quickly until the server first pushes back
+                    self.rate = min(self.max_rate, self.rate + self.increase)
+                    self.window = min(self.max_concurrency, self.window + 1.0)
+                else:
+                    self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+                    self.window = min(self.max_concurrency, self.window + 1.0 / self.window)
+
+            self.released.notify_all()
+
+    def stats(self):
+        """Current limiter state"""
+        with self.lock:
+            return {
+                "rate": round(self.rate, 2),
+                "concurrency": int(self.window),
+                "in_flight": self.in_flight,
+                "successes": self.successes,
+                "throttles": self.throttles
+            }
+
+    def __str__(self):
+        s = self.stats()
+        return f"{s['rate']:.1f} req/s, {s['concurrency']} in flight max, {s['throttles']} throttled"
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP Response Cache
+Content-addressed on-disk cache used by the shared HTTP client
+
+- Keyed by SHA-256 of the normalized URL (query params merged and sorted)
+- Fresh entries are served without touching the network
+- Stale entries are revalidated with If-None-Match / If-Modified-Since
+- Total size is capped; least recently used entries are evicted first
+- Offline "cache-only" mode serves whatever is on disk and never connects
+
+Layout: <cache_dir>/<2-char prefix>/<sha256>.body + <sha256>.json (metadata)
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_TTL = 7 * 24 * 3600           # World Bank data changes rarely
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class CacheMissError(requests.ConnectionError):
+    """Raised in cache-only mode when a URL is not in the cache"""
+
+
+def normalize_url(url, params=None):
+    """Canonical form of a URL + params, so equivalent requests share a key"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        query.extend((str(k), str(v)) for k, v in items)
+    query.sort()
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or "/",
+        urlencode(query),
+        ""
+    ))
+
+
+class ResponseCache:
+    def __init__(self, cache_dir="http_cache", ttl=DEFAULT_TTL,
+                 max_bytes=DEFAULT_MAX_BYTES, offline=False):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.total_bytes = self._scan_size()
+
+    def key(self, url, params=None):
+        return hashlib.sha256(normalize_url(url, params).encode()).hexdigest()
+
+    def _paths(self, key):
+        folder = os.path.join(self.cache_dir, key[:2])
+        return os.path.join(folder, f"{key}.body"), os.path.join(folder, f"{key}.json")
+
+    def _scan_size(self):
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".body"):
+                    total += os.path.getsize(os.path.join(root, name))
+        return total
+
+    def lookup(self, key):
+        """Return (metadata, body) for a cached entry, or None"""
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        # Access time drives LRU eviction; the entry may be evicted meanwhile
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return meta, body
+
+    def peek(self, key):
+        """Metadata of a cached entry without reading its body, or None"""
+        _, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, meta):
+        return time.time() < meta["expires_at"]
+
+    def validators(self, meta):
+        """Conditional request headers for revalidating a stale entry"""
+        headers = {}
+        if meta["headers"].get("ETag"):
+            headers["If-None-Match"] = meta["headers"]["ETag"]
+        if meta["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+        return headers
+
+    def store(self, key, url, response):
+        """Save a 200 response"""
+        body_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+
+        body = response.content
+        now = time.time()
+        meta = {
+            "url": url,
+            "status": response.status_code,
+            "headers": {h: response.headers[h] for h in STORED_HEADERS if h in response.headers},
+            "stored_at": now,
+            "expires_at": now + self.ttl,
+            "size": len(body)
+        }
+
+        old_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+        self._write_atomic(body_path, body, "wb")
+        self._write_atomic(meta_path, json.dumps(meta), "w")
+
+        self._account(len(body) - old_size)
+
+    def store_stream(self, key, url, response, chunk_size=64 * 1024, cacheable=None):
+        """Save a streamed 200 response while passing its body through
+
+        Yields the body in chunks; the entry is only written once the body
+        has been read to the end, so an abandoned stream caches nothing.
+        If cacheable(first chunk) is false the body is passed through
+        without being saved.
+        """
+        chunks = response.iter_content(chunk_size=chunk_size)
+        first = next(chunks, b"")
+        if cacheable is not None and not cacheable(first):
+            yield first
+            yield from chunks
+            return
+
+        body_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+
+        size = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in itertools.chain([first], chunks):
+                    f.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        now = time.time()
+        meta = {
+            "url": url,
+            "status": response.status_code,
+            "headers": {h: response.headers[h] for h in STORED_HEADERS if h in response.headers},
+            "stored_at": now,
+            "expires_at": now + self.ttl,
+            "size": size
+        }
+        old_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+        os.replace(tmp_path, body_path)
+        self._write_atomic(meta_path, json.dumps(meta), "w")
+        self._account(size - old_size)
+
+    def _account(self, delta):
+        with self.lock:
+            self.total_bytes += delta
+            over_budget = self.total_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def refresh(self, key, meta):
+        """Extend a revalidated (304) entry's lifetime"""
+        meta["expires_at"] = time.time() + self.ttl
+        _, meta_path = self._paths(key)
+        self._write_atomic(meta_path, json.dumps(meta), "w")
+
+    def _write_atomic(self, path, data, mode):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, mode) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def evict(self):
+        """Delete least recently used entries until under 90% of max_bytes"""
+        with self.lock:
+            entries = []
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.endswith(".body"):
+                        path = os.path.join(root, name)
+                        stat = os.stat(path)
+                        entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+
+            target = self.max_bytes * 0.9
+            total = sum(size for _, size, _ in entries)
+            for _, size, body_path in entries:
+                if total <= target:
+                    break
+                for path in (body_path, body_path[:-len(".body")] + ".json"):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+            self.total_bytes = total
+
+    def to_response(self, meta, body):
+        """Rebuild a requests.Response from a cached entry"""
+        response = requests.Response()
+        response.status_code = meta["status"]
+        response._content = body
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = meta["url"]
+        response.from_cache = True
+        return response
+
+    def count(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "size_mb": round(self.total_bytes / 1024 / 1024, 1)
+        }
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Single-Flight Request Coalescing
+Concurrent identical calls share one execution and its result
+
+The first caller for a key (the leader) runs the function; callers that
+arrive with the same key while it is running wait for it and receive the
+same result, or the same exception. Nothing is kept once the call
+returns. Repeat calls later on are the response cache's job.
+
+Shared results are handed to every waiter as the same object, so treat
+them as read-only.
+
+Usage:
+    flights = SingleFlight()
+    data = flights.do(url, lambda: fetch(url))
+    print(flights.stats())   # {"calls": ..., "coalesced": ...}
+"""
+
+import threading
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Run fn() once per key among concurrent callers and return its result"""
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = self.flights[key] = _Flight()
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+        return flight.result
+
+    def stats(self):
+        """Executions run and calls avoided by joining one already in flight"""
+        with self.lock:
+            return {"calls": self.calls, "coalesced": self.coalesced}
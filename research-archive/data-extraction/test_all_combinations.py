@@ -1,37 +1,19 @@
 #!/usr/bin/env python3
 """
 Test ALL combinations: 40 countries × 50 verified World Bank indicators
-This will take time but give exact data availability for every combination
+One batched latest-value request per indicator gives exact data availability
+for every combination
 """
 
-import urllib.request
 import json
 import time
 from datetime import datetime
-
-def test_country_indicator(country_iso3, indicator_code):
-    """Test if specific country has data for specific indicator"""
-    url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator_code}"
-    params = "?format=json&date=2020:2024&per_page=5"
-    
-    try:
-        with urllib.request.urlopen(url + params, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            
-        if len(data) > 1 and data[1]:
-            # Find most recent non-null value
-            for entry in data[1]:
-                if entry["value"] is not None:
-                    return True, entry["value"], entry["date"]
-        return False, None, None
-        
-    except Exception as e:
-        return False, None, None
+from world_bank_latest import fetch_latest_matrix
 
 def main():
     print("🔬 TESTING ALL COMBINATIONS: 40 Countries × 50 Indicators")
     print("=" * 65)
-    print("⚠️  This will take 15-20 minutes and make 2,000 API calls")
+    print("⚡ One server-side latest-value request per indicator (countries batched)")
     print("📊 Testing every single country/indicator combination")
     print()
     
@@ -58,6 +40,13 @@ def main():
     
     start_time = time.time()
     
+    # Most recent non-null value since 2020 for every combination
+    latest = fetch_latest_matrix(
+        [code for code, _ in indicators],
+        [iso3 for iso3, _ in countries],
+        min_year=2020
+    )
+    
     # Test each country
     for country_idx, (country_iso3, country_name) in enumerate(countries, 1):
         print(f"\n🌍 {country_idx:2d}/40 {country_name} ({country_iso3})")
@@ -70,9 +59,10 @@ def main():
         for indicator_idx, (indicator_code, indicator_name) in enumerate(indicators, 1):
             print(f"  {indicator_idx:2d}/50 {indicator_code}...", end=" ")
             
-            has_data, value, year = test_country_indicator(country_iso3, indicator_code)
+            found = latest[indicator_code].get(country_iso3)
             
-            if has_data:
+            if found:
+                value, year = found
                 country_results[indicator_code] = {
                     "available": True,
                     "value": value,
@@ -96,8 +86,6 @@ def main():
                 indicator_missing_counts[indicator_code].append(country_name)
                 
                 print("❌")
-            
-            time.sleep(0.1)  # Rate limiting
         
         # Store country results
         results_matrix[country_iso3] = {
@@ -4,11 +4,12 @@ Test FAO (Food and Agriculture Organization) API for agriculture data
 Automated extraction with proper sourcing - NO ASSUMPTIONS
 """
 
-import urllib.request
 import json
 import time
 import csv
 from io import StringIO
+from http_client import fetch
+from world_bank_batch import BASE_URL
 
 def test_fao_api():
     """Test FAO API endpoints for agriculture data"""
@@ -43,19 +44,14 @@ def test_fao_api():
         print(f"URL: {endpoint['url']}")
         
         try:
-            request = urllib.request.Request(endpoint['url'])
-            request.add_header('User-Agent', 'Mozilla/5.0 (Research Project)')
-            
-            with urllib.request.urlopen(request, timeout=15) as response:
-                if response.status == 200:
-                    print(f"✅ SUCCESS - Endpoint accessible")
-                    working_endpoints.append(endpoint)
-                else:
-                    print(f"❌ HTTP {response.status}")
+            response = fetch(endpoint['url'], timeout=15, headers={'User-Agent': 'Mozilla/5.0 (Research Project)'})
+            if response.status_code == 200:
+                print(f"✅ SUCCESS - Endpoint accessible")
+                working_endpoints.append(endpoint)
+            else:
+                print(f"❌ HTTP {response.status_code}")
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(1)
     
     return working_endpoints
 
@@ -78,21 +74,21 @@ def test_world_bank_agriculture():
     
     # Test one indicator to check API access
     test_indicator = agriculture_indicators[0]
-    test_url = f"https://api.worldbank.org/v2/country/all/indicator/{test_indicator['code']}?format=json&date=2020:2024&per_page=300"
+    test_url = f"{BASE_URL}/country/all/indicator/{test_indicator['code']}?format=json&date=2020:2024&per_page=300"
     
     try:
-        with urllib.request.urlopen(test_url, timeout=15) as response:
-            if response.status == 200:
-                data = json.loads(response.read().decode())
-                print(f"✅ World Bank Agriculture API accessible")
-                print(f"   Sample indicator: {test_indicator['name']}")
-                if len(data) > 1 and data[1]:
-                    print(f"   Countries with data: {len(data[1])}")
-                    
-                return True, agriculture_indicators
-            else:
-                print(f"❌ World Bank API returned status {response.status}")
-                return False, []
+        response = fetch(test_url, timeout=15)
+        if response.status_code == 200:
+            data = response.json()
+            print(f"✅ World Bank Agriculture API accessible")
+            print(f"   Sample indicator: {test_indicator['name']}")
+            if len(data) > 1 and data[1]:
+                print(f"   Countries with data: {len(data[1])}")
+                
+            return True, agriculture_indicators
+        else:
+            print(f"❌ World Bank API returned status {response.status_code}")
+            return False, []
     except Exception as e:
         print(f"❌ World Bank API error: {e}")
         return False, []
@@ -104,47 +100,47 @@ def extract_wb_agriculture_data(indicator, countries_iso3):
     
     # Create country string for API
     country_string = ";".join(countries_iso3)
-    url = f"https://api.worldbank.org/v2/country/{country_string}/indicator/{indicator['code']}?format=json&date=2020:2024&per_page=500"
+    url = f"{BASE_URL}/country/{country_string}/indicator/{indicator['code']}?format=json&date=2020:2024&per_page=500"
     
     try:
-        with urllib.request.urlopen(url, timeout=30) as response:
-            if response.status == 200:
-                data = json.loads(response.read().decode())
+        response = fetch(url, timeout=30)
+        if response.status_code == 200:
+            data = response.json()
+            
+            if len(data) > 1 and data[1]:
+                # Process the data
+                country_data = {}
+                
+                for entry in data[1]:
+                    if entry['value'] is not None:
+                        country_name = entry['country']['value']
+                        country_iso3 = entry['countryiso3code']
+                        year = entry['date']
+                        value = entry['value']
+                        
+                        if country_iso3 not in country_data:
+                            country_data[country_iso3] = {
+                                'name': country_name,
+                                'latest_value': value,
+                                'year': year
+                            }
+                        else:
+                            # Keep most recent year
+                            if int(year) > int(country_data[country_iso3]['year']):
+                                country_data[country_iso3]['latest_value'] = value
+                                country_data[country_iso3]['year'] = year
+                
+                coverage = len(country_data)
+                print(f"   ✅ Data retrieved for {coverage} countries")
+                
+                return {
+                    'indicator': indicator['name'],
+                    'code': indicator['code'],
+                    'source': 'World Bank Open Data',
+                    'data': country_data,
+                    'coverage': coverage
+                }
                 
-                if len(data) > 1 and data[1]:
-                    # Process the data
-                    country_data = {}
-                    
-                    for entry in data[1]:
-                        if entry['value'] is not None:
-                            country_name = entry['country']['value']
-                            country_iso3 = entry['countryiso3code']
-                            year = entry['date']
-                            value = entry['value']
-                            
-                            if country_iso3 not in country_data:
-                                country_data[country_iso3] = {
-                                    'name': country_name,
-                                    'latest_value': value,
-                                    'year': year
-                                }
-                            else:
-                                # Keep most recent year
-                                if int(year) > int(country_data[country_iso3]['year']):
-                                    country_data[country_iso3]['latest_value'] = value
-                                    country_data[country_iso3]['year'] = year
-                    
-                    coverage = len(country_data)
-                    print(f"   ✅ Data retrieved for {coverage} countries")
-                    
-                    return {
-                        'indicator': indicator['name'],
-                        'code': indicator['code'],
-                        'source': 'World Bank Open Data',
-                        'data': country_data,
-                        'coverage': coverage
-                    }
-                    
     except Exception as e:
         print(f"   ❌ Error: {e}")
         return None
@@ -199,8 +195,6 @@ def main():
                     extracted_data.append(result)
                 else:
                     print(f"   ⚠️  {coverage_pct:.1f}% coverage for our countries")
-            
-            time.sleep(0.5)  # Rate limiting
         
         # Save results
         results = {
@@ -4,9 +4,9 @@ Test Heritage Foundation Economic Freedom data
 Step 4: Test Heritage Foundation for economic freedom indicators
 """
 
-import urllib.request
 import json
 import time
+from http_client import fetch
 
 def test_heritage_foundation_access():
     """Test Heritage Foundation data accessibility"""
@@ -26,35 +26,30 @@ def test_heritage_foundation_access():
     for endpoint in test_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            request = urllib.request.Request(endpoint)
-            request.add_header('User-Agent', 'Mozilla/5.0 (Research Project)')
-            
-            with urllib.request.urlopen(request, timeout=15) as response:
-                if response.status == 200:
-                    content = response.read().decode()
-                    print(f"✅ SUCCESS - Response length: {len(content)} chars")
-                    working_endpoints.append(endpoint)
+            response = fetch(endpoint, timeout=15, headers={'User-Agent': 'Mozilla/5.0 (Research Project)'})
+            if response.status_code == 200:
+                content = response.text
+                print(f"✅ SUCCESS - Response length: {len(content)} chars")
+                working_endpoints.append(endpoint)
+                
+                # Try to parse JSON
+                try:
+                    data = json.loads(content)
+                    if isinstance(data, dict):
+                        print(f"📊 JSON object with keys: {list(data.keys())}")
+                    elif isinstance(data, list):
+                        print(f"📊 JSON array with {len(data)} items")
+                        if len(data) > 0:
+                            sample = data[0]
+                            if isinstance(sample, dict):
+                                print(f"    Sample keys: {list(sample.keys())}")
+                except json.JSONDecodeError:
+                    print("📊 Not JSON format")
                     
-                    # Try to parse JSON
-                    try:
-                        data = json.loads(content)
-                        if isinstance(data, dict):
-                            print(f"📊 JSON object with keys: {list(data.keys())}")
-                        elif isinstance(data, list):
-                            print(f"📊 JSON array with {len(data)} items")
-                            if len(data) > 0:
-                                sample = data[0]
-                                if isinstance(sample, dict):
-                                    print(f"    Sample keys: {list(sample.keys())}")
-                    except json.JSONDecodeError:
-                        print("📊 Not JSON format")
-                        
-                else:
-                    print(f"❌ HTTP {response.status}")
+            else:
+                print(f"❌ HTTP {response.status_code}")
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(2)
     
     return working_endpoints
 
@@ -76,32 +71,27 @@ def test_transparency_international():
     for endpoint in test_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            request = urllib.request.Request(endpoint)
-            request.add_header('User-Agent', 'Mozilla/5.0 (Research Project)')
-            
-            with urllib.request.urlopen(request, timeout=15) as response:
-                if response.status == 200:
-                    content = response.read().decode()
-                    print(f"✅ SUCCESS - Response length: {len(content)} chars")
-                    working_endpoints.append(endpoint)
-                    
-                    # Check content type
-                    if content.strip().startswith('{'):
-                        print("📊 Response format: JSON")
-                    elif ',' in content and '\n' in content:
-                        print("📊 Response format: CSV")
-                        # Count rows
-                        rows = content.strip().split('\n')
-                        print(f"    CSV has {len(rows)} rows")
-                    else:
-                        print("📊 Response format: Other")
-                        
+            response = fetch(endpoint, timeout=15, headers={'User-Agent': 'Mozilla/5.0 (Research Project)'})
+            if response.status_code == 200:
+                content = response.text
+                print(f"✅ SUCCESS - Response length: {len(content)} chars")
+                working_endpoints.append(endpoint)
+                
+                # Check content type
+                if content.strip().startswith('{'):
+                    print("📊 Response format: JSON")
+                elif ',' in content and '\n' in content:
+                    print("📊 Response format: CSV")
+                    # Count rows
+                    rows = content.strip().split('\n')
+                    print(f"    CSV has {len(rows)} rows")
                 else:
-                    print(f"❌ HTTP {response.status}")
+                    print("📊 Response format: Other")
+                    
+            else:
+                print(f"❌ HTTP {response.status_code}")
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(2)
     
     return working_endpoints
 
@@ -123,31 +113,26 @@ def test_freedom_house():
     for endpoint in test_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            request = urllib.request.Request(endpoint)
-            request.add_header('User-Agent', 'Mozilla/5.0 (Research Project)')
-            
-            with urllib.request.urlopen(request, timeout=15) as response:
-                if response.status == 200:
-                    content_type = response.headers.get('Content-Type', '')
-                    content_length = response.headers.get('Content-Length', 'unknown')
-                    print(f"✅ SUCCESS - Content-Type: {content_type}, Length: {content_length}")
-                    working_endpoints.append(endpoint)
-                    
-                    if 'json' in content_type.lower():
-                        print("📊 JSON data available")
-                    elif 'excel' in content_type.lower() or 'xlsx' in content_type.lower():
-                        print("📊 Excel file available")
-                    elif 'csv' in content_type.lower():
-                        print("📊 CSV data available")
-                    else:
-                        print("📊 Other format")
-                        
+            response = fetch(endpoint, timeout=15, headers={'User-Agent': 'Mozilla/5.0 (Research Project)'})
+            if response.status_code == 200:
+                content_type = response.headers.get('Content-Type', '')
+                content_length = response.headers.get('Content-Length', 'unknown')
+                print(f"✅ SUCCESS - Content-Type: {content_type}, Length: {content_length}")
+                working_endpoints.append(endpoint)
+                
+                if 'json' in content_type.lower():
+                    print("📊 JSON data available")
+                elif 'excel' in content_type.lower() or 'xlsx' in content_type.lower():
+                    print("📊 Excel file available")
+                elif 'csv' in content_type.lower():
+                    print("📊 CSV data available")
                 else:
-                    print(f"❌ HTTP {response.status}")
+                    print("📊 Other format")
+                    
+            else:
+                print(f"❌ HTTP {response.status_code}")
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(2)
     
     return working_endpoints
 
@@ -169,29 +154,24 @@ def test_world_happiness_report():
     for endpoint in test_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            request = urllib.request.Request(endpoint)
-            request.add_header('User-Agent', 'Mozilla/5.0 (Research Project)')
-            
-            with urllib.request.urlopen(request, timeout=15) as response:
-                if response.status == 200:
-                    content_type = response.headers.get('Content-Type', '')
-                    content_length = response.headers.get('Content-Length', 'unknown')
-                    print(f"✅ SUCCESS - Content-Type: {content_type}, Length: {content_length}")
-                    working_endpoints.append(endpoint)
-                    
-                    if 'csv' in content_type.lower() or endpoint.endswith('.csv'):
-                        print("📊 CSV data available")
-                    elif 'excel' in content_type.lower() or endpoint.endswith('.xls'):
-                        print("📊 Excel file available")
-                    else:
-                        print("📊 Other format")
-                        
+            response = fetch(endpoint, timeout=15, headers={'User-Agent': 'Mozilla/5.0 (Research Project)'})
+            if response.status_code == 200:
+                content_type = response.headers.get('Content-Type', '')
+                content_length = response.headers.get('Content-Length', 'unknown')
+                print(f"✅ SUCCESS - Content-Type: {content_type}, Length: {content_length}")
+                working_endpoints.append(endpoint)
+                
+                if 'csv' in content_type.lower() or endpoint.endswith('.csv'):
+                    print("📊 CSV data available")
+                elif 'excel' in content_type.lower() or endpoint.endswith('.xls'):
+                    print("📊 Excel file available")
                 else:
-                    print(f"❌ HTTP {response.status}")
+                    print("📊 Other format")
+                    
+            else:
+                print(f"❌ HTTP {response.status_code}")
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(2)
     
     return working_endpoints
 
@@ -4,9 +4,9 @@ Test OECD Data API for country coverage and available indicators
 Step 2: Test OECD API accessibility and data
 """
 
-import urllib.request
 import json
 import time
+from http_client import fetch
 
 def test_oecd_api_access():
     """Test basic OECD API accessibility"""
@@ -26,23 +26,21 @@ def test_oecd_api_access():
     for endpoint in test_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            with urllib.request.urlopen(endpoint, timeout=10) as response:
-                content = response.read().decode()
-                print(f"✅ SUCCESS - Response length: {len(content)} chars")
-                working_endpoints.append(endpoint)
+            response = fetch(endpoint, timeout=10)
+            content = response.text
+            print(f"✅ SUCCESS - Response length: {len(content)} chars")
+            working_endpoints.append(endpoint)
+            
+            # Check if it's JSON or XML
+            if content.strip().startswith('{'):
+                print("📊 Response format: JSON")
+            elif content.strip().startswith('<'):
+                print("📊 Response format: XML")
+            else:
+                print("📊 Response format: Other")
                 
-                # Check if it's JSON or XML
-                if content.strip().startswith('{'):
-                    print("📊 Response format: JSON")
-                elif content.strip().startswith('<'):
-                    print("📊 Response format: XML")
-                else:
-                    print("📊 Response format: Other")
-                    
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(1)
     
     return working_endpoints
 
@@ -60,46 +58,44 @@ def test_oecd_countries():
     for endpoint in country_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            with urllib.request.urlopen(endpoint, timeout=15) as response:
-                content = response.read().decode()
-                print(f"✅ SUCCESS - Got response")
-                
-                # Try to parse and find country information
-                if content.strip().startswith('{'):
-                    try:
-                        data = json.loads(content)
-                        print("📊 JSON response - checking for country data...")
-                        
-                        # Look for country-related keys
-                        def find_countries_in_json(obj, path=""):
-                            if isinstance(obj, dict):
-                                for key, value in obj.items():
-                                    if 'country' in key.lower() or 'area' in key.lower() or 'geo' in key.lower():
-                                        print(f"  Found potential country data at: {path}.{key}")
-                                    find_countries_in_json(value, f"{path}.{key}")
-                            elif isinstance(obj, list) and len(obj) > 0:
-                                find_countries_in_json(obj[0], f"{path}[0]")
-                        
-                        find_countries_in_json(data)
-                        
-                    except json.JSONDecodeError:
-                        print("❌ Not valid JSON")
-                
-                elif content.strip().startswith('<'):
-                    print("📊 XML response - checking structure...")
+            response = fetch(endpoint, timeout=15)
+            content = response.text
+            print(f"✅ SUCCESS - Got response")
+            
+            # Try to parse and find country information
+            if content.strip().startswith('{'):
+                try:
+                    data = json.loads(content)
+                    print("📊 JSON response - checking for country data...")
                     
-                    # Look for country-related XML tags
-                    country_indicators = ['country', 'area', 'geo', 'member']
-                    for indicator in country_indicators:
-                        if indicator.lower() in content.lower():
-                            print(f"  Found '{indicator}' in XML content")
-                
-                break  # If we got a response, don't try other endpoints
+                    # Look for country-related keys
+                    def find_countries_in_json(obj, path=""):
+                        if isinstance(obj, dict):
+                            for key, value in obj.items():
+                                if 'country' in key.lower() or 'area' in key.lower() or 'geo' in key.lower():
+                                    print(f"  Found potential country data at: {path}.{key}")
+                                find_countries_in_json(value, f"{path}.{key}")
+                        elif isinstance(obj, list) and len(obj) > 0:
+                            find_countries_in_json(obj[0], f"{path}[0]")
+                    
+                    find_countries_in_json(data)
+                    
+                except json.JSONDecodeError:
+                    print("❌ Not valid JSON")
+            
+            elif content.strip().startswith('<'):
+                print("📊 XML response - checking structure...")
                 
+                # Look for country-related XML tags
+                country_indicators = ['country', 'area', 'geo', 'member']
+                for indicator in country_indicators:
+                    if indicator.lower() in content.lower():
+                        print(f"  Found '{indicator}' in XML content")
+            
+            break  # If we got a response, don't try other endpoints
+            
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(1)
 
 def check_oecd_indicators():
     """Try to find OECD indicators that might be interesting"""
@@ -132,20 +128,18 @@ def check_oecd_indicators():
     for endpoint in bli_endpoints:
         print(f"\nTesting BLI: {endpoint}")
         try:
-            with urllib.request.urlopen(endpoint, timeout=15) as response:
-                content = response.read().decode()
-                print(f"✅ Better Life Index accessible - {len(content)} chars")
-                
-                # This would contain happiness, life satisfaction, etc.
-                if 'satisfaction' in content.lower() or 'happiness' in content.lower():
-                    print("🎯 Contains happiness/satisfaction data!")
-                
-                break
-                
+            response = fetch(endpoint, timeout=15)
+            content = response.text
+            print(f"✅ Better Life Index accessible - {len(content)} chars")
+            
+            # This would contain happiness, life satisfaction, etc.
+            if 'satisfaction' in content.lower() or 'happiness' in content.lower():
+                print("🎯 Contains happiness/satisfaction data!")
+            
+            break
+            
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(1)
 
 def main():
     print("🚀 TESTING OECD DATA API")
@@ -4,9 +4,9 @@ Test different UN Statistics API endpoint formats
 Step 5b: Find the correct UN API endpoint structure
 """
 
-import urllib.request
 import json
 import time
+from http_client import fetch
 
 def test_un_endpoint_formats():
     """Test various UN API endpoint formats"""
@@ -60,32 +60,30 @@ def test_un_endpoint_formats():
         print(f"  URL: {endpoint_url}")
         
         try:
-            with urllib.request.urlopen(endpoint_url, timeout=10) as response:
-                if response.status == 200:
-                    content = response.read().decode()
-                    print(f"  ✅ SUCCESS - Response length: {len(content)} chars")
+            response = fetch(endpoint_url, timeout=10)
+            if response.status_code == 200:
+                content = response.text
+                print(f"  ✅ SUCCESS - Response length: {len(content)} chars")
+                
+                try:
+                    data = json.loads(content)
+                    if isinstance(data, dict):
+                        print(f"  📊 JSON object with keys: {list(data.keys())}")
+                        if 'data' in data:
+                            print(f"      Data records: {len(data['data'])}")
+                    elif isinstance(data, list):
+                        print(f"  📊 JSON array with {len(data)} items")
                     
-                    try:
-                        data = json.loads(content)
-                        if isinstance(data, dict):
-                            print(f"  📊 JSON object with keys: {list(data.keys())}")
-                            if 'data' in data:
-                                print(f"      Data records: {len(data['data'])}")
-                        elif isinstance(data, list):
-                            print(f"  📊 JSON array with {len(data)} items")
-                        
-                        working_endpoints.append((endpoint_name, endpoint_url, config))
-                        
-                    except json.JSONDecodeError:
-                        print("  📊 Not JSON format")
-                        
-                else:
-                    print(f"  ❌ HTTP {response.status}")
+                    working_endpoints.append((endpoint_name, endpoint_url, config))
                     
+                except json.JSONDecodeError:
+                    print("  📊 Not JSON format")
+                    
+            else:
+                print(f"  ❌ HTTP {response.status_code}")
+                
         except Exception as e:
             print(f"  ❌ ERROR: {e}")
-        
-        time.sleep(1)
     
     return working_endpoints
 
@@ -108,32 +106,30 @@ def test_un_base_endpoints():
     for endpoint in base_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            with urllib.request.urlopen(endpoint, timeout=10) as response:
-                if response.status == 200:
-                    content = response.read().decode()
-                    print(f"✅ SUCCESS - Response length: {len(content)} chars")
-                    
-                    # Check if it's JSON or contains useful info
-                    if content.strip().startswith('{'):
-                        try:
-                            data = json.loads(content)
-                            print(f"📊 JSON response with keys: {list(data.keys())}")
-                        except:
-                            print("📊 JSON parsing failed")
-                    elif 'swagger' in content.lower() or 'api' in content.lower():
-                        print("📊 API documentation found")
-                    elif 'series' in content.lower() or 'data' in content.lower():
-                        print("📊 Data-related content found")
-                    
-                    working_bases.append(endpoint)
-                    
-                else:
-                    print(f"❌ HTTP {response.status}")
-                    
+            response = fetch(endpoint, timeout=10)
+            if response.status_code == 200:
+                content = response.text
+                print(f"✅ SUCCESS - Response length: {len(content)} chars")
+                
+                # Check if it's JSON or contains useful info
+                if content.strip().startswith('{'):
+                    try:
+                        data = json.loads(content)
+                        print(f"📊 JSON response with keys: {list(data.keys())}")
+                    except:
+                        print("📊 JSON parsing failed")
+                elif 'swagger' in content.lower() or 'api' in content.lower():
+                    print("📊 API documentation found")
+                elif 'series' in content.lower() or 'data' in content.lower():
+                    print("📊 Data-related content found")
+                
+                working_bases.append(endpoint)
+                
+            else:
+                print(f"❌ HTTP {response.status_code}")
+                
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(1)
     
     return working_bases
 
@@ -151,31 +147,29 @@ def test_known_working_endpoints():
     for endpoint in known_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            with urllib.request.urlopen(endpoint, timeout=10) as response:
-                if response.status == 200:
-                    content = response.read().decode()
-                    data = json.loads(content)
-                    
-                    print(f"✅ SUCCESS - {len(data)} items returned")
-                    
-                    if len(data) > 0:
-                        sample = data[0]
-                        if isinstance(sample, dict):
-                            print(f"    Sample keys: {list(sample.keys())}")
+            response = fetch(endpoint, timeout=10)
+            if response.status_code == 200:
+                content = response.text
+                data = json.loads(content)
+                
+                print(f"✅ SUCCESS - {len(data)} items returned")
+                
+                if len(data) > 0:
+                    sample = data[0]
+                    if isinstance(sample, dict):
+                        print(f"    Sample keys: {list(sample.keys())}")
+                        
+                        # Look for data structure clues
+                        if 'code' in sample:
+                            print(f"    Sample code: {sample['code']}")
+                        if 'uri' in sample:
+                            print(f"    Sample URI: {sample['uri']}")
                             
-                            # Look for data structure clues
-                            if 'code' in sample:
-                                print(f"    Sample code: {sample['code']}")
-                            if 'uri' in sample:
-                                print(f"    Sample URI: {sample['uri']}")
-                                
-                else:
-                    print(f"❌ HTTP {response.status}")
-                    
+            else:
+                print(f"❌ HTTP {response.status_code}")
+                
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(1)
 
 def main():
     print("🚀 TESTING UN STATISTICS API ENDPOINT DISCOVERY")
@@ -4,9 +4,9 @@ Test UN Statistics API for our specific 40 countries
 Check which of our countries are available in UN data
 """
 
-import urllib.request
 import json
 import time
+from http_client import fetch
 
 def get_un_countries():
     """Get the actual list of countries from UN Statistics API"""
@@ -15,8 +15,9 @@ def get_un_countries():
     
     try:
         url = "https://unstats.un.org/SDGAPI/v1/sdg/GeoArea/List"
-        with urllib.request.urlopen(url, timeout=15) as response:
-            countries = json.loads(response.read().decode())
+        response = fetch(url, timeout=15)
+        response.raise_for_status()
+        countries = response.json()
         
         print(f"✅ Retrieved {len(countries)} geographic areas from UN")
         return countries
@@ -32,8 +33,9 @@ def get_un_indicators():
     
     try:
         url = "https://unstats.un.org/SDGAPI/v1/sdg/Series/List"
-        with urllib.request.urlopen(url, timeout=15) as response:
-            indicators = json.loads(response.read().decode())
+        response = fetch(url, timeout=15)
+        response.raise_for_status()
+        indicators = response.json()
         
         print(f"✅ Retrieved {len(indicators)} indicators from UN")
         return indicators
@@ -4,9 +4,9 @@ Test specific UN Statistics indicators for our 40 countries
 Step 5: Test actual data availability for UN indicators
 """
 
-import urllib.request
 import json
 import time
+from http_client import fetch
 
 def load_our_countries():
     """Load our 40 countries and UN mappings"""
@@ -51,36 +51,34 @@ def test_un_indicator_data(indicator_code, countries_mapping, max_countries=5):
             
             full_url = url + params
             
-            with urllib.request.urlopen(full_url, timeout=10) as response:
-                if response.status == 200:
-                    data = json.loads(response.read().decode())
+            response = fetch(full_url, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                
+                # Check if we have actual data values
+                if 'data' in data and len(data['data']) > 0:
+                    has_value = False
+                    for record in data['data']:
+                        if 'value' in record and record['value'] is not None:
+                            has_value = True
+                            break
                     
-                    # Check if we have actual data values
-                    if 'data' in data and len(data['data']) > 0:
-                        has_value = False
-                        for record in data['data']:
-                            if 'value' in record and record['value'] is not None:
-                                has_value = True
-                                break
-                        
-                        if has_value:
-                            available_countries.append((our_name, un_code))
-                            print(f"  ✅ {our_name}")
-                        else:
-                            missing_countries.append((our_name, un_code, "no_values"))
-                            print(f"  ⚠️  {our_name} (structure but no values)")
+                    if has_value:
+                        available_countries.append((our_name, un_code))
+                        print(f"  ✅ {our_name}")
                     else:
-                        missing_countries.append((our_name, un_code, "no_data"))
-                        print(f"  ❌ {our_name} (no data)")
+                        missing_countries.append((our_name, un_code, "no_values"))
+                        print(f"  ⚠️  {our_name} (structure but no values)")
                 else:
-                    missing_countries.append((our_name, un_code, f"http_{response.status}"))
-                    print(f"  ❌ {our_name} (HTTP {response.status})")
-                    
+                    missing_countries.append((our_name, un_code, "no_data"))
+                    print(f"  ❌ {our_name} (no data)")
+            else:
+                missing_countries.append((our_name, un_code, f"http_{response.status_code}"))
+                print(f"  ❌ {our_name} (HTTP {response.status_code})")
+                
         except Exception as e:
             missing_countries.append((our_name, un_code, str(e)))
             print(f"  ❌ {our_name} (ERROR: {e})")
-        
-        time.sleep(0.5)  # Rate limiting
     
     coverage = len(available_countries) / len(test_countries) * 100
     print(f"  📊 Coverage: {len(available_countries)}/{len(test_countries)} ({coverage:.0f}%)")
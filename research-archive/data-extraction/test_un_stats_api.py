@@ -5,9 +5,9 @@ Step 1: Discover what data sources and indicators are actually available
 NO ASSUMPTIONS - only test what exists
 """
 
-import urllib.request
 import json
 import time
+from http_client import fetch
 
 def test_un_stats_api():
     """Test if UN Statistics API is accessible and what it provides"""
@@ -27,22 +27,20 @@ def test_un_stats_api():
     for endpoint in test_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            with urllib.request.urlopen(endpoint, timeout=10) as response:
-                if response.status == 200:
-                    data = json.loads(response.read().decode())
-                    print(f"✅ SUCCESS - Got {len(data)} items")
-                    working_endpoints.append(endpoint)
-                    
-                    # Show sample of what we got
-                    if data and len(data) > 0:
-                        sample = data[0]
-                        print(f"Sample item keys: {list(sample.keys())}")
-                else:
-                    print(f"❌ HTTP {response.status}")
+            response = fetch(endpoint, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                print(f"✅ SUCCESS - Got {len(data)} items")
+                working_endpoints.append(endpoint)
+                
+                # Show sample of what we got
+                if data and len(data) > 0:
+                    sample = data[0]
+                    print(f"Sample item keys: {list(sample.keys())}")
+            else:
+                print(f"❌ HTTP {response.status_code}")
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(1)  # Rate limiting
     
     return working_endpoints
 
@@ -60,26 +58,24 @@ def test_un_country_data():
     for endpoint in country_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            with urllib.request.urlopen(endpoint, timeout=10) as response:
-                data = json.loads(response.read().decode())
-                print(f"✅ Got {len(data)} items")
-                
-                # Look for our 40 countries in the data
-                if data and len(data) > 0:
-                    # Check if this looks like country data
-                    sample = data[0]
-                    if 'geoAreaName' in sample or 'country' in str(sample).lower():
-                        print("🌍 This appears to contain country information")
-                        
-                        # Show a few country names if available
-                        for item in data[:5]:
-                            if 'geoAreaName' in item:
-                                print(f"  - {item['geoAreaName']}")
+            response = fetch(endpoint, timeout=10)
+            data = response.json()
+            print(f"✅ Got {len(data)} items")
+            
+            # Look for our 40 countries in the data
+            if data and len(data) > 0:
+                # Check if this looks like country data
+                sample = data[0]
+                if 'geoAreaName' in sample or 'country' in str(sample).lower():
+                    print("🌍 This appears to contain country information")
                     
+                    # Show a few country names if available
+                    for item in data[:5]:
+                        if 'geoAreaName' in item:
+                            print(f"  - {item['geoAreaName']}")
+                
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(1)
 
 def main():
     print("🚀 STARTING UN STATISTICS API TESTING")
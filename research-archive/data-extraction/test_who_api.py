@@ -4,9 +4,9 @@ Test WHO Global Health Observatory API
 Step 3: Test WHO API for health indicators and country coverage
 """
 
-import urllib.request
 import json
 import time
+from http_client import fetch
 
 def test_who_api_access():
     """Test WHO Global Health Observatory API endpoints"""
@@ -26,32 +26,30 @@ def test_who_api_access():
     for endpoint in test_endpoints:
         print(f"\nTesting: {endpoint}")
         try:
-            with urllib.request.urlopen(endpoint, timeout=10) as response:
-                if response.status == 200:
-                    content = response.read().decode()
-                    print(f"✅ SUCCESS - Response length: {len(content)} chars")
-                    working_endpoints.append(endpoint)
+            response = fetch(endpoint, timeout=10)
+            if response.status_code == 200:
+                content = response.text
+                print(f"✅ SUCCESS - Response length: {len(content)} chars")
+                working_endpoints.append(endpoint)
+                
+                # Try to parse JSON
+                try:
+                    data = json.loads(content)
+                    if isinstance(data, dict):
+                        print(f"📊 JSON object with keys: {list(data.keys())}")
+                    elif isinstance(data, list):
+                        print(f"📊 JSON array with {len(data)} items")
+                        if len(data) > 0:
+                            sample = data[0]
+                            if isinstance(sample, dict):
+                                print(f"    Sample keys: {list(sample.keys())}")
+                except json.JSONDecodeError:
+                    print("📊 Not JSON format")
                     
-                    # Try to parse JSON
-                    try:
-                        data = json.loads(content)
-                        if isinstance(data, dict):
-                            print(f"📊 JSON object with keys: {list(data.keys())}")
-                        elif isinstance(data, list):
-                            print(f"📊 JSON array with {len(data)} items")
-                            if len(data) > 0:
-                                sample = data[0]
-                                if isinstance(sample, dict):
-                                    print(f"    Sample keys: {list(sample.keys())}")
-                    except json.JSONDecodeError:
-                        print("📊 Not JSON format")
-                        
-                else:
-                    print(f"❌ HTTP {response.status}")
+            else:
+                print(f"❌ HTTP {response.status_code}")
         except Exception as e:
             print(f"❌ ERROR: {e}")
-        
-        time.sleep(1)
     
     return working_endpoints
 
@@ -63,8 +61,8 @@ def test_who_countries():
     try:
         # Get WHO country list
         url = "https://ghoapi.azureedge.net/api/DIMENSION/COUNTRY"
-        with urllib.request.urlopen(url, timeout=15) as response:
-            who_countries = json.loads(response.read().decode())
+        response = fetch(url, timeout=15)
+        who_countries = response.json()
         
         print(f"✅ Retrieved {len(who_countries)} countries/regions from WHO")
         
@@ -124,8 +122,8 @@ def test_who_indicators():
     try:
         # Get WHO indicators
         url = "https://ghoapi.azureedge.net/api/DIMENSION/GHO"
-        with urllib.request.urlopen(url, timeout=15) as response:
-            who_indicators = json.loads(response.read().decode())
+        response = fetch(url, timeout=15)
+        who_indicators = response.json()
         
         print(f"✅ Retrieved {len(who_indicators)} WHO indicators")
         
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Topic Export
+Writes every indicator of a topic to one long-format columnar file, with
+optional wide views, one indicator at a time
+
+Instead of collecting a DataFrame per indicator and pivoting each one
+again for an Excel sheet, each indicator's window is read from the
+history store, appended to the open writers and dropped, so memory stays
+at one indicator's data however many indicators and countries a topic has.
+
+- Long file (indicator, country_code, country, year, value):
+  - parquet: one row group per indicator, dictionary-encoded code columns
+  - feather: Arrow IPC file, one record batch per indicator
+  - csv:     plain rows (the default when pyarrow is not installed)
+- Wide views, written row by row while the long file is written:
+  - csv:  one row per (indicator, country), a column per year
+  - xlsx: one sheet per indicator (openpyxl write-only mode)
+
+Optional dependencies: pip install pyarrow (parquet/feather),
+pip install openpyxl (xlsx)
+
+Usage:
+    from topic_export import export_topic
+    paths = export_topic(get_history_store(), "economy", indicator_codes, countries,
+                         2010, 2024, out_dir="world_bank_cache", views=("xlsx",))
+"""
+
+import csv
+import os
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+LONG_FORMATS = ("parquet", "feather", "csv")
+WIDE_VIEWS = ("csv", "xlsx")
+LONG_COLUMNS = ("indicator", "country_code", "country", "year", "value")
+
+
+class LongWriter:
+    """Appends one indicator's observations at a time to the long file"""
+
+    def __init__(self, path, long_format):
+        if long_format in ("parquet", "feather") and pa is None:
+            raise ImportError(f"{long_format} export needs pyarrow: pip install pyarrow")
+        self.long_format = long_format
+        if long_format == "parquet":
+            code = pa.dictionary(pa.int32(), pa.string())
+            self.schema = pa.schema([("indicator", code), ("country_code", code), ("country", code),
+                                     ("year", pa.int16()), ("value", pa.float64())])
+            self.writer = pq.ParquetWriter(path, self.schema)
+        elif long_format == "feather":
+            # The IPC file format can't replace dictionaries between batches
+            self.schema = pa.schema([("indicator", pa.string()), ("country_code", pa.string()),
+                                     ("country", pa.string()), ("year", pa.int16()), ("value", pa.float64())])
+            self.writer = pa.ipc.new_file(path, self.schema, options=pa.ipc.IpcWriteOptions(compression="lz4"))
+        else:
+            self.file = open(path, 'w', newline='')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(LONG_COLUMNS)
+
+    def write(self, indicator_code, country_codes, country_labels, years, values):
+        if self.long_format == "csv":
+            self.writer.writerows(zip([indicator_code] * len(years), country_codes, country_labels, years, values))
+            return
+        batch = pa.record_batch([
+            pa.array([indicator_code] * len(years)),
+            pa.array(country_codes),
+            pa.array(country_labels),
+            pa.array(years, pa.int16()),
+            pa.array(values, pa.float64())
+        ], names=list(LONG_COLUMNS))
+        if self.long_format == "parquet":
+            batch = pa.record_batch(
+                [column.dictionary_encode() if field.type == pa.string() else column
+                 for column, field in zip(batch.columns, batch.schema)],
+                schema=self.schema
+            )
+            self.writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self.writer.write_batch(batch)
+
+    def close(self):
+        if self.long_format == "csv":
+            self.file.close()
+        else:
+            self.writer.close()
+
+
+def export_topic(store, topic_name, indicator_codes, countries, start_year, end_year,
+                 out_dir=".", long_format=None, views=(), country_names=None):
+    """Export a topic from a HistoryStore
+
+    long_format defaults to parquet (csv without pyarrow).
+
+    Returns {"long": path, "csv"/"xlsx": path for each view, "rows": n,
+    "failed": [indicators that could not be fetched]}.
+    """
+    if long_format is None:
+        long_format = "parquet" if pa is not None else "csv"
+    if long_format not in LONG_FORMATS:
+        raise ValueError(f"Unknown long format {long_format!r} (use one of {LONG_FORMATS})")
+    for view in views:
+        if view not in WIDE_VIEWS:
+            raise ValueError(f"Unknown view {view!r} (use one of {WIDE_VIEWS})")
+    if "xlsx" in views and Workbook is None:
+        raise ImportError("xlsx export needs openpyxl: pip install openpyxl")
+
+    country_names = country_names or {}
+    countries = list(countries)
+    year_columns = list(range(start_year, end_year + 1))
+    stem = os.path.join(out_dir, f"{topic_name.lower()}_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+    result = {"long": f"{stem}.{long_format}", "rows": 0, "failed": []}
+    long_writer = LongWriter(result["long"], long_format)
+    wide_file = wide_writer = workbook = None
+    if "csv" in views:
+        result["csv"] = f"{stem}_wide.csv"
+        wide_file = open(result["csv"], 'w', newline='')
+        wide_writer = csv.writer(wide_file)
+        wide_writer.writerow(["indicator", "country_code", "country"] + year_columns)
+    if "xlsx" in views:
+        result["xlsx"] = f"{stem}.xlsx"
+        workbook = Workbook(write_only=True)
+
+    try:
+        for indicator_code in indicator_codes:
+            try:
+                window = store.window(indicator_code, countries, start_year, end_year)
+            except IOError as e:
+                print(f"   ❌ Could not fetch {indicator_code}: {e}")
+                result["failed"].append(indicator_code)
+                continue
+
+            country_codes, country_labels, years, values = [], [], [], []
+            sheet = None
+            for country in countries:
+                annual = {int(year): value for year, value in window[country].items() if year.isdigit()}
+                if not annual:
+                    continue
+                label = country_names.get(country, country)
+                for year in sorted(annual):
+                    country_codes.append(country)
+                    country_labels.append(label)
+                    years.append(year)
+                    values.append(float(annual[year]))
+                row = [annual.get(year) for year in year_columns]
+                if wide_writer is not None:
+                    wide_writer.writerow([indicator_code, country, label] + row)
+                if workbook is not None:
+                    if sheet is None:
+                        sheet = workbook.create_sheet(indicator_code[:31])  # Excel sheet name limit
+                        sheet.append(["country"] + year_columns)
+                    sheet.append([label] + row)
+
+            if not years:
+                continue
+            long_writer.write(indicator_code, country_codes, country_labels, years, values)
+            result["rows"] += len(years)
+    finally:
+        long_writer.close()
+        if wide_file is not None:
+            wide_file.close()
+        if workbook is not None:
+            workbook.save(result["xlsx"])
+
+    return result
@@ -4,28 +4,9 @@ Verify Data Matrix: Check that World Bank has data for all 40 country x 40 chall
 Maps each challenge to specific World Bank indicators
 """
 
-import urllib.request
 import json
 import time
-
-def test_data_availability(country_iso3, indicator_code):
-    """Test if country has recent data for this indicator"""
-    url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator_code}"
-    params = "?format=json&date=2020:2024&per_page=3"
-    
-    try:
-        with urllib.request.urlopen(url + params, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            
-        if len(data) > 1 and data[1]:
-            # Find most recent non-null value
-            for entry in data[1]:
-                if entry["value"] is not None:
-                    return True, entry["value"], entry["date"]
-        return False, None, None
-        
-    except:
-        return False, None, None
+from availability_probe import probe_availability
 
 def main():
     print("🔍 VERIFYING DATA MATRIX: 40 Countries x 40 Challenges")
@@ -98,6 +79,8 @@ def main():
     
     print(f"\n🔍 Testing {len(core_indicators)} core indicators across all countries...")
     
+    grid = probe_availability(countries.keys(), core_indicators, 2020, 2024)
+    
     data_matrix = {}
     missing_data = []
     
@@ -108,7 +91,7 @@ def main():
         available_count = 0
         
         for indicator in core_indicators:
-            has_data, value, year = test_data_availability(iso3, indicator)
+            has_data, value, year = grid.cell(iso3, indicator)
             
             if has_data:
                 country_data[indicator] = {"value": value, "year": year}
@@ -117,8 +100,6 @@ def main():
             else:
                 missing_data.append({"country": country_name, "iso3": iso3, "indicator": indicator})
                 print(f"    ❌ {indicator}: No data")
-            
-            time.sleep(0.1)  # Rate limiting
         
         data_matrix[iso3] = country_data
         coverage = (available_count / len(core_indicators)) * 100
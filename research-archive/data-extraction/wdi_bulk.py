@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+WDI Bulk Archive Reader
+Streams the World Development Indicators bulk ZIP instead of calling the API
+
+The archive (WDI_CSV.zip) holds:
+- the data CSV (WDICSV.csv, WDIData.csv in older releases): one row per
+  (country, indicator) with a column per year, grouped by country
+- WDISeries.csv: indicator metadata
+- WDICountry.csv: country metadata
+
+Members are read straight out of the ZIP through a streaming CSV reader,
+so only one row is in memory at a time and a full snapshot (~5 million
+data points) is read in minutes from a local file.
+
+Usage:
+    from wdi_bulk import WdiArchive
+    with WdiArchive("WDI_CSV.zip") as wdi:
+        for country_code, indicator_code, series in wdi.iter_series(2010, 2024):
+            ...
+"""
+
+import csv
+import io
+import os
+import zipfile
+
+from http_client import DEFAULT_TIMEOUT, get_client
+
+WDI_BULK_URL = "https://databank.worldbank.org/data/download/WDI_CSV.zip"
+
+DATA_MEMBERS = ("WDICSV.csv", "WDIData.csv")
+SERIES_MEMBER = "WDISeries.csv"
+COUNTRY_MEMBER = "WDICountry.csv"
+
+
+def download_wdi_archive(path, url=WDI_BULK_URL, client=None, chunk_size=1024 * 1024):
+    """Stream the bulk ZIP to disk (it is a few hundred MB; never held in memory)"""
+    http = client or get_client()
+    tmp_path = f"{path}.part"
+
+    with http.session.get(url, stream=True, timeout=DEFAULT_TIMEOUT) as response:
+        response.raise_for_status()
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+    os.replace(tmp_path, path)
+    return path
+
+
+class WdiArchive:
+    def __init__(self, path):
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.zip.close()
+
+    def member(self, *names):
+        """Archive member whose file name matches one of names"""
+        for info in self.zip.infolist():
+            if os.path.basename(info.filename) in names:
+                return info.filename
+        raise KeyError(f"{self.path} has none of {names}")
+
+    def rows(self, *names):
+        """Stream a CSV member as dicts"""
+        with self.zip.open(self.member(*names)) as raw:
+            # utf-8-sig drops the BOM the WDI files start with
+            reader = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+            for row in reader:
+                yield row
+
+    def countries(self):
+        """Country metadata in the shape of countries_metadata.json"""
+        countries = {}
+        for row in self.rows(COUNTRY_MEMBER):
+            countries[row["Country Code"]] = {
+                "name": row.get("Table Name") or row.get("Short Name", ""),
+                "iso2Code": row.get("2-alpha code", ""),
+                "region": row.get("Region", ""),
+                "incomeLevel": row.get("Income Group", ""),
+                "capitalCity": "",
+                "longitude": "",
+                "latitude": ""
+            }
+        return countries
+
+    def indicators(self):
+        """Indicator metadata in the shape of indicators_metadata.json"""
+        indicators = {}
+        for row in self.rows(SERIES_MEMBER):
+            topic = row.get("Topic", "")
+            indicators[row["Series Code"]] = {
+                "name": row.get("Indicator Name", ""),
+                "unit": row.get("Unit of measure", ""),
+                "source": row.get("Source", ""),
+                "sourceNote": row.get("Long definition", ""),
+                "topics": [topic] if topic else []
+            }
+        return indicators
+
+    def iter_series(self, start_year=2010, end_year=2024):
+        """Yield (country_code, indicator_code, {year: value}) per data row
+
+        Years outside start_year..end_year and empty cells are dropped, so
+        a series may be empty. Rows arrive grouped by country.
+        """
+        year_columns = None
+        for row in self.rows(*DATA_MEMBERS):
+            if year_columns is None:
+                year_columns = [
+                    column for column in row
+                    if column and column[:4].isdigit() and start_year <= int(column[:4]) <= end_year
+                ]
+            series = {}
+            for column in year_columns:
+                cell = row[column]
+                if cell:
+                    series[column[:4]] = float(cell)
+            yield row["Country Code"], row["Indicator Code"], series
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Work Scheduler
+Shared priority queue drained by a fixed pool of worker threads
+
+Instead of handing each worker a whole country up front, work is split
+into small units that idle workers take from one shared queue, so no
+worker sits idle while another is stuck with a long tail.
+
+- Lower priority values run first (e.g. game-relevant indicators)
+- Within a priority, the most expensive units start first so the cheap
+  ones fill in the gaps at the end of the run
+- Concurrency is bounded by the number of workers
+- A handler may add() follow-up units while the scheduler is running
+
+Retry lane: retry() parks a unit for an exponentially growing delay.
+Once due, it is picked up by the dedicated retry workers (and by main
+workers whenever the main queue is empty), so transient failures are
+retried alongside the main run instead of stalling it or waiting for
+the next one.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+
+class WorkScheduler:
+    def __init__(self, max_workers=5, retry_workers=1, retry_delay=15.0, max_retry_delay=600.0):
+        self.max_workers = max_workers
+        self.retry_workers = retry_workers
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.main = []
+        self.retries = []
+        self.outstanding = 0
+        self.order = itertools.count()
+        self.cond = threading.Condition()
+
+    def __len__(self):
+        """Units queued or in progress (including parked retries)"""
+        with self.cond:
+            return self.outstanding
+
+    def add(self, task, priority=0, cost=1):
+        """Queue a unit of work"""
+        with self.cond:
+            heapq.heappush(self.main, (priority, -cost, next(self.order), task))
+            self.outstanding += 1
+            self.cond.notify()
+
+    def retry(self, task, attempt):
+        """Park a unit on the retry lane; attempt 1 waits retry_delay, then doubling"""
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** (attempt - 1))
+        with self.cond:
+            heapq.heappush(self.retries, (time.monotonic() + delay, next(self.order), task))
+            self.outstanding += 1
+            self.cond.notify_all()
+        return delay
+
+    def _take(self, main_lane):
+        """Next unit for a worker, or None once everything is done"""
+        with self.cond:
+            while True:
+                if main_lane and self.main:
+                    return heapq.heappop(self.main)[-1]
+                now = time.monotonic()
+                if self.retries and self.retries[0][0] <= now:
+                    return heapq.heappop(self.retries)[-1]
+                if self.outstanding == 0:
+                    return None
+                self.cond.wait(self.retries[0][0] - now if self.retries else None)
+
+    def _finish(self):
+        with self.cond:
+            self.outstanding -= 1
+            self.cond.notify_all()
+
+    def run(self, handler, on_done):
+        """Run handler(task) for every queued unit until nothing is left
+
+        on_done(task, result, error) is called from the worker thread
+        after each unit; error is the exception raised by handler, if any.
+        on_done may add() or retry() units.
+        """
+        def worker(main_lane):
+            while True:
+                task = self._take(main_lane)
+                if task is None:
+                    return
+                try:
+                    result, error = handler(task), None
+                except Exception as e:
+                    result, error = None, e
+                try:
+                    on_done(task, result, error)
+                finally:
+                    self._finish()
+
+        workers = [threading.Thread(target=worker, args=(True,)) for _ in range(self.max_workers)]
+        workers += [threading.Thread(target=worker, args=(False,)) for _ in range(self.retry_workers)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
@@ -3,10 +3,9 @@
 Download World Bank data for ALL 40 countries in the Outrank game
 """
 
-import urllib.request
 import json
-import time
 from datetime import datetime
+from world_bank_batch import fetch_indicator_batched
 
 # Get all 40 countries from the game
 def get_all_game_countries():
@@ -56,26 +55,27 @@ def get_all_game_countries():
 
 def fetch_world_bank_data(country_iso3, indicator_code):
     """Fetch data from World Bank API"""
-    if country_iso3 == "TWN":  # Taiwan not in World Bank
-        return None
-        
-    url = f"https://api.worldbank.org/v2/country/{country_iso3}/indicator/{indicator_code}"
-    params = "?format=json&date=2020:2023&per_page=10"
+    return fetch_world_bank_batch([country_iso3], indicator_code).get(country_iso3)
+
+def fetch_world_bank_batch(countries_iso3, indicator_code):
+    """Fetch most recent non-null value for many countries in batched requests"""
+    # Taiwan not in World Bank
+    api_countries = [iso3 for iso3 in countries_iso3 if iso3 != "TWN"]
     
     try:
-        with urllib.request.urlopen(url + params, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            
-        if len(data) > 1 and data[1]:
-            # Find most recent non-null value
-            for entry in data[1]:
-                if entry["value"] is not None:
-                    return entry["value"]
-        return None
-        
+        batched = fetch_indicator_batched(indicator_code, api_countries, date="2020:2023")
     except Exception as e:
         print(f"    ❌ Error: {e}")
-        return None
+        return {}
+    
+    values = {}
+    for iso3 in api_countries:
+        # Find most recent non-null value
+        for entry in batched.get(iso3, []):
+            if entry["value"] is not None:
+                values[iso3] = entry["value"]
+                break
+    return values
 
 def main():
     print("🌍 World Bank Data for ALL 40 Countries")
@@ -91,6 +91,13 @@ def main():
         "IT.NET.USER.ZS": "internet_penetration"
     }
     
+    # One batched request per indicator for every country
+    all_iso3 = [info["iso3"] for info in countries.values()]
+    indicator_values = {
+        wb_code: fetch_world_bank_batch(all_iso3, wb_code)
+        for wb_code in indicators
+    }
+    
     results = {}
     
     for code, country_info in countries.items():
@@ -102,14 +109,12 @@ def main():
         country_data = {}
         
         for wb_code, game_prop in indicators.items():
-            value = fetch_world_bank_data(iso3, wb_code)
+            value = indicator_values[wb_code].get(iso3)
             if value is not None:
                 country_data[game_prop] = round(float(value), 1)
                 print(f"    ✓ {game_prop}: {value}")
             else:
                 print(f"    ❌ {game_prop}: No data")
-            
-            time.sleep(0.3)  # Rate limiting
         
         if country_data:
             results[code] = country_data
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+World Bank Async Fetch Engine
+Keeps hundreds of indicator requests in flight using asyncio
+
+Used by WorldBankCompleteDownloader.download_all_async():
+- Global concurrency limit across all requests
+- Per-host connection limit
+- Paced by the shared client's adaptive rate limiter for the host
+- Same result semantics as WorldBankCompleteDownloader.get_indicator_data
+- Transient failures are retried with back-off by a few background retry
+  workers while the main workers carry on
+
+Requires: pip install aiohttp
+"""
+
+import asyncio
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from fetch_outcome import TRANSIENT, TransientFetchError, api_error, api_error_messages, fetch_error
+from history_store import CURRENT_YEAR, FIRST_YEAR
+from http_client import DEFAULT_HEADERS, get_client
+from rate_limiter import THROTTLE_STATUSES
+
+
+def parse_time_series(data):
+    """Turn a World Bank JSON response into a {year: value} dict (or None)"""
+    if len(data) > 1 and data[1]:
+        time_series = {}
+        for entry in data[1]:
+            if entry["value"] is not None:
+                time_series[entry["date"]] = entry["value"]
+        return time_series
+    return None
+
+
+class AsyncFetchEngine:
+    def __init__(self, base_url, max_concurrency=200, per_host_limit=100, timeout=10,
+                 max_retries=3, limiter=None):
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_retries = max_retries
+        # Shared with the threaded fetchers so both back off together
+        self.limiter = limiter or get_client().limiter_for(base_url)
+        self.session = None
+        self.global_slots = None
+        self.host_slots = {}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.per_host_limit
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self.global_slots = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    def host_semaphore(self, url):
+        """Get (or create) the concurrency limiter for a URL's host"""
+        host = urlsplit(url).netloc
+        if host not in self.host_slots:
+            self.host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return self.host_slots[host]
+
+    async def get_indicator_data(self, country_code, indicator_code, start_year=FIRST_YEAR, end_year=CURRENT_YEAR):
+        """Fetch data for a specific indicator and country
+
+        Returns the time series or None (no data); raises a FetchError if
+        the fetch failed.
+        """
+        url = f"{self.base_url}/country/{country_code}/indicator/{indicator_code}"
+        params = {
+            "format": "json",
+            "date": f"{start_year}:{end_year}",
+            "per_page": 100
+        }
+
+        async with self.global_slots, self.host_semaphore(url):
+            for attempt in range(self.max_retries + 1):
+                await self.limiter.acquire_async()
+                try:
+                    async with self.session.get(url, params=params) as response:
+                        status = response.status
+                        retry_after = response.headers.get("Retry-After")
+                        data = await response.json(content_type=None) if status == 200 else None
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    self.limiter.release(None)
+                    raise TransientFetchError(f"{type(e).__name__}: {e}") from e
+
+                self.limiter.release(status, retry_after)
+                if status == 200:
+                    messages = api_error_messages(data)
+                    if messages is None:
+                        return parse_time_series(data)
+                    error = api_error(f"World Bank API error for {indicator_code}", messages)
+                    if error.kind != TRANSIENT:
+                        raise error
+                    continue
+                elif status not in THROTTLE_STATUSES:
+                    break
+                # Throttled: the limiter has backed off, try again
+
+        if status == 200:
+            raise error  # temporary API error payload on every attempt
+        raise fetch_error(f"HTTP {status}", status)
+
+    async def run(self, pairs, on_result, max_attempts=5, retry_delay=15.0, max_retry_delay=600.0):
+        """Fetch every (country, indicator) pair, calling on_result as each finishes
+
+        Only max_concurrency fetches exist at any time, so the pair iterator
+        can be arbitrarily long without building millions of tasks.
+
+        on_result(country, indicator, data, error) gets error=None on
+        success or empty data, otherwise the FetchError. Transient failures
+        are first parked for retry_delay * 2**n seconds (up to max_attempts
+        retries) and picked up by the retry workers; on_result only sees
+        them once they are out of retries.
+        """
+        pairs = iter(pairs)
+        loop = asyncio.get_running_loop()
+        due = asyncio.Queue()
+        drained = asyncio.Event()
+        parked = 0
+
+        async def fetch(country_code, indicator_code, attempt):
+            nonlocal parked
+            try:
+                data, error = await self.get_indicator_data(country_code, indicator_code), None
+            except TransientFetchError as e:
+                if attempt < max_attempts:
+                    delay = min(max_retry_delay, retry_delay * 2 ** attempt)
+                    parked += 1
+                    drained.clear()
+                    loop.call_later(delay, due.put_nowait, (country_code, indicator_code, attempt + 1))
+                    return
+                data, error = None, e
+            except IOError as e:
+                data, error = None, e
+            on_result(country_code, indicator_code, data, error)
+
+        async def worker():
+            for country_code, indicator_code in pairs:
+                await fetch(country_code, indicator_code, 0)
+
+        async def retry_worker():
+            nonlocal parked
+            while True:
+                task = await due.get()
+                if task is None:
+                    return
+                await fetch(*task)
+                parked -= 1
+                if parked == 0:
+                    drained.set()
+
+        retry_workers = [asyncio.create_task(retry_worker())
+                         for _ in range(max(1, self.max_concurrency // 10))]
+        await asyncio.gather(*(worker() for _ in range(self.max_concurrency)))
+        if parked:
+            await drained.wait()
+        for _ in retry_workers:
+            due.put_nowait(None)
+        await asyncio.gather(*retry_workers)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+World Bank Batched Fetching
+Packs many countries into one API call and fans the rows back out per country
+
+The World Bank API accepts semicolon-separated country codes
+(country/USA;CHN;JPN/indicator/...), so one request can replace 40+
+single-country requests. Responses are paginated; every page is read.
+
+Data pages can be read "slim": the body is parsed incrementally as it
+streams in (ijson, if installed) and each row keeps only countryiso3code,
+date, value, indicator.id and country.id, so large per_page pulls never
+build the full object tree.
+
+Error payloads ([{"message": [...]}]) come back with status 200; they
+are never written to the response cache, so a bad parameter or a
+temporary API fault is not replayed for the cache's lifetime.
+
+Set WORLD_BANK_API_URL to point every fetcher at another server, e.g.
+the local stand-in (world_bank_stand_in.py): http://127.0.0.1:8765/v2
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from fetch_outcome import TRANSIENT, FetchError, api_error, api_error_messages, fetch_error
+from http_client import get_client
+from rate_limiter import THROTTLE_STATUSES
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+PUBLIC_API_URL = "https://api.worldbank.org/v2"
+BASE_URL = os.environ.get("WORLD_BANK_API_URL", PUBLIC_API_URL).rstrip("/")
+DEFAULT_BATCH_SIZE = 50
+ERROR_BODY = re.compile(rb'\s*\[\s*\{\s*"message"')
+
+
+def chunked(items, size):
+    """Split a list into consecutive chunks of at most `size` items"""
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def is_data_body(head):
+    """False for a World Bank error payload (pass as the client's cacheable check)
+
+    head is the start of a 200 body; the API reports invalid values and
+    its own faults as [{"message": [...]}] instead of an error status.
+    """
+    return not ERROR_BODY.match(head)
+
+
+def entry_country_code(entry):
+    """ISO3 code of a data row (aggregates sometimes only carry country.id)"""
+    return entry.get("countryiso3code") or entry["country"]["id"]
+
+
+def slim_row(entry):
+    """The fields of a data row the fetchers use"""
+    return {
+        "countryiso3code": entry.get("countryiso3code"),
+        "date": entry.get("date"),
+        "value": entry.get("value"),
+        "indicator": {"id": (entry.get("indicator") or {}).get("id")},
+        "country": {"id": (entry.get("country") or {}).get("id")}
+    }
+
+
+SLIM_SCALARS = {
+    "item.item.countryiso3code": "countryiso3code",
+    "item.item.date": "date",
+    "item.item.value": "value"
+}
+SLIM_NESTED = {
+    "item.item.indicator.id": "indicator",
+    "item.item.country.id": "country"
+}
+CONTAINER_EVENTS = ("start_map", "end_map", "start_array", "end_array", "map_key")
+
+
+def parse_data_page(chunks):
+    """Parse a streamed [meta, rows] body into [meta, slim rows]
+
+    chunks is an iterable of body bytes. Error payloads ([meta] only) and
+    null rows come back in the same shape json.loads would give.
+    """
+    if ijson is None:
+        data = json.loads(b"".join(chunks))
+        if len(data) > 1 and data[1]:
+            data[1] = [slim_row(entry) for entry in data[1]]
+        return data
+
+    page = []
+    meta = None
+    row = None
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+
+    def consume():
+        nonlocal meta, row
+        for prefix, event, value in events:
+            if not prefix:
+                continue  # the outer [meta, rows] array
+            if not page:
+                # First element: pagination metadata (or an error message)
+                if meta is None:
+                    meta = ijson.ObjectBuilder()
+                meta.event(event, value)
+                if prefix == "item" and event in ("end_map", "end_array"):
+                    page.append(meta.value)
+            elif prefix == "item":
+                if event == "start_array":
+                    page.append([])
+                elif event == "null":
+                    page.append(None)
+            elif prefix == "item.item":
+                if event == "start_map":
+                    row = {"countryiso3code": None, "date": None, "value": None,
+                           "indicator": {"id": None}, "country": {"id": None}}
+                elif event == "end_map":
+                    page[1].append(row)
+            elif event not in CONTAINER_EVENTS:
+                if prefix in SLIM_SCALARS:
+                    row[SLIM_SCALARS[prefix]] = value
+                elif prefix in SLIM_NESTED:
+                    row[SLIM_NESTED[prefix]]["id"] = value
+        del events[:]
+
+    for chunk in chunks:
+        parser.send(chunk)
+        consume()
+    parser.close()
+    consume()
+    return page
+
+
+def fetch_page(url, params, client=None, timeout=30, max_retries=3, slim=False):
+    """Fetch one page of a World Bank API query ([meta, rows])
+
+    slim=True streams the body through parse_data_page (data queries only).
+    Raises TransientFetchError or PermanentFetchError (see fetch_outcome)
+    if the page could not be fetched after retries, or if the API answered
+    with an error payload; a [meta, null] page is returned as is (empty).
+    """
+    http = client or get_client()
+    status = None
+    cause = None
+
+    # The client's rate limiter paces retries; no fixed sleeps here
+    for attempt in range(max_retries):
+        try:
+            if slim:
+                data = parse_data_page(http.iter_body(url, params=params, timeout=timeout,
+                                                      cacheable=is_data_body))
+            else:
+                response = http.get(url, params=params, timeout=timeout, cacheable=is_data_body)
+                if response.status_code != 200:
+                    status = response.status_code
+                    if status not in THROTTLE_STATUSES:
+                        break
+                    continue
+                data = response.json()
+            messages = api_error_messages(data)
+            if messages is None:
+                return data
+            # An error payload sent as 200: retry it only if the API says it is temporary
+            cause = api_error(f"World Bank API error for {url} (page {params.get('page', 1)})", messages)
+            print(cause)
+            if cause.kind != TRANSIENT:
+                break
+        except requests.HTTPError as e:
+            status = e.response.status_code
+            if status not in THROTTLE_STATUSES:
+                break
+        except Exception as e:
+            print(f"Error fetching {url} (page {params.get('page', 1)}): {e}")
+            status, cause = None, e
+
+    message = f"Could not fetch {url} (page {params.get('page', 1)})"
+    if isinstance(cause, FetchError):
+        raise cause
+    raise fetch_error(message, status, cause)
+
+
+def iter_pages(url, params, client=None, timeout=30, max_retries=3, slim=False):
+    """Yield the rows of a World Bank API query one page at a time
+
+    Raises IOError if a page could not be fetched after retries.
+    """
+    page = 1
+    pages = 1
+
+    while page <= pages:
+        data = fetch_page(url, dict(params, page=page), client, timeout, max_retries, slim)
+
+        # First element is pagination metadata, second is the rows
+        if len(data) < 2 or not data[1]:
+            return
+
+        pages = int(data[0].get("pages", 1))
+        yield data[1]
+        page += 1
+
+
+def fetch_pages_concurrent(url, params, client=None, timeout=30, max_retries=3, max_workers=16):
+    """Fetch every page of a query, requesting pages 2..N all at once
+
+    Page 1 tells us the page count; the remaining pages are then fetched
+    in parallel and returned in page order. Returns (meta, rows), where
+    meta is the first page's pagination metadata.
+    Raises IOError if any page could not be fetched.
+    """
+    first = fetch_page(url, dict(params, page=1), client, timeout, max_retries)
+    meta = first[0] if first else {}
+    if len(first) < 2 or not first[1]:
+        return meta, []
+
+    pages = int(meta.get("pages", 1))
+    rows = list(first[1])
+    if pages > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, pages - 1)) as executor:
+            later = executor.map(
+                lambda page: fetch_page(url, dict(params, page=page), client, timeout, max_retries),
+                range(2, pages + 1)
+            )
+            for data in later:
+                if len(data) > 1 and data[1]:
+                    rows.extend(data[1])
+    return meta, rows
+
+
+def fetch_pages(url, params, client=None, timeout=30, max_retries=3, slim=False):
+    """Fetch every page of a World Bank API query and return all rows
+
+    Returns None if any page could not be fetched.
+    """
+    rows = []
+    try:
+        for page_rows in iter_pages(url, params, client, timeout, max_retries, slim):
+            rows.extend(page_rows)
+    except IOError:
+        return None
+    return rows
+
+
+def iter_indicator_all_countries(indicator_code, date="2010:2024", per_page=20000,
+                                 client=None, base_url=BASE_URL, timeout=60, max_retries=3):
+    """Stream one indicator for every country/region via country/all
+
+    Yields pages of slim rows as they arrive, so a caller can consume and
+    discard each page before the next is requested.
+    """
+    url = f"{base_url}/country/all/indicator/{indicator_code}"
+    params = {
+        "format": "json",
+        "date": date,
+        "per_page": per_page
+    }
+    return iter_pages(url, params, client, timeout, max_retries, slim=True)
+
+
+def fetch_indicator_batched(indicator_code, country_codes, date="2015:2024",
+                            batch_size=DEFAULT_BATCH_SIZE, per_page=1000,
+                            client=None, base_url=BASE_URL, timeout=30, max_retries=3,
+                            failures=None):
+    """Fetch one indicator for many countries using multi-country requests
+
+    Returns {country_code: [rows]} with rows in API order (most recent
+    year first). Countries with no rows map to an empty list; countries
+    whose batch failed to download are left out (and, if a failures dict
+    is given, recorded there as {country_code: FetchError}).
+    """
+    results = {}
+
+    for batch in chunked(country_codes, batch_size):
+        url = f"{base_url}/country/{';'.join(batch)}/indicator/{indicator_code}"
+        params = {
+            "format": "json",
+            "date": date,
+            "per_page": per_page
+        }
+
+        try:
+            rows = [
+                entry
+                for page_rows in iter_pages(url, params, client, timeout, max_retries, slim=True)
+                for entry in page_rows
+            ]
+        except IOError as e:
+            if failures is not None:
+                failures.update((code, e) for code in batch)
+            continue
+
+        batch_results = {code: [] for code in batch}
+        for entry in rows:
+            code = entry_country_code(entry)
+            if code in batch_results:
+                batch_results[code].append(entry)
+        results.update(batch_results)
+
+    return results
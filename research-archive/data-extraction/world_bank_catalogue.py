@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+World Bank Indicator Catalogue
+Loads the full indicator list (~17,000 entries) once and caches it
+
+- All catalogue pages are requested concurrently once page 1 has told us
+  the page count (about one round-trip instead of ~20 sequential ones)
+- Pages are merged into a single catalogue indexed by indicator id
+- The cache carries a version stamp (format + the API's indicator total);
+  a warm load costs one tiny per_page=1 probe, and the catalogue is
+  re-fetched when the total changes or the cache is older than max_age
+- Those re-fetches (and refresh=True) skip the HTTP response cache, which
+  would otherwise hand back the same outdated pages
+
+Usage:
+    from world_bank_catalogue import load_indicator_catalogue
+    catalogue = load_indicator_catalogue()
+    catalogue["SP.POP.TOTL"]["name"]
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+
+import requests
+
+from http_client import HttpClient, get_client
+from world_bank_batch import BASE_URL, fetch_pages_concurrent
+
+CATALOGUE_FORMAT = 1
+DEFAULT_CATALOGUE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "wb_indicator_catalogue.json"
+)
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+
+def fetch_indicator_catalogue(client=None, base_url=BASE_URL, per_page=1000, max_workers=16):
+    """Fetch every indicator page concurrently and index by indicator id
+
+    Returns (version, {indicator_id: indicator}) with each indicator as
+    returned by the API. Raises IOError if any page fails.
+    """
+    meta, rows = fetch_pages_concurrent(
+        f"{base_url}/indicator",
+        {"format": "json", "per_page": per_page},
+        client=client,
+        timeout=60,
+        max_workers=max_workers
+    )
+    catalogue = {indicator["id"]: indicator for indicator in rows}
+    version = {
+        "format": CATALOGUE_FORMAT,
+        "total": int(meta.get("total", len(catalogue))),
+        "fetched_at": time.time()
+    }
+    return version, catalogue
+
+
+def probe_indicator_total(client=None, base_url=BASE_URL):
+    """Current number of indicators in the API (a single per_page=1 request)
+
+    Goes straight to the network: the response cache must not answer
+    the question "has the catalogue changed?".
+    """
+    http = client or get_client()
+    try:
+        response = http.fetch(f"{base_url}/indicator", {"format": "json", "per_page": 1}, timeout=30)
+        response.raise_for_status()
+        return int(response.json()[0]["total"])
+    except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+        raise IOError(f"Could not probe the indicator catalogue: {e}")
+
+
+def load_indicator_catalogue(cache_file=DEFAULT_CATALOGUE_FILE, max_age=DEFAULT_MAX_AGE,
+                             refresh=False, client=None, base_url=BASE_URL):
+    """Indicator catalogue {id: indicator}, from the cache when it is current"""
+    outdated = refresh
+    cached = None
+    if not refresh and os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r') as f:
+                cached = json.load(f)
+        except ValueError:
+            cached = None
+
+    if cached and cached["version"].get("format") == CATALOGUE_FORMAT:
+        version = cached["version"]
+        if time.time() - version["fetched_at"] < max_age:
+            try:
+                if probe_indicator_total(client, base_url) == version["total"]:
+                    print(f"✓ Indicator catalogue is current ({len(cached['indicators'])} indicators)")
+                    return cached["indicators"]
+            except IOError:
+                # Offline: a stale catalogue beats none
+                print("⚠️  Could not check the indicator catalogue version, using the cached copy")
+                return cached["indicators"]
+        outdated = True
+
+    if outdated and (client is None or client.cache is not None):
+        # The cached pages are as old as the catalogue we are replacing
+        client = HttpClient()
+    print("📊 Fetching indicator catalogue (all pages in parallel)...")
+    version, catalogue = fetch_indicator_catalogue(client, base_url)
+
+    tmp_file = f"{cache_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump({"version": version, "indicators": catalogue}, f)
+    os.replace(tmp_file, cache_file)
+
+    print(f"✓ Cached {len(catalogue)} indicators "
+          f"({datetime.fromtimestamp(version['fetched_at']).isoformat(timespec='seconds')})")
+    return catalogue
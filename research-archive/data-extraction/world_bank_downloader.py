@@ -6,17 +6,18 @@ Downloads indicators for all countries used in the game
 Features:
 - Downloads data for 40 countries in the game
 - Fetches multiple indicators per category
-- Saves progress incrementally
+- Saves progress incrementally (append-only journal, compacted into
+  download_progress.json)
 - Handles API errors gracefully
 - Creates CSV files ready for game data updates
 """
 
-import requests
 import pandas as pd
-import time
 import json
 import os
 from datetime import datetime
+from history_store import get_history_store
+from progress_journal import ProgressJournal
 
 # Countries from the Outrank game (using ISO3 codes)
 GAME_COUNTRIES = {
@@ -120,9 +121,10 @@ INDICATORS = {
 
 class WorldBankDownloader:
     def __init__(self):
-        self.base_url = "https://api.worldbank.org/v2/country/{country}/indicator/{indicator}"
         self.results_dir = "world_bank_data"
         self.progress_file = "download_progress.json"
+        self.journal_file = "download_progress.journal"
+        self.store = get_history_store()
         self.create_output_dir()
         self.load_progress()
         
@@ -132,56 +134,88 @@ class WorldBankDownloader:
             os.makedirs(self.results_dir)
             
     def load_progress(self):
-        """Load download progress from file"""
+        """Load the progress snapshot and replay the journal on top of it
+        
+        Keys are held as sets (lists only in the JSON file), so recording
+        and checking a key is O(1) however large the pull.
+        """
+        self.progress = {"completed": set(), "failed": set()}
         if os.path.exists(self.progress_file):
             with open(self.progress_file, 'r') as f:
-                self.progress = json.load(f)
-        else:
-            self.progress = {"completed": [], "failed": []}
+                for status, keys in json.load(f).items():
+                    self.progress[status] = set(keys)
+            
+        self.journal = ProgressJournal(self.journal_file, self.progress_snapshot)
+        for status, key in self.journal.replay():
+            self.apply_progress(status, key)
             
+    def apply_progress(self, status, key):
+        self.progress[status].add(key)
+            
+    def record_progress(self, status, key):
+        """Record one finished key (O(1) journal append)"""
+        self.apply_progress(status, key)
+        self.journal.record(status, key)
+        
+    def progress_snapshot(self):
+        """Freeze progress for a journal compaction"""
+        progress = {status: sorted(keys) for status, keys in self.progress.items()}
+        
+        def write():
+            tmp_file = f"{self.progress_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(progress, f, indent=2)
+            os.replace(tmp_file, self.progress_file)
+        return write
+        
     def save_progress(self):
-        """Save download progress to file"""
-        with open(self.progress_file, 'w') as f:
-            json.dump(self.progress, f, indent=2)
+        """Make journalled progress durable"""
+        self.journal.flush()
             
-    def get_indicator_data(self, country_iso3, indicator, max_retries=3):
+    def get_indicator_data(self, country_iso3, indicator):
         """Fetch data for a specific indicator and country"""
-        url = self.base_url.format(country=country_iso3, indicator=indicator)
-        params = {
-            "format": "json",
-            "date": "2015:2024",  # Last 10 years
-            "per_page": 100
-        }
+        data = self.get_indicator_data_batch([country_iso3], indicator)
+        return data.get(country_iso3) or None
         
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    if len(data) > 1:  # First element is metadata
-                        return data[1]  # Return actual data
-                elif response.status_code == 429:  # Rate limit
-                    time.sleep(5 * (attempt + 1))  # Exponential backoff
-                    continue
-            except Exception as e:
-                print(f"Error fetching {indicator} for {country_iso3}: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                    
-        return None
+    def get_indicator_data_batch(self, countries_iso3, indicator):
+        """One indicator for many countries ({iso3: [entries]}, newest first)
+        
+        Answered from the history store; only indicators it does not hold
+        yet cost a request.
+        """
+        try:
+            return self.store.rows(indicator, countries_iso3, 2015, 2024)  # Last 10 years
+        except IOError as e:
+            print(f"   ❌ Could not fetch {indicator}: {e}")
+            return {}
         
     def process_category(self, category_name, indicators):
         """Download all indicators for a category"""
         print(f"\n📊 Processing category: {category_name}")
         print(f"   Indicators: {len(indicators)}")
         
+        # Skip Taiwan for World Bank API (no data available)
+        api_countries = [
+            info["iso3"] for info in GAME_COUNTRIES.values() if info["iso3"] != "TWN"
+        ]
+        
+        # One batched request per indicator covers every pending country
+        indicator_data = {}
+        for indicator_code, indicator_name in indicators.items():
+            pending = [
+                iso3 for iso3 in api_countries
+                if f"{iso3}_{indicator_code}" not in self.progress["completed"]
+            ]
+            if pending:
+                print(f"   ⬇️  {indicator_name} ({len(pending)} countries)")
+                indicator_data[indicator_code] = self.get_indicator_data_batch(pending, indicator_code)
+        
         category_data = []
         
         for game_code, country_info in GAME_COUNTRIES.items():
             country_name = country_info["name"]
             country_iso3 = country_info["iso3"]
             
-            # Skip Taiwan for World Bank API (no data available)
             if country_iso3 == "TWN":
                 print(f"   ⚠️  Skipping {country_name} (no World Bank data)")
                 continue
@@ -202,8 +236,7 @@ class WorldBankDownloader:
                     print(f"      ✓ {indicator_name} (cached)")
                     continue
                     
-                # Fetch data
-                data = self.get_indicator_data(country_iso3, indicator_code)
+                data = indicator_data.get(indicator_code, {}).get(country_iso3)
                 
                 if data:
                     # Get most recent non-null value
@@ -219,19 +252,16 @@ class WorldBankDownloader:
                     country_row[indicator_code] = latest_value
                     country_row[f"{indicator_code}_year"] = latest_year
                     
-                    self.progress["completed"].append(progress_key)
+                    self.record_progress("completed", progress_key)
                     print(f"      ✓ {indicator_name}: {latest_value} ({latest_year})")
                 else:
                     country_row[indicator_code] = None
                     country_row[f"{indicator_code}_year"] = None
-                    self.progress["failed"].append(progress_key)
+                    self.record_progress("failed", progress_key)
                     print(f"      ✗ {indicator_name}: No data")
                     
-                # Save progress after each indicator
-                self.save_progress()
-                
-                # Rate limiting
-                time.sleep(0.5)
+            # Save progress after each country
+            self.save_progress()
                 
             category_data.append(country_row)
             
@@ -256,6 +286,9 @@ class WorldBankDownloader:
             category_df = self.process_category(category_name, indicators)
             all_data[category_name] = category_df
             
+        # Fold the journal into download_progress.json
+        self.journal.compact(wait=True)
+        
         # Create master file with all data
         self.create_master_file(all_data)
         
@@ -2,18 +2,38 @@
 """
 World Bank Data Explorer
 Interactive tool to explore and download specific datasets
+
+Indicator data comes from the history store (one country/all request per
+indicator, then local), and each (indicator, countries, years) table is
+built and saved once per session, so repeat menu queries are instant.
+Topic downloads go through topic_export: one long-format Parquet file plus
+optional wide views, streamed an indicator at a time.
 """
 
-import requests
 import pandas as pd
 import json
 import os
 from datetime import datetime
+from history_store import get_history_store
+from http_client import get_client
+from topic_export import export_topic
+from world_bank_batch import BASE_URL, is_data_body
+
+# Major economies, the default country selection
+DEFAULT_COUNTRIES = ["USA", "CHN", "JPN", "DEU", "IND", "GBR", "FRA", "BRA", "ITA", "CAN"]
+DEFAULT_START_YEAR = 2010
+DEFAULT_END_YEAR = 2024
 
 class WorldBankExplorer:
     def __init__(self):
-        self.base_url = "https://api.worldbank.org/v2"
+        self.base_url = BASE_URL
         self.cache_dir = "world_bank_cache"
+        self.http = get_client()
+        self.store = get_history_store()
+        # (indicator, countries, start, end) -> (long DataFrame, pivot) / saved CSV path
+        self.frames = {}
+        self.saved_files = {}
+        self.countries = None
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
             
@@ -31,7 +51,7 @@ class WorldBankExplorer:
         results = []
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self.http.get(url, params=params, timeout=30, cacheable=is_data_body)
             if response.status_code == 200:
                 data = response.json()
                 if len(data) > 1:
@@ -108,64 +128,77 @@ class WorldBankExplorer:
         
         return popular
         
-    def download_indicator_data(self, indicator_id, countries=None, start_year=2010, end_year=2024):
+    def country_names(self):
+        """{code: name} for labelling tables (aggregates fall back to their code)"""
+        if self.countries is None:
+            self.countries = self.get_all_countries()
+        return {code: info["name"] for code, info in self.countries.items()}
+        
+    def indicator_frame(self, indicator_id, countries, start_year, end_year):
+        """(long DataFrame, country x year pivot) for a query, built once
+        
+        Both are None if there is no data. Raises IOError if the indicator
+        cannot be fetched.
+        """
+        key = (indicator_id, tuple(countries), start_year, end_year)
+        if key not in self.frames:
+            window = self.store.window(indicator_id, countries, start_year, end_year)
+            names = self.country_names()
+            all_data = [
+                {
+                    "country": names.get(country, country),
+                    "country_code": country,
+                    "year": int(year),
+                    "value": float(value),
+                    "indicator": indicator_id
+                }
+                for country in countries
+                for year, value in window[country].items()
+                if year.isdigit()  # annual values only
+            ]
+            if all_data:
+                df = pd.DataFrame(all_data)
+                self.frames[key] = (df, df.pivot(index='country', columns='year', values='value'))
+            else:
+                self.frames[key] = (None, None)
+        return self.frames[key]
+        
+    def download_indicator_data(self, indicator_id, countries=None, start_year=DEFAULT_START_YEAR,
+                                end_year=DEFAULT_END_YEAR):
         """Download data for a specific indicator"""
         if countries is None:
-            # Default to major economies
-            countries = ["USA", "CHN", "JPN", "DEU", "IND", "GBR", "FRA", "BRA", "ITA", "CAN"]
+            countries = DEFAULT_COUNTRIES
             
         print(f"\n📊 Downloading {indicator_id} for {len(countries)} countries...")
         
-        all_data = []
-        
-        for country in countries:
-            url = f"{self.base_url}/country/{country}/indicator/{indicator_id}"
-            params = {
-                "format": "json",
-                "date": f"{start_year}:{end_year}",
-                "per_page": 100
-            }
-            
-            try:
-                response = requests.get(url, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    if len(data) > 1:
-                        for entry in data[1]:
-                            if entry["value"] is not None:
-                                all_data.append({
-                                    "country": entry["country"]["value"],
-                                    "country_code": country,
-                                    "year": int(entry["date"]),
-                                    "value": float(entry["value"]),
-                                    "indicator": indicator_id
-                                })
-                                
-            except Exception as e:
-                print(f"  Error fetching {country}: {e}")
-                
-        if all_data:
-            # Convert to DataFrame
-            df = pd.DataFrame(all_data)
+        try:
+            df, pivot_df = self.indicator_frame(indicator_id, countries, start_year, end_year)
+        except IOError as e:
+            print(f"❌ Could not fetch {indicator_id}: {e}")
+            return None
             
-            # Pivot for easier viewing
-            pivot_df = df.pivot(index='country', columns='year', values='value')
+        if df is None:
+            print("❌ No data found")
+            return None
             
-            # Save to CSV
-            filename = f"{self.cache_dir}/{indicator_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        key = (indicator_id, tuple(countries), start_year, end_year)
+        if key in self.saved_files:
+            print(f"\n✅ {len(df)} data points (already saved)")
+            print(f"📁 Saved to: {self.saved_files[key]}")
+        else:
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"{self.cache_dir}/{indicator_id}_{start_year}-{end_year}_{stamp}.csv"
             pivot_df.to_csv(filename)
+            self.saved_files[key] = filename
             
-            print(f"\n✅ Downloaded {len(all_data)} data points")
+            print(f"\n✅ Downloaded {len(df)} data points")
             print(f"📁 Saved to: {filename}")
             
-            # Show preview
-            print("\nPreview:")
-            print(pivot_df.head(10))
-            
-            return df
-        else:
-            print("❌ No data found")
-            return None
+        # Show preview
+        print("\nPreview:")
+        print(pivot_df.head(10))
+        
+        return df
             
     def get_all_countries(self):
         """Get list of all countries with their codes"""
@@ -187,7 +220,7 @@ class WorldBankExplorer:
         countries = {}
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self.http.get(url, params=params, timeout=30, cacheable=is_data_body)
             if response.status_code == 200:
                 data = response.json()
                 if len(data) > 1:
@@ -211,8 +244,12 @@ class WorldBankExplorer:
             
         return countries
         
-    def download_topic_data(self, topic_name, num_countries=50):
-        """Download all indicators for a topic for top countries"""
+    def download_topic_data(self, topic_name, num_countries=50, views=("xlsx",)):
+        """Download all indicators for a topic for top countries
+        
+        Writes one long-format file (Parquet, or CSV without pyarrow) plus the
+        requested wide views ("csv", "xlsx"), streamed one indicator at a time.
+        """
         print(f"\n📚 Downloading {topic_name} data for top {num_countries} countries...")
         
         # Get popular indicators for the topic
@@ -223,33 +260,28 @@ class WorldBankExplorer:
             return
             
         # Get countries by GDP to find "top" countries
-        gdp_indicator = "NY.GDP.MKTP.CD"
         countries = self.get_top_countries_by_gdp(num_countries)
         
         if not countries:
             print("❌ Could not determine top countries")
             return
             
-        # Download each indicator
-        all_data = {}
+        # Fetch every indicator the store doesn't hold yet, concurrently
+        indicator_ids = [ind_id for ind_id, _ in popular[topic_name]]
+        self.store.ensure(indicator_ids)
         
-        for ind_id, ind_name in popular[topic_name]:
-            print(f"\n📊 Downloading: {ind_name}")
-            df = self.download_indicator_data(ind_id, countries)
-            if df is not None:
-                all_data[ind_id] = df
-                
-        # Save combined data
-        if all_data:
-            filename = f"{self.cache_dir}/{topic_name.lower()}_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            
-            with pd.ExcelWriter(filename) as writer:
-                for ind_id, df in all_data.items():
-                    # Create pivot table for each indicator
-                    pivot = df.pivot(index='country', columns='year', values='value')
-                    pivot.to_excel(writer, sheet_name=ind_id[:31])  # Excel sheet name limit
-                    
-            print(f"\n✅ All {topic_name} data saved to: {filename}")
+        result = export_topic(
+            self.store, topic_name, indicator_ids, countries, DEFAULT_START_YEAR, DEFAULT_END_YEAR,
+            out_dir=self.cache_dir, views=views,
+            country_names=self.country_names()
+        )
+        
+        print(f"\n✅ {result['rows']:,} {topic_name} data points "
+              f"({len(indicator_ids) - len(result['failed'])}/{len(indicator_ids)} indicators)")
+        print(f"📁 Long format: {result['long']}")
+        for view in views:
+            print(f"📁 Wide {view}: {result[view]}")
+        return result
             
     def get_top_countries_by_gdp(self, num_countries):
         """Get top N countries by GDP"""
@@ -315,7 +347,9 @@ def main():
             topic_num = int(input("\nSelect topic number: ")) - 1
             if 0 <= topic_num < len(topics):
                 num_countries = int(input("Number of countries (default 50): ") or "50")
-                explorer.download_topic_data(topics[topic_num], num_countries)
+                view = input("Wide view: xlsx, csv or none (default xlsx): ").strip().lower() or "xlsx"
+                views = () if view == "none" else (view,)
+                explorer.download_topic_data(topics[topic_num], num_countries, views)
                 
         elif choice == "4":
             ind_id = input("\nEnter indicator ID (e.g., NY.GDP.PCAP.CD): ")
@@ -326,8 +360,8 @@ def main():
             else:
                 countries = None
                 
-            start_year = int(input("Start year (default 2010): ") or "2010")
-            end_year = int(input("End year (default 2024): ") or "2024")
+            start_year = int(input(f"Start year (default {DEFAULT_START_YEAR}): ") or DEFAULT_START_YEAR)
+            end_year = int(input(f"End year (default {DEFAULT_END_YEAR}): ") or DEFAULT_END_YEAR)
             
             explorer.download_indicator_data(ind_id, countries, start_year, end_year)
             
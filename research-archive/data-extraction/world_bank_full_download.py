@@ -10,33 +10,60 @@ WARNING: This will download a massive amount of data:
 - Will take several hours to complete
 """
 
-import requests
-import pandas as pd
-import time
+import asyncio
+import glob
 import json
 import os
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 import threading
+from cube_store import CubeStore
+from fetch_outcome import TRANSIENT, FetchError, TransientFetchError, classify_error, fetch_error
+from fetch_planner import BULK, BATCH, plan_fetch
+from history_store import CURRENT_YEAR, FIRST_YEAR
+from http_client import HttpClient
+from progress_bitmap import ProgressBitmap
+from progress_journal import ProgressJournal
+from world_bank_batch import (
+    BASE_URL, DEFAULT_BATCH_SIZE, fetch_indicator_batched,
+    iter_indicator_all_countries, entry_country_code
+)
+from world_bank_downloader import INDICATORS as GAME_INDICATORS
+from work_scheduler import WorkScheduler
+from world_bank_catalogue import load_indicator_catalogue
+from wdi_bulk import WdiArchive, download_wdi_archive
 
 class WorldBankCompleteDownloader:
-    def __init__(self):
-        self.base_url = "https://api.worldbank.org/v2"
-        self.results_dir = "world_bank_complete_data"
-        self.progress_file = "complete_download_progress.json"
+    def __init__(self, results_dir="world_bank_complete_data", shard=None):
+        self.base_url = BASE_URL
+        self.shard = shard
+        if shard is None:
+            self.results_dir = results_dir
+            progress_prefix = "complete_download_progress"
+        else:
+            # Shard-local output and progress (see world_bank_shard.py), so a
+            # shard directory can be copied off its machine and merged
+            self.results_dir = os.path.join(results_dir, "shards", shard.name)
+            progress_prefix = os.path.join(self.results_dir, "complete_download_progress")
+        self.progress_file = f"{progress_prefix}.json"
+        self.bitmap_file = f"{progress_prefix}.bin"
+        self.journal_file = f"{progress_prefix}.journal"
+        # No response cache: the cube already holds the results
+        self.http = HttpClient()
         self.countries = {}
         self.indicators = {}
         self.data_lock = threading.Lock()
         self.progress_lock = threading.Lock()
         self.create_output_dir()
+        # Finished pairs wait here until the cube has written their data
+        self.unflushed = []
+        self.cube = CubeStore(f"{self.results_dir}/cube", on_flush=self.journal_flushed_pairs)
         self.load_progress()
+        self.import_json_results()
         
     def create_output_dir(self):
         """Create output directories"""
         dirs = [
             self.results_dir,
-            f"{self.results_dir}/by_country",
-            f"{self.results_dir}/by_indicator",
             f"{self.results_dir}/by_topic"
         ]
         for dir_path in dirs:
@@ -44,23 +71,113 @@ class WorldBankCompleteDownloader:
                 os.makedirs(dir_path)
                 
     def load_progress(self):
-        """Load download progress"""
+        """Load download progress
+        
+        Per-pair state is a ProgressBitmap checkpoint plus an append-only
+        journal of pairs finished since; the JSON file only keeps the small
+        flags. Old JSON files with "completed"/"failed" key lists are
+        converted on load.
+        """
         if os.path.exists(self.progress_file):
             with open(self.progress_file, 'r') as f:
                 self.progress = json.load(f)
         else:
             self.progress = {
-                "completed": [],
-                "failed": [],
                 "countries_fetched": False,
                 "indicators_fetched": False,
                 "last_update": None
             }
             
+        if "completed" in self.progress or "failed" in self.progress:
+            self.done = ProgressBitmap.from_keys(
+                self.progress.pop("completed", []),
+                self.progress.pop("failed", [])
+            )
+            self.done.save(self.bitmap_file)
+            print(f"✓ Converted {self.done.completed_count + self.done.failed_count:,} progress keys to a bitmap")
+        elif os.path.exists(self.bitmap_file):
+            self.done = ProgressBitmap.load(self.bitmap_file)
+        else:
+            self.done = ProgressBitmap()
+            
+        self.journal = ProgressJournal(self.journal_file, self.progress_snapshot)
+        for status, key in self.journal.replay():
+            country_code, ind_code = key.split("_", 1)
+            if status == "completed":
+                self.done.mark_completed(country_code, ind_code)
+            else:
+                self.done.mark_failed(country_code, ind_code)
+                
+    def import_json_results(self):
+        """Load the by_country/by_indicator JSON files of older runs into an empty cube
+        
+        By-country files go last, so they win over by-indicator ones. The
+        JSON and CSV files are left in place and can be deleted afterwards.
+        """
+        legacy_files = (sorted(glob.glob(f"{self.results_dir}/by_indicator/*_all_countries.json")) +
+                        sorted(glob.glob(f"{self.results_dir}/by_country/*_data.json")))
+        if not legacy_files or not self.cube.is_empty():
+            return
+            
+        for path in legacy_files:
+            with open(path, 'r') as f:
+                legacy = json.load(f)
+            if "country_data" in legacy:
+                for country_code, country_data in legacy["country_data"].items():
+                    self.cube.append(country_code, legacy["indicator_code"], country_data["data"])
+            else:
+                for ind_code, ind_data in legacy["indicators"].items():
+                    self.cube.append(legacy["country_code"], ind_code, ind_data["data"])
+        self.cube.compact()
+        print(f"✓ Imported {len(legacy_files):,} by_country/by_indicator JSON files into {self.cube.root}/")
+        
+    def is_pending(self, country_code, ind_code):
+        """True if the pair still needs fetching by this downloader (its shard)"""
+        if self.shard is not None and not self.shard.owns(ind_code):
+            return False
+        return not self.done.is_done(country_code, ind_code)
+        
+    def progress_snapshot(self):
+        """Freeze the bitmap for a journal compaction (progress_lock is held)"""
+        bitmap = self.done.copy()
+        return lambda: bitmap.save(self.bitmap_file)
+        
+    def mark_progress(self, country_code, ind_code, completed):
+        """Record a finished pair in the bitmap (and in the journal after the next cube flush)
+        
+        Call it after the pair's data has been appended to the cube.
+        """
+        with self.progress_lock:
+            if completed:
+                self.done.mark_completed(country_code, ind_code)
+            else:
+                self.done.mark_failed(country_code, ind_code)
+            self.unflushed.append(("completed" if completed else "failed", f"{country_code}_{ind_code}"))
+            
+    def journal_flushed_pairs(self):
+        """Journal the pairs marked so far (the cube calls this after each flush)
+        
+        Their data was appended before they were marked, so it is on disk
+        now. A journal compaction can only start from here, so its bitmap
+        snapshot never covers pairs whose data is still in memory.
+        """
+        with self.progress_lock:
+            for status, key in self.unflushed:
+                self.journal.record(status, key)
+            self.unflushed = []
+            
     def save_progress(self):
-        """Save download progress"""
+        """Save download progress (cube flush, flags file + journal flush)
+        
+        Pairs reach the journal only through the cube flush that writes
+        their data, so every pair the journal records as done has its data
+        on disk. A crash loses the pairs since the last flush, which are
+        fetched again on the next run.
+        """
+        self.cube.flush()
         with self.progress_lock:
             self.progress["last_update"] = datetime.now().isoformat()
+            self.journal.flush()
             with open(self.progress_file, 'w') as f:
                 json.dump(self.progress, f, indent=2)
                 
@@ -83,7 +200,7 @@ class WorldBankCompleteDownloader:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self.http.get(url, params=params, timeout=30)
             if response.status_code == 200:
                 data = response.json()
                 if len(data) > 1:
@@ -123,46 +240,16 @@ class WorldBankCompleteDownloader:
                 
         print("📊 Fetching all indicators...")
         
-        # First get the total count
-        url = f"{self.base_url}/indicator"
-        params = {
-            "format": "json",
-            "per_page": 1
-        }
-        
         try:
-            response = requests.get(url, params=params, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                total_indicators = data[0]["total"]
-                print(f"   Total indicators available: {total_indicators}")
-                
-                # Now fetch all indicators in pages
-                per_page = 1000
-                total_pages = (total_indicators // per_page) + 1
-                
-                for page in range(1, total_pages + 1):
-                    print(f"   Fetching page {page}/{total_pages}...")
-                    params = {
-                        "format": "json",
-                        "per_page": per_page,
-                        "page": page
-                    }
-                    
-                    response = requests.get(url, params=params, timeout=30)
-                    if response.status_code == 200:
-                        data = response.json()
-                        if len(data) > 1:
-                            for indicator in data[1]:
-                                self.indicators[indicator["id"]] = {
-                                    "name": indicator["name"],
-                                    "unit": indicator.get("unit", ""),
-                                    "source": indicator["source"]["value"],
-                                    "sourceNote": indicator.get("sourceNote", ""),
-                                    "topics": [t["value"] for t in indicator.get("topics", [])]
-                                }
-                    
-                    time.sleep(0.5)  # Rate limiting
+            catalogue = load_indicator_catalogue(client=self.http, base_url=self.base_url)
+            for ind_id, indicator in catalogue.items():
+                self.indicators[ind_id] = {
+                    "name": indicator["name"],
+                    "unit": indicator.get("unit", ""),
+                    "source": indicator["source"]["value"],
+                    "sourceNote": indicator.get("sourceNote", ""),
+                    "topics": [t["value"] for t in indicator.get("topics", [])]
+                }
                     
             # Save indicators metadata
             with open(f"{self.results_dir}/indicators_metadata.json", 'w') as f:
@@ -198,8 +285,13 @@ class WorldBankCompleteDownloader:
             
         print(f"✓ Organized indicators into {len(topics)} topics")
         
-    def get_indicator_data(self, country_code, indicator_code, start_year=2010, end_year=2024):
-        """Fetch data for a specific indicator and country"""
+    def get_indicator_data(self, country_code, indicator_code, start_year=FIRST_YEAR, end_year=CURRENT_YEAR):
+        """Fetch data for a specific indicator and country
+        
+        Returns the time series, or None if the API has no data for the
+        pair. Raises TransientFetchError / PermanentFetchError when the
+        fetch itself failed (see fetch_outcome).
+        """
         url = f"{self.base_url}/country/{country_code}/indicator/{indicator_code}"
         params = {
             "format": "json",
@@ -208,142 +300,233 @@ class WorldBankCompleteDownloader:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if len(data) > 1 and data[1]:
-                    # Extract time series data
-                    time_series = {}
-                    for entry in data[1]:
-                        if entry["value"] is not None:
-                            time_series[entry["date"]] = entry["value"]
-                    return time_series
-            elif response.status_code == 429:
-                # Rate limit hit
-                time.sleep(5)
-                return None
-                
+            response = self.http.get(url, params=params, timeout=10)
+            if response.status_code != 200:
+                raise fetch_error(f"HTTP {response.status_code}", response.status_code)
+            data = response.json()
+        except FetchError:
+            raise
         except Exception as e:
-            print(f"Error fetching {indicator_code} for {country_code}: {e}")
+            raise fetch_error(str(e), cause=e) from e
             
+        if len(data) > 1 and data[1]:
+            # Extract time series data
+            time_series = {}
+            for entry in data[1]:
+                if entry["value"] is not None:
+                    time_series[entry["date"]] = entry["value"]
+            return time_series
         return None
         
+    def get_indicator_data_batch(self, country_codes, indicator_code, start_year=FIRST_YEAR, end_year=CURRENT_YEAR,
+                                 failures=None):
+        """Fetch one indicator for many countries with multi-country requests
+        
+        Countries whose batch failed are left out of the result and, if a
+        failures dict is given, recorded there with their FetchError.
+        """
+        batched = fetch_indicator_batched(
+            indicator_code, country_codes,
+            date=f"{start_year}:{end_year}",
+            client=self.http,
+            base_url=self.base_url,
+            failures=failures
+        )
+        
+        results = {}
+        for country_code, entries in batched.items():
+            time_series = {
+                entry["date"]: entry["value"]
+                for entry in entries if entry["value"] is not None
+            }
+            results[country_code] = time_series or None
+        return results
+        
+    def get_indicator_data_bulk(self, indicator_code, start_year=FIRST_YEAR, end_year=CURRENT_YEAR, per_page=20000):
+        """Fetch one indicator for every country via streamed country/all pages"""
+        results = {}
+        
+        try:
+            for rows in iter_indicator_all_countries(
+                indicator_code,
+                date=f"{start_year}:{end_year}",
+                per_page=per_page,
+                client=self.http,
+                base_url=self.base_url
+            ):
+                for entry in rows:
+                    if entry["value"] is not None:
+                        country_code = entry_country_code(entry)
+                        results.setdefault(country_code, {})[entry["date"]] = entry["value"]
+        except IOError as e:
+            print(f"Error fetching {indicator_code} for all countries: {e}")
+            return None
+            
+        return results
+        
     def download_country_data(self, country_code, country_info):
         """Download all indicators for a single country"""
-        country_data = {
-            "country_code": country_code,
-            "country_name": country_info["name"],
-            "metadata": country_info,
-            "indicators": {}
-        }
-        
         successful = 0
         failed = 0
+        deferred = 0
         
-        for ind_code, ind_info in self.indicators.items():
-            progress_key = f"{country_code}_{ind_code}"
-            
-            # Skip if already completed
-            if progress_key in self.progress["completed"]:
-                continue
-                
-            # Skip if previously failed (can be removed to retry)
-            if progress_key in self.progress["failed"]:
+        for ind_code in self.indicators:
+            # Skip if already completed, empty or permanently failed
+            # (call self.done.clear_failed() to retry those), or another shard's
+            if not self.is_pending(country_code, ind_code):
                 continue
                 
             # Fetch data
-            data = self.get_indicator_data(country_code, ind_code)
+            try:
+                data = self.get_indicator_data(country_code, ind_code)
+            except FetchError as e:
+                if e.kind == TRANSIENT:
+                    # Not recorded, so the next run fetches it again
+                    print(f"Error fetching {ind_code} for {country_code}: {e} (deferred)")
+                    deferred += 1
+                    continue
+                print(f"Error fetching {ind_code} for {country_code}: {e}")
+                data = None
             
             if data:
-                country_data["indicators"][ind_code] = {
-                    "name": ind_info["name"],
-                    "unit": ind_info.get("unit", ""),
-                    "data": data
-                }
+                self.cube.append(country_code, ind_code, data)
                 successful += 1
-                
-                with self.progress_lock:
-                    self.progress["completed"].append(progress_key)
             else:
                 failed += 1
-                with self.progress_lock:
-                    self.progress["failed"].append(progress_key)
+            self.mark_progress(country_code, ind_code, bool(data))
                     
             # Save progress periodically
             if (successful + failed) % 100 == 0:
                 self.save_progress()
-                print(f"   {country_info['name']}: {successful} successful, {failed} failed")
-                
-            # Rate limiting
-            time.sleep(0.1)
+                print(f"   {country_info['name']}: {successful} successful, {failed} failed, "
+                      f"{deferred} deferred")
+                print(f"   Rate: {self.http.limiter_for(self.base_url)}")
             
-        # Save country data
-        if country_data["indicators"]:
-            filename = f"{self.results_dir}/by_country/{country_code}_data.json"
-            with open(filename, 'w') as f:
-                json.dump(country_data, f, indent=2)
-                
-            # Also save as CSV for easier analysis
-            self.save_country_csv(country_code, country_data)
+        self.save_progress()
             
         return successful, failed
         
-    def save_country_csv(self, country_code, country_data):
-        """Save country data as CSV"""
-        rows = []
-        
-        for ind_code, ind_data in country_data["indicators"].items():
-            for year, value in ind_data["data"].items():
-                rows.append({
-                    "indicator_code": ind_code,
-                    "indicator_name": ind_data["name"],
-                    "year": year,
-                    "value": value,
-                    "unit": ind_data["unit"]
-                })
-                
-        if rows:
-            df = pd.DataFrame(rows)
-            filename = f"{self.results_dir}/by_country/{country_code}_data.csv"
-            df.to_csv(filename, index=False)
-            
-    def download_all_parallel(self, max_workers=5):
-        """Download all data using parallel processing"""
+    def planned_throughput(self):
+        """Requests/second to estimate a plan with: last planned run, else the limiter's rate"""
+        return self.progress.get("requests_per_second") or self.http.limiter_for(self.base_url).rate
+        
+    def download_all_parallel(self, max_workers=5, batch_size=DEFAULT_BATCH_SIZE, max_attempts=5, plan=None):
+        """Download all data using parallel processing
+        
+        Work comes from a fetch plan (see fetch_planner.py; built here if
+        not given): each unit is one indicator for a batch of countries or
+        a country/all bulk fetch. Units go on a shared priority queue; game
+        indicators go first and every worker keeps pulling units until the
+        queue is empty. Countries whose fetch
+        failed transiently go to the scheduler's retry lane (up to
+        max_attempts retries with back-off); if they still fail they are
+        left unrecorded for the next run rather than marked failed.
+        """
         print("\n🌍 Starting parallel download of all World Bank data")
         print(f"   Countries: {len(self.countries)}")
         print(f"   Indicators: {len(self.indicators)}")
         print(f"   Max parallel downloads: {max_workers}")
-        print("\n⚠️  This will take several hours to complete!")
         
+        if plan is None:
+            plan = plan_fetch(self, batch_size=batch_size)
+            plan.describe(self.planned_throughput())
+            
         start_time = datetime.now()
-        total_successful = 0
-        total_failed = 0
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all country downloads
-            future_to_country = {
-                executor.submit(self.download_country_data, code, info): (code, info)
-                for code, info in self.countries.items()
-            }
+        totals = {"successful": 0, "failed": 0, "retried": 0, "deferred": 0, "units": 0, "countries": 0}
+        game_indicators = {code for inds in GAME_INDICATORS.values() for code in inds}
+        
+        scheduler = WorkScheduler(max_workers)
+        remaining = {}
+        
+        for unit in plan.units:
+            for country_code in unit.countries:
+                remaining[country_code] = remaining.get(country_code, 0) + 1
+            priority = 0 if unit.indicator in game_indicators else 1
+            scheduler.add((unit.indicator, unit.countries, 0, unit.mode),
+                          priority=priority, cost=len(unit.countries))
             
-            completed_countries = 0
+        total_units = len(scheduler)
+        print(f"   Work units: {total_units:,} ({len(remaining)} countries pending)")
+        
+        def fetch_unit(unit):
+            ind_code, batch, _, mode = unit
+            failures = {}
+            if mode == BULK:
+                series = self.get_indicator_data_bulk(ind_code, plan.start_year, plan.end_year)
+                if series is None:
+                    error = TransientFetchError(f"country/all fetch of {ind_code} failed")
+                    return {}, {country_code: error for country_code in batch}
+                return {country_code: series.get(country_code) for country_code in batch}, failures
+            results = self.get_indicator_data_batch(batch, ind_code, plan.start_year, plan.end_year,
+                                                    failures=failures)
+            return results, failures
             
-            for future in as_completed(future_to_country):
-                code, info = future_to_country[future]
-                completed_countries += 1
+        def on_done(unit, result, error):
+            ind_code, batch, attempt, _ = unit
+            if error:
+                print(f"Error fetching {ind_code} for {len(batch)} countries: {error}")
+                results, failures = {}, {country_code: error for country_code in batch}
+            else:
+                results, failures = result
                 
-                try:
-                    successful, failed = future.result()
-                    total_successful += successful
-                    total_failed += failed
-                    
-                    print(f"\n✓ Completed {info['name']} ({code})")
-                    print(f"  Progress: {completed_countries}/{len(self.countries)} countries")
-                    print(f"  Total data points: {total_successful:,} successful, {total_failed:,} failed")
+            # Transient failures get another go on the retry lane
+            retry = {
+                country_code for country_code, failure in failures.items()
+                if classify_error(failure) == TRANSIENT and attempt < max_attempts
+            }
+            if retry:
+                # Retries only cover the failed countries, so they always go as batches
+                delay = scheduler.retry((ind_code, sorted(retry), attempt + 1, BATCH), attempt + 1)
+                print(f"   ↻ {ind_code} for {len(retry)} countries: retry {attempt + 1} in {delay:.0f}s")
+                
+            finished = []
+            with self.data_lock:
+                totals["retried"] += len(retry)
+                for country_code in batch:
+                    if country_code in retry:
+                        continue
+                    failure = failures.get(country_code)
+                    if failure is not None and classify_error(failure) == TRANSIENT:
+                        # Out of retries: leave unrecorded so the next run fetches it
+                        totals["deferred"] += 1
+                    else:
+                        # Empty and permanent failures are recorded as done
+                        data = results.get(country_code)
+                        if data:
+                            self.cube.append(country_code, ind_code, data)
+                            totals["successful"] += 1
+                        else:
+                            totals["failed"] += 1
+                        self.mark_progress(country_code, ind_code, bool(data))
                     
-                except Exception as e:
-                    print(f"\n❌ Error processing {info['name']}: {e}")
+                    remaining[country_code] -= 1
+                    if remaining[country_code] == 0:
+                        finished.append(country_code)
+                        
+                totals["units"] += 1
+                totals["countries"] += len(finished)
+                if totals["units"] % 100 == 0:
+                    self.save_progress()
+                    print(f"   {totals['units']:,}/{total_units:,} units, "
+                          f"{totals['successful']:,} successful, {totals['failed']:,} failed, "
+                          f"{totals['retried']:,} retried")
+                    print(f"   Rate: {self.http.limiter_for(self.base_url)}")
                     
+            for country_code in finished:
+                print(f"\n✓ Completed {self.countries[country_code]['name']} ({country_code})")
+                print(f"  Progress: {totals['countries']}/{len(remaining)} countries")
+                
+        scheduler.run(fetch_unit, on_done)
+        
+        # Observed throughput, for estimating the next plan
+        elapsed = (datetime.now() - start_time).total_seconds()
+        if plan.requests and totals["deferred"] == 0 and elapsed > 0:
+            self.progress["requests_per_second"] = round(plan.requests / elapsed, 2)
+        self.save_progress()
+        with self.progress_lock:
+            self.journal.compact(wait=True)
+        self.cube.compact()
+        
         # Create summary statistics
         self.create_summary_statistics()
         
@@ -352,7 +535,127 @@ class WorldBankCompleteDownloader:
         
         print(f"\n🎉 Download complete!")
         print(f"⏱️  Duration: {duration}")
-        print(f"📊 Total data points: {total_successful:,} successful, {total_failed:,} failed")
+        print(f"📊 Total data points: {totals['successful']:,} successful, {totals['failed']:,} failed")
+        print(f"↻  Retried: {totals['retried']:,}, still failing (left for next run): {totals['deferred']:,}")
+        print(f"🔁 Duplicate requests coalesced: {self.http.coalescing_stats()['coalesced']:,}")
+        print(f"📁 Data saved in: {self.results_dir}/")
+        
+    def download_all_async(self, max_concurrency=200, per_host_limit=100):
+        """Download all data with the asyncio engine (hundreds of requests in flight)"""
+        from world_bank_async import AsyncFetchEngine
+        
+        print("\n🌍 Starting async download of all World Bank data")
+        print(f"   Countries: {len(self.countries)}")
+        print(f"   Indicators: {len(self.indicators)}")
+        print(f"   Max requests in flight: {max_concurrency} ({per_host_limit} per host)")
+        
+        start_time = datetime.now()
+        totals = {"successful": 0, "failed": 0, "deferred": 0}
+        
+        # Indicator by indicator, so each cube flush touches few indicator partitions
+        pairs = [
+            (country_code, ind_code)
+            for ind_code in self.indicators
+            for country_code in self.countries
+            if self.is_pending(country_code, ind_code)
+        ]
+            
+        print(f"   Pairs to fetch: {len(pairs):,}")
+        
+        def on_result(country_code, ind_code, data, error):
+            if error is not None:
+                print(f"Error fetching {ind_code} for {country_code}: {error}")
+            if error is not None and error.kind == TRANSIENT:
+                # Out of retries: leave unrecorded so the next run fetches it
+                totals["deferred"] += 1
+            elif data:
+                self.cube.append(country_code, ind_code, data)
+                totals["successful"] += 1
+                self.mark_progress(country_code, ind_code, True)
+            else:
+                # Empty and permanent failures are recorded as done
+                totals["failed"] += 1
+                self.mark_progress(country_code, ind_code, False)
+                
+            # Save progress periodically
+            if (totals["successful"] + totals["failed"] + totals["deferred"]) % 1000 == 0:
+                self.save_progress()
+                print(f"   {totals['successful']:,} successful, {totals['failed']:,} failed, "
+                      f"{totals['deferred']:,} deferred")
+                print(f"   Rate: {self.http.limiter_for(self.base_url)}")
+                
+        async def run():
+            limiter = self.http.limiter_for(self.base_url)
+            async with AsyncFetchEngine(self.base_url, max_concurrency, per_host_limit, limiter=limiter) as engine:
+                await engine.run(pairs, on_result)
+                
+        asyncio.run(run())
+        self.save_progress()
+        with self.progress_lock:
+            self.journal.compact(wait=True)
+        self.cube.compact()
+        
+        # Create summary statistics
+        self.create_summary_statistics()
+        
+        duration = datetime.now() - start_time
+        
+        print(f"\n🎉 Download complete!")
+        print(f"⏱️  Duration: {duration}")
+        print(f"📊 Total data points: {totals['successful']:,} successful, {totals['failed']:,} failed")
+        print(f"↻  Still failing (left for next run): {totals['deferred']:,}")
+        print(f"📁 Data saved in: {self.results_dir}/")
+        
+    def ingest_wdi_archive(self, archive_path, start_year=FIRST_YEAR, end_year=CURRENT_YEAR):
+        """Build the complete store from the WDI bulk ZIP instead of the API
+        
+        Metadata comes from the archive's series/country files; the data CSV
+        is streamed into the cube, which writes it out in flush_rows chunks.
+        """
+        print(f"\n📦 Ingesting WDI bulk archive: {archive_path}")
+        start_time = datetime.now()
+        totals = {"successful": 0, "failed": 0, "countries": 0}
+        
+        with WdiArchive(archive_path) as wdi:
+            self.countries = wdi.countries()
+            self.indicators = wdi.indicators()
+            with open(f"{self.results_dir}/countries_metadata.json", 'w') as f:
+                json.dump(self.countries, f, indent=2)
+            with open(f"{self.results_dir}/indicators_metadata.json", 'w') as f:
+                json.dump(self.indicators, f, indent=2)
+            self.organize_indicators_by_topic()
+            self.progress["countries_fetched"] = True
+            self.progress["indicators_fetched"] = True
+            print(f"✓ {len(self.countries)} countries, {len(self.indicators)} indicators")
+            
+            countries_seen = set()
+            for country_code, ind_code, series in wdi.iter_series(start_year, end_year):
+                if country_code not in countries_seen:
+                    countries_seen.add(country_code)
+                    print(f"   {self.countries.get(country_code, {'name': country_code})['name']}...")
+                    
+                if series:
+                    self.cube.append(country_code, ind_code, series)
+                # Bitmap only: a journal line per pair would be millions of lines here
+                with self.progress_lock:
+                    if series:
+                        totals["successful"] += 1
+                        self.done.mark_completed(country_code, ind_code)
+                    else:
+                        totals["failed"] += 1
+                        self.done.mark_failed(country_code, ind_code)
+            totals["countries"] = len(countries_seen)
+            
+        self.save_progress()
+        with self.progress_lock:
+            self.journal.compact(wait=True)
+        self.cube.compact()
+        self.create_summary_statistics()
+        
+        print(f"\n🎉 Ingestion complete!")
+        print(f"⏱️  Duration: {datetime.now() - start_time}")
+        print(f"📊 {totals['successful']:,} series with data, {totals['failed']:,} empty, "
+              f"{totals['countries']} countries")
         print(f"📁 Data saved in: {self.results_dir}/")
         
     def create_summary_statistics(self):
@@ -361,10 +664,10 @@ class WorldBankCompleteDownloader:
             "download_date": datetime.now().isoformat(),
             "total_countries": len(self.countries),
             "total_indicators": len(self.indicators),
-            "completed_combinations": len(self.progress["completed"]),
-            "failed_combinations": len(self.progress["failed"]),
-            "success_rate": len(self.progress["completed"]) / 
-                           (len(self.progress["completed"]) + len(self.progress["failed"]) + 0.001)
+            "completed_combinations": self.done.completed_count,
+            "failed_combinations": self.done.failed_count,
+            "success_rate": self.done.completed_count / 
+                           (self.done.completed_count + self.done.failed_count + 0.001)
         }
         
         # Count indicators by topic
@@ -397,49 +700,27 @@ class WorldBankCompleteDownloader:
             print(f"\nDownloading: {ind_name}")
             self.download_indicator_all_countries(ind_id)
             
-    def download_indicator_all_countries(self, indicator_code):
-        """Download a single indicator for all countries"""
-        indicator_data = {
-            "indicator_code": indicator_code,
-            "indicator_info": self.indicators.get(indicator_code, {}),
-            "country_data": {}
-        }
+    def download_indicator_all_countries(self, indicator_code, bulk=True):
+        """Download a single indicator for all countries
         
-        for country_code, country_info in self.countries.items():
-            data = self.get_indicator_data(country_code, indicator_code)
-            if data:
-                indicator_data["country_data"][country_code] = {
-                    "country_name": country_info["name"],
-                    "data": data
-                }
-            time.sleep(0.1)  # Rate limiting
-            
-        # Save indicator data
-        if indicator_data["country_data"]:
-            filename = f"{self.results_dir}/by_indicator/{indicator_code}_all_countries.json"
-            with open(filename, 'w') as f:
-                json.dump(indicator_data, f, indent=2)
-                
-            # Also save as CSV
-            self.save_indicator_csv(indicator_code, indicator_data)
+        bulk=True streams country/all pages (one round-trip per page);
+        bulk=False uses multi-country batches of self.countries.
+        """
+        if bulk:
+            country_series = self.get_indicator_data_bulk(indicator_code)
+        else:
+            country_series = self.get_indicator_data_batch(list(self.countries), indicator_code)
             
-    def save_indicator_csv(self, indicator_code, indicator_data):
-        """Save indicator data as CSV"""
-        rows = []
-        
-        for country_code, country_data in indicator_data["country_data"].items():
-            for year, value in country_data["data"].items():
-                rows.append({
-                    "country_code": country_code,
-                    "country_name": country_data["country_name"],
-                    "year": year,
-                    "value": value
-                })
+        if country_series is None:
+            return
+        
+        for country_code in self.countries:
+            data = country_series.get(country_code)
+            if data:
+                self.cube.append(country_code, indicator_code, data)
                 
-        if rows:
-            df = pd.DataFrame(rows)
-            filename = f"{self.results_dir}/by_indicator/{indicator_code}_all_countries.csv"
-            df.to_csv(filename, index=False)
+        # A re-download replaces the indicator's earlier part
+        self.cube.compact([indicator_code])
 
 def main():
     """Main function with menu options"""
@@ -453,20 +734,38 @@ def main():
     downloader.fetch_all_indicators()
     
     print("\nOptions:")
-    print("1. Download EVERYTHING (warning: several hours)")
-    print("2. Download specific topic")
-    print("3. Download specific indicator for all countries")
-    print("4. Show download statistics")
-    print("5. Exit")
+    print("1. Download EVERYTHING (planned batch/bulk requests)")
+    print("2. Download EVERYTHING pair by pair (async engine, needs aiohttp)")
+    print("3. Download specific topic")
+    print("4. Download specific indicator for all countries")
+    print("5. Show download statistics")
+    print("6. Rebuild EVERYTHING from the WDI bulk ZIP (offline, minutes)")
+    print("7. Exit")
     
-    choice = input("\nEnter your choice (1-5): ")
+    choice = input("\nEnter your choice (1-7): ")
     
     if choice == "1":
-        confirm = input("\n⚠️  This will download ~5 million data points. Continue? (yes/no): ")
-        if confirm.lower() == "yes":
-            downloader.download_all_parallel(max_workers=5)
+        plan = plan_fetch(downloader)
+        throughput = downloader.planned_throughput()
+        plan.describe(throughput)
+        if not plan.units:
+            print("\n✓ Nothing left to fetch")
+        else:
+            estimate = timedelta(seconds=round(plan.estimate_seconds(throughput)))
+            confirm = input(f"\n⚠️  This will send {plan.requests:,} requests (~{estimate}). "
+                            "Continue? (yes/no): ")
+            if confirm.lower() == "yes":
+                downloader.download_all_parallel(plan=plan)
     
     elif choice == "2":
+        confirm = input("\n⚠️  This sends one request per pending pair (~200 in flight). Continue? (yes/no): ")
+        if confirm.lower() == "yes":
+            try:
+                downloader.download_all_async()
+            except ImportError:
+                print("aiohttp not installed: pip install aiohttp (or use option 1)")
+    
+    elif choice == "3":
         with open(f"{downloader.results_dir}/indicators_by_topic.json", 'r') as f:
             topics = json.load(f)
         
@@ -478,11 +777,11 @@ def main():
         topic_name = list(topics.keys())[topic_num]
         downloader.download_specific_topic(topic_name)
     
-    elif choice == "3":
+    elif choice == "4":
         indicator_code = input("\nEnter indicator code (e.g., NY.GDP.PCAP.CD): ")
         downloader.download_indicator_all_countries(indicator_code)
     
-    elif choice == "4":
+    elif choice == "5":
         if os.path.exists(f"{downloader.results_dir}/download_summary.json"):
             with open(f"{downloader.results_dir}/download_summary.json", 'r') as f:
                 summary = json.load(f)
@@ -491,7 +790,15 @@ def main():
         else:
             print("\nNo download statistics available yet")
     
-    elif choice == "5":
+    elif choice == "6":
+        archive_path = input("\nPath to WDI_CSV.zip (blank to download it): ").strip()
+        if not archive_path:
+            archive_path = "WDI_CSV.zip"
+            print(f"⬇️  Downloading the WDI bulk archive to {archive_path}...")
+            download_wdi_archive(archive_path)
+        downloader.ingest_wdi_archive(archive_path)
+    
+    elif choice == "7":
         print("\nExiting...")
     
     else:
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+World Bank Latest Values
+Most recent non-empty (value, year) per country, computed server-side
+
+Asks the API for mrnev=1 (most recent non-empty value), so each country
+costs one row instead of a multi-year window that is scanned client-side.
+Countries are packed into multi-country requests (see world_bank_batch).
+If an mrnev request does not give a data page (transport failure, an
+API error payload such as a rejected mrnev, or no rows because the
+server ignored it), that batch falls back to a windowed request scanned
+in a single pass.
+
+Usage:
+    from world_bank_latest import fetch_latest_matrix
+    matrix = fetch_latest_matrix(["SP.POP.TOTL"], ["USA", "CHN"], min_year=2020)
+    value, year = matrix["SP.POP.TOTL"]["USA"]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from world_bank_batch import (
+    BASE_URL, DEFAULT_BATCH_SIZE, chunked, entry_country_code, fetch_pages
+)
+
+
+def latest_by_country(rows, min_year=None):
+    """Single pass over API rows -> {country: (value, year)}
+
+    Keeps the newest non-null value per country regardless of row order.
+    Years are returned as the API's date strings.
+    """
+    latest = {}
+    for entry in rows:
+        if entry["value"] is None:
+            continue
+        year = entry["date"]
+        if min_year is not None and int(year[:4]) < min_year:
+            continue
+        code = entry_country_code(entry)
+        if code not in latest or year > latest[code][1]:
+            latest[code] = (entry["value"], year)
+    return latest
+
+
+def fetch_latest_values(indicator_code, country_codes, min_year=None, fallback_date=None,
+                        batch_size=DEFAULT_BATCH_SIZE, client=None, base_url=BASE_URL,
+                        timeout=30, max_retries=3, failures=None):
+    """Latest non-empty value for one indicator across many countries
+
+    Returns {country: (value, year) or None} for every requested country.
+    Values older than min_year count as missing. fallback_date is the
+    window used when the server-side request fails or comes back empty
+    (default: min_year or 2000 up to the current year). Countries whose
+    batch could not be fetched map to None and, if a failures dict is
+    given, are recorded there as {country_code: IOError}.
+    """
+    if fallback_date is None:
+        fallback_date = f"{min_year or 2000}:{datetime.now().year}"
+
+    results = {code: None for code in country_codes}
+
+    for batch in chunked(country_codes, batch_size):
+        url = f"{base_url}/country/{';'.join(batch)}/indicator/{indicator_code}"
+
+        rows = fetch_pages(url, {"format": "json", "mrnev": 1, "per_page": 1000},
+                           client=client, timeout=timeout, max_retries=max_retries, slim=True)
+        # fetch_pages gives None for error payloads too; an empty result may be an ignored mrnev
+        if not rows:
+            rows = fetch_pages(url, {"format": "json", "date": fallback_date, "per_page": 1000},
+                               client=client, timeout=timeout, max_retries=max_retries, slim=True)
+        if rows is None:
+            print(f"Could not fetch {indicator_code} for {len(batch)} countries")
+            if failures is not None:
+                error = IOError(f"Could not fetch {indicator_code} for {len(batch)} countries")
+                failures.update(dict.fromkeys(batch, error))
+            continue
+
+        for code, latest in latest_by_country(rows, min_year).items():
+            if code in results:
+                results[code] = latest
+
+    return results
+
+
+def fetch_latest_matrix(indicator_codes, country_codes, min_year=None, max_workers=8, **kwargs):
+    """Latest values for many indicators, fetched concurrently
+
+    Returns {indicator: {country: (value, year) or None}}.
+    """
+    country_codes = list(country_codes)
+    indicator_codes = list(indicator_codes)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(indicator_codes)))) as executor:
+        columns = executor.map(
+            lambda code: fetch_latest_values(code, country_codes, min_year=min_year, **kwargs),
+            indicator_codes
+        )
+        return dict(zip(indicator_codes, columns))
@@ -4,11 +4,11 @@ World Bank Quick Start - Download key indicators only
 A faster version that downloads just the indicators used in the game
 """
 
-import requests
 import pandas as pd
-import time
 import json
 import os
+from http_client import get
+from world_bank_batch import BASE_URL
 
 # Simplified country list with ISO codes
 COUNTRIES = {
@@ -36,11 +36,11 @@ KEY_INDICATORS = {
 
 def get_world_bank_data(country_code, indicator):
     """Fetch single indicator for a country"""
-    url = f"https://api.worldbank.org/v2/country/{country_code}/indicator/{indicator}"
+    url = f"{BASE_URL}/country/{country_code}/indicator/{indicator}"
     params = {"format": "json", "date": "2020:2023", "per_page": 10}
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = get(url, params=params, timeout=10)
         if response.status_code == 200:
             data = response.json()
             if len(data) > 1:
@@ -71,8 +71,6 @@ def main():
                 print(f"  ✓ {indicator_name}: {value:.2f}" if isinstance(value, float) else f"  ✓ {indicator_name}: {value}")
             else:
                 print(f"  ✗ {indicator_name}: No data")
-                
-            time.sleep(0.5)  # Rate limiting
             
         results.append(country_data)
         print()
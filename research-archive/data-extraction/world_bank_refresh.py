@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+World Bank Incremental Refresh
+Re-fetches only the indicators whose source has published since last run
+
+The World Bank stamps every source (WDI, Doing Business, ...) with a
+"lastupdated" date. A refresh state file records, per indicator, the
+stamp of its source when the indicator was last fetched and the values
+seen at that time:
+
+- stale_indicators() costs one request for all source stamps (plus a
+  one-off metadata lookup per indicator to learn its source)
+- fetch_latest() re-fetches an indicator past the response cache: after a
+  new stamp, the cached body is exactly the old data
+- update() stores freshly fetched values and returns only the cells
+  that actually changed, so callers can apply just those; the stamp is
+  only recorded for an indicator fetch_latest() fetched in full
+- If the stamps cannot be read, every indicator is treated as stale
+
+State layout (JSON):
+    {"indicator_sources": {code: source_id},
+     "indicator_stamps": {code: lastupdated},
+     "values": {code: {country: {"value", "year"} or None}}}
+"""
+
+import json
+import os
+
+import requests
+
+from http_client import HttpClient, get_client
+from world_bank_batch import BASE_URL, is_data_body
+from world_bank_latest import fetch_latest_values
+
+
+class DeltaRefresher:
+    def __init__(self, state_file, client=None, base_url=BASE_URL, fetch_client=None):
+        self.state_file = state_file
+        self.http = client or get_client()
+        # No response cache: data re-fetches must reach the network
+        self.fetch_client = fetch_client or HttpClient()
+        self.base_url = base_url
+        self.stamps = None
+        self.fetched = {}  # indicator -> source stamp read before its network fetch
+
+        if os.path.exists(self.state_file):
+            with open(self.state_file, 'r') as f:
+                self.state = json.load(f)
+        else:
+            self.state = {"indicator_sources": {}, "indicator_stamps": {}, "values": {}}
+
+    @property
+    def values(self):
+        """Last-seen values {indicator: {country: {"value", "year"} or None}}"""
+        return self.state["values"]
+
+    def source_stamps(self):
+        """{source_id: lastupdated} for every World Bank source (one request)
+
+        Bypasses the response cache, which would hide new publications.
+        """
+        if self.stamps is None:
+            response = self.http.fetch(f"{self.base_url}/sources", {"format": "json", "per_page": 500})
+            response.raise_for_status()
+            data = response.json()
+            self.stamps = {
+                str(source["id"]): source.get("lastupdated")
+                for source in (data[1] if len(data) > 1 and data[1] else [])
+            }
+        return self.stamps
+
+    def indicator_source(self, indicator_code):
+        """Source id of an indicator (looked up once, then kept in the state)"""
+        sources = self.state["indicator_sources"]
+        if indicator_code not in sources:
+            response = self.http.get(f"{self.base_url}/indicator/{indicator_code}", {"format": "json"},
+                                     cacheable=is_data_body)
+            response.raise_for_status()
+            data = response.json()
+            sources[indicator_code] = str(data[1][0]["source"]["id"])
+        return sources[indicator_code]
+
+    def current_stamp(self, indicator_code):
+        return self.source_stamps().get(self.indicator_source(indicator_code))
+
+    def stale_indicators(self, indicator_codes):
+        """Indicators that must be re-fetched (new source stamp or never fetched)"""
+        stale = []
+        for code in indicator_codes:
+            if code not in self.state["values"]:
+                stale.append(code)
+                continue
+            try:
+                stamp = self.current_stamp(code)
+            except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+                print(f"⚠️  Could not read the source stamp for {code} ({e}), re-fetching it")
+                stale.append(code)
+                continue
+            if stamp is None or stamp != self.state["indicator_stamps"].get(code):
+                stale.append(code)
+        return stale
+
+    def fetch_latest(self, indicator_code, country_codes, min_year=None):
+        """fetch_latest_values() from the network, bypassing the response cache
+
+        Returns {country: (value, year) or None}; countries whose batch
+        could not be fetched are left out, so update() keeps their old
+        values. The source stamp is read before fetching, so a publication
+        during the fetch is not recorded as seen.
+        """
+        try:
+            stamp = self.current_stamp(indicator_code)
+        except (requests.RequestException, ValueError, KeyError, IndexError):
+            stamp = None
+        failures = {}
+        latest = fetch_latest_values(indicator_code, list(country_codes), min_year=min_year,
+                                     client=self.fetch_client, base_url=self.base_url, failures=failures)
+        if failures:
+            self.fetched.pop(indicator_code, None)
+        else:
+            self.fetched[indicator_code] = stamp
+        return {country: found for country, found in latest.items() if country not in failures}
+
+    def update(self, indicator_code, values):
+        """Store freshly fetched values for an indicator
+
+        values is {country: {"value", "year"} or None}. Returns the changed
+        cells as [(country, old, new)].
+        """
+        previous = self.state["values"].get(indicator_code, {})
+        changes = [
+            (country, previous.get(country), new)
+            for country, new in values.items()
+            if previous.get(country) != new
+        ]
+
+        self.state["values"][indicator_code] = dict(previous, **values)
+        stamp = self.fetched.pop(indicator_code, None)
+        if stamp is not None:
+            self.state["indicator_stamps"][indicator_code] = stamp
+        else:
+            # Not fetched in full from the network, or unknown stamp: the
+            # next incremental run fetches it again
+            self.state["indicator_stamps"].pop(indicator_code, None)
+        return changes
+
+    def save(self):
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
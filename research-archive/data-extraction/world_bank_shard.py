@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Sharded Complete Download
+Splits the full-catalogue download across processes or machines
+
+Every indicator is assigned to one of N shards by consistent hashing
+of its code, so any process can tell which pairs are its own without
+talking to the others. Indicators are assigned whole, not pair by pair, so
+a country/all bulk fetch is made by exactly one shard. A shard downloads
+only its pairs and
+writes shard-local output and progress under
+    world_bank_complete_data/shards/shard_002_of_004/
+A merge step folds all shard directories into the normal store (cube,
+progress bitmap, metadata, summary). Shards can be resumed and
+merged any number of times; merging is idempotent.
+
+Usage:
+    # N local processes, merged when they are all done
+    python world_bank_shard.py launch --shards 4
+
+    # Several machines: run one shard each, copy the shard directories
+    # into one world_bank_complete_data/shards/ and merge there
+    python world_bank_shard.py run --shard 2/4
+    python world_bank_shard.py merge
+
+Every process has its own adaptive rate limiter, so N shards on one
+network start at N times the rate; each backs off on 429s by itself.
+WORLD_BANK_API_URL is inherited by launched shards (e.g. the stand-in).
+"""
+
+import argparse
+import bisect
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from world_bank_full_download import WorldBankCompleteDownloader
+
+DEFAULT_RESULTS_DIR = "world_bank_complete_data"
+VIRTUAL_NODES = 64
+
+
+def stable_hash(key):
+    """64-bit hash that is the same in every process (unlike hash())"""
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class ShardRing:
+    """Consistent-hash ring: each shard owns VIRTUAL_NODES arcs of the ring
+
+    Growing from N to N+1 shards moves only ~1/(N+1) of the indicators, so
+    a partly finished run can be re-sharded without refetching everything.
+    """
+
+    def __init__(self, shard_count, virtual_nodes=VIRTUAL_NODES):
+        points = sorted(
+            (stable_hash(f"shard-{shard}-{node}"), shard)
+            for shard in range(shard_count)
+            for node in range(virtual_nodes)
+        )
+        self.hashes = [point for point, _ in points]
+        self.shards = [shard for _, shard in points]
+
+    def shard_for(self, indicator_code):
+        """Shard that owns an indicator (first ring point clockwise of its hash)"""
+        i = bisect.bisect(self.hashes, stable_hash(indicator_code))
+        return self.shards[i % len(self.shards)]
+
+
+class Shard:
+    def __init__(self, index, count):
+        if not 0 <= index < count:
+            raise ValueError(f"Shard index {index} out of range for {count} shards")
+        self.index = index
+        self.count = count
+        self.ring = ShardRing(count)
+
+    @property
+    def name(self):
+        return f"shard_{self.index:03d}_of_{self.count:03d}"
+
+    def owns(self, indicator_code):
+        """True if this shard fetches the indicator (for every country)"""
+        return self.ring.shard_for(indicator_code) == self.index
+
+    @classmethod
+    def parse(cls, spec):
+        """Shard from "2/4" (index/count, zero-based index)"""
+        index, _, count = spec.partition("/")
+        return cls(int(index), int(count))
+
+    @classmethod
+    def from_name(cls, name):
+        """Shard from its directory name, e.g. "shard_002_of_004" """
+        _, index, _, count = name.split("_")
+        return cls(int(index), int(count))
+
+
+def shard_dirs(results_dir=DEFAULT_RESULTS_DIR):
+    """Shard directories under results_dir/shards (not the launch logs)"""
+    paths = glob.glob(os.path.join(results_dir, "shards", "shard_*_of_*"))
+    return sorted(path for path in paths if os.path.isdir(path))
+
+
+def seed_metadata(downloader, results_dir):
+    """Give a shard the main store's country/indicator lists, if it has them
+
+    All shards then work on the same catalogue and none of them has to
+    fetch the ~17,000 indicator list itself.
+    """
+    for name in ("countries_metadata.json", "indicators_metadata.json", "indicators_by_topic.json"):
+        source = os.path.join(results_dir, name)
+        target = os.path.join(downloader.results_dir, name)
+        if os.path.exists(source) and not os.path.exists(target):
+            shutil.copyfile(source, target)
+
+    for name, flag in (("countries_metadata.json", "countries_fetched"),
+                       ("indicators_metadata.json", "indicators_fetched")):
+        if os.path.exists(os.path.join(downloader.results_dir, name)):
+            downloader.progress[flag] = True
+
+
+def run_shard(shard, results_dir=DEFAULT_RESULTS_DIR, engine="threads", workers=5, concurrency=None):
+    """Download one shard's pairs into its shard directory
+
+    workers sizes the threaded scheduler; concurrency caps the async
+    engine's requests in flight (None keeps the engine's defaults).
+    """
+    downloader = WorldBankCompleteDownloader(results_dir, shard=shard)
+    print(f"🧩 {shard.name}: {downloader.results_dir}/")
+    seed_metadata(downloader, results_dir)
+    downloader.fetch_all_countries()
+    downloader.fetch_all_indicators()
+
+    if engine == "async":
+        if concurrency is None:
+            downloader.download_all_async()
+        else:
+            downloader.download_all_async(max_concurrency=concurrency, per_host_limit=concurrency)
+    else:
+        downloader.download_all_parallel(max_workers=workers)
+
+
+def launch(shard_count, results_dir=DEFAULT_RESULTS_DIR, engine="threads", workers=5, merge=True,
+           concurrency=None):
+    """Run every shard as a local process, then merge"""
+    # Fetch the catalogue once; the shards copy it instead of each fetching it
+    downloader = WorldBankCompleteDownloader(results_dir)
+    downloader.fetch_all_countries()
+    downloader.fetch_all_indicators()
+    downloader.journal.close()
+
+    processes = []
+    for index in range(shard_count):
+        command = [
+            sys.executable, os.path.abspath(__file__), "run",
+            "--shard", f"{index}/{shard_count}",
+            "--results-dir", results_dir,
+            "--engine", engine,
+            "--workers", str(workers)
+        ]
+        if concurrency is not None:
+            command += ["--concurrency", str(concurrency)]
+        os.makedirs(os.path.join(results_dir, "shards"), exist_ok=True)
+        log_path = os.path.join(results_dir, "shards", f"shard_{index:03d}_of_{shard_count:03d}.log")
+        log = open(log_path, 'w')
+        processes.append((index, subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT), log))
+        print(f"🚀 Started shard {index}/{shard_count} (log: {log_path})")
+
+    failed = []
+    for index, process, log in processes:
+        if process.wait() != 0:
+            failed.append(index)
+        log.close()
+    if failed:
+        print(f"❌ Shards {failed} exited with errors; re-run them with 'run --shard i/{shard_count}'")
+        return False
+
+    if merge:
+        merge_shards(results_dir)
+    return True
+
+
+def merge_shards(results_dir=DEFAULT_RESULTS_DIR):
+    """Fold every shard directory into the main store
+
+    Shard cube files are copied into the store's cube (as newer than what
+    it holds) and each indicator partition is compacted; progress bitmaps
+    (and their unreplayed journals) are merged so a later unsharded run
+    skips every pair a shard finished.
+    """
+    paths = shard_dirs(results_dir)
+    if not paths:
+        print(f"❌ No shards found in {results_dir}/shards/")
+        return
+
+    print(f"🔀 Merging {len(paths)} shards into {results_dir}/")
+    store = WorldBankCompleteDownloader(results_dir)
+    copied = 0
+
+    for path in paths:
+        shard_store = WorldBankCompleteDownloader(results_dir, shard=Shard.from_name(os.path.basename(path)))
+        shard_store.journal.close()
+        store.done.update(shard_store.done)
+
+        for name, target in (("countries_metadata.json", store.countries),
+                             ("indicators_metadata.json", store.indicators)):
+            metadata_file = os.path.join(path, name)
+            if os.path.exists(metadata_file):
+                with open(metadata_file, 'r') as f:
+                    target.update(json.load(f))
+
+        copied += store.cube.absorb(shard_store.cube)
+
+    with open(f"{store.results_dir}/countries_metadata.json", 'w') as f:
+        json.dump(store.countries, f, indent=2)
+    with open(f"{store.results_dir}/indicators_metadata.json", 'w') as f:
+        json.dump(store.indicators, f, indent=2)
+    store.organize_indicators_by_topic()
+    store.progress["countries_fetched"] = True
+    store.progress["indicators_fetched"] = True
+
+    store.save_progress()
+    with store.progress_lock:
+        store.journal.compact(wait=True)
+    store.journal.close()
+    # One partition at a time, so memory stays at one indicator's data
+    store.cube.compact()
+    store.create_summary_statistics()
+
+    print(f"✓ Merged {copied:,} cube files: "
+          f"{store.done.completed_count:,} completed, {store.done.failed_count:,} failed pairs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded World Bank complete download")
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="download one shard")
+    run.add_argument("--shard", required=True, help="index/count, e.g. 2/4 (zero-based)")
+
+    start = commands.add_parser("launch", help="run all shards as local processes, then merge")
+    start.add_argument("--shards", type=int, required=True)
+    start.add_argument("--no-merge", action="store_true")
+
+    for command in (run, start):
+        command.add_argument("--results-dir", default=argparse.SUPPRESS)
+        command.add_argument("--engine", choices=("threads", "async"), default="threads")
+        command.add_argument("--workers", type=int, default=5, help="worker threads (threads engine)")
+        command.add_argument("--concurrency", type=int, default=None,
+                             help="requests in flight (async engine; default 200, at most 100 per host)")
+
+    commands.add_parser("merge", help="merge shard directories into the main store")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run_shard(Shard.parse(args.shard), args.results_dir, args.engine, args.workers, args.concurrency)
+    elif args.command == "launch":
+        if not launch(args.shards, args.results_dir, args.engine, args.workers, merge=not args.no_merge,
+                      concurrency=args.concurrency):
+            sys.exit(1)
+    else:
+        merge_shards(args.results_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 """
-World Bank Simple Downloader - No external dependencies
-Uses only built-in Python libraries
+World Bank Simple Downloader - Minimal dependencies
+Uses the shared pooled HTTP client (http_client.py)
 """
 
-import urllib.request
 import json
 import csv
-import time
 from datetime import datetime
+from http_client import get_json
+from world_bank_batch import BASE_URL
 
 # Simplified country list
 COUNTRIES = {
@@ -35,15 +35,14 @@ INDICATORS = {
 }
 
 def fetch_world_bank_data(country_code, indicator_code):
-    """Fetch data from World Bank API using built-in urllib"""
-    url = f"https://api.worldbank.org/v2/country/{country_code}/indicator/{indicator_code}"
+    """Fetch data from World Bank API using the shared HTTP client"""
+    url = f"{BASE_URL}/country/{country_code}/indicator/{indicator_code}"
     params = "?format=json&date=2020:2023&per_page=10"
     
     try:
         print(f"    Fetching {indicator_code}...", end=" ")
         
-        with urllib.request.urlopen(url + params, timeout=10) as response:
-            data = json.loads(response.read().decode())
+        data = get_json(url + params, timeout=10)
             
         if len(data) > 1 and data[1]:
             # Find most recent non-null value
@@ -80,9 +79,6 @@ def main():
             value = fetch_world_bank_data(country_code, indicator_code)
             country_data[indicator_code] = value
             country_data[f"{indicator_code}_name"] = indicator_name
-            
-            # Rate limiting
-            time.sleep(0.5)
         
         results.append(country_data)
     
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Local World Bank API Stand-in
+Serves fixtures in the World Bank v2 JSON shape so every fetcher can run
+offline, end to end, and be benchmarked
+
+Supported (all answers are [pagination metadata, rows]):
+- /v2/country                               country catalogue
+- /v2/country/{codes}                       country metadata (';'-separated)
+- /v2/country/{codes|all}/indicator/{id}    data; date=YYYY[:YYYY], mrv, mrnev,
+                                            per_page, page
+- /v2/indicator, /v2/indicator/{ids}        indicator catalogue / metadata
+- /v2/sources, /v2/topic                    sources (with lastupdated), topics
+- /__stats                                  request counts by status, and
+                                            connections opened
+
+Fault injection: fixed latency (+ jitter), a requests-per-second cap and a
+random share of 429s (both with Retry-After), and a random share of 500s.
+Responses carry an ETag and honour If-None-Match. --http2 serves
+cleartext HTTP/2 (prior knowledge, needs the h2 package) instead of
+HTTP/1.1, for the HTTP/2 transport and benchmark_http2.py.
+
+Fixtures:
+    --fixture FILE   JSON written by --record or fixture_from_store()
+    --store DIR      a WorldBankCompleteDownloader results directory
+    (neither)        synthetic catalogues (--countries N --indicators M);
+                     any country/indicator code gets a deterministic
+                     made-up series, so every script runs against it
+
+Usage:
+    python world_bank_stand_in.py --latency 50 --throttle-rate 0.02
+    WORLD_BANK_API_URL=http://127.0.0.1:8765/v2 python world_bank_downloader.py
+
+    # Record live data for a few indicators into a fixture
+    python world_bank_stand_in.py --record fixture.json SP.POP.TOTL NY.GDP.PCAP.CD
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import socket
+import string
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:
+    h2 = None
+
+INVALID_VALUE = [{"message": [{
+    "id": "120", "key": "Invalid value", "value": "The provided parameter value is not valid"
+}]}]
+INDICATOR_NOT_FOUND = [{"message": [{
+    "id": "175", "key": "Invalid format",
+    "value": "The indicator was not found. It may have been deleted or archived."
+}]}]
+DEFAULT_SOURCE = {"id": "2", "name": "World Development Indicators", "lastupdated": "2025-07-01"}
+
+
+def empty_fixture():
+    return {"sources": [DEFAULT_SOURCE], "countries": [], "indicators": [], "data": {}}
+
+
+def country_record(code, name, iso2="", region="", income=""):
+    """A country catalogue entry in the API's shape"""
+    return {
+        "id": code,
+        "iso2Code": iso2,
+        "name": name,
+        "region": {"id": "", "iso2code": "", "value": region},
+        "adminregion": {"id": "", "iso2code": "", "value": ""},
+        "incomeLevel": {"id": "", "iso2code": "", "value": income},
+        "lendingType": {"id": "", "iso2code": "", "value": ""},
+        "capitalCity": "",
+        "longitude": "",
+        "latitude": ""
+    }
+
+
+def indicator_record(code, name, unit="", source=DEFAULT_SOURCE, note="", topics=()):
+    """An indicator catalogue entry in the API's shape"""
+    return {
+        "id": code,
+        "name": name,
+        "unit": unit,
+        "source": {"id": source["id"], "value": source["name"]},
+        "sourceNote": note,
+        "sourceOrganization": "",
+        "topics": [{"id": str(i + 1), "value": topic} for i, topic in enumerate(topics)]
+    }
+
+
+def synthetic_fixture(n_countries=300, n_indicators=200, seed=0):
+    """Random but reproducible catalogues for benchmarks
+
+    Only the catalogues are built here; series are generated on demand
+    (see StandInApi synthesize), so unknown codes such as the game
+    indicators work too.
+    """
+    rng = random.Random(seed)
+    fixture = empty_fixture()
+
+    codes = set()
+    while len(codes) < n_countries:
+        codes.add("".join(rng.choice(string.ascii_uppercase) for _ in range(3)))
+    for code in sorted(codes):
+        fixture["countries"].append(country_record(code, f"Country {code}", code[:2]))
+
+    topics = ["Economy & Growth", "Health", "Education", "Environment", "Infrastructure"]
+    for i in range(n_indicators):
+        fixture["indicators"].append(indicator_record(f"SYN.{i:05d}", f"Synthetic indicator {i}",
+                                                      topics=[topics[i % len(topics)]]))
+    return fixture
+
+
+def synthetic_values(indicator_code, country_code, start_year=2000, end_year=2024, density=0.8):
+    """Deterministic {year: value} series for one (indicator, country)"""
+    rng = random.Random(f"{indicator_code}/{country_code}")
+    return {
+        str(year): round(rng.uniform(0, 1000), 3)
+        for year in range(start_year, end_year + 1) if rng.random() < density
+    }
+
+
+def fixture_from_store(results_dir):
+    """Fixture from a WorldBankCompleteDownloader results directory"""
+    from cube_store import CubeStore
+
+    fixture = empty_fixture()
+
+    with open(os.path.join(results_dir, "countries_metadata.json"), 'r') as f:
+        for code, info in json.load(f).items():
+            fixture["countries"].append(country_record(
+                code, info["name"], info.get("iso2Code", ""),
+                info.get("region", ""), info.get("incomeLevel", "")
+            ))
+
+    with open(os.path.join(results_dir, "indicators_metadata.json"), 'r') as f:
+        for code, info in json.load(f).items():
+            fixture["indicators"].append(indicator_record(
+                code, info["name"], info.get("unit", ""),
+                note=info.get("sourceNote", ""), topics=info.get("topics", [])
+            ))
+
+    table = CubeStore(os.path.join(results_dir, "cube")).table()
+    for ind_code, country_code, date, value in zip(*(table[column].to_pylist()
+                                                     for column in ("indicator", "country", "date", "value"))):
+        fixture["data"].setdefault(ind_code, {}).setdefault(country_code, {})[date] = value
+
+    return fixture
+
+
+def record_fixture(path, indicator_codes, date="1990:2024"):
+    """Record live API data for some indicators (all countries) into a fixture"""
+    from http_client import get_json
+    from world_bank_batch import BASE_URL, entry_country_code, fetch_pages, iter_indicator_all_countries
+
+    fixture = empty_fixture()
+    fixture["countries"] = fetch_pages(f"{BASE_URL}/country", {"format": "json", "per_page": 500}) or []
+    fixture["sources"] = get_json(f"{BASE_URL}/sources", {"format": "json", "per_page": 500})[1]
+
+    for code in indicator_codes:
+        print(f"  Recording {code}...")
+        fixture["indicators"].extend(get_json(f"{BASE_URL}/indicator/{code}", {"format": "json"})[1])
+        series = {}
+        for rows in iter_indicator_all_countries(code, date=date):
+            for entry in rows:
+                if entry["value"] is not None:
+                    series.setdefault(entry_country_code(entry), {})[entry["date"]] = entry["value"]
+        fixture["data"][code] = series
+
+    with open(path, 'w') as f:
+        json.dump(fixture, f)
+    print(f"✓ Recorded {len(indicator_codes)} indicators, {len(fixture['countries'])} countries to {path}")
+
+
+class StandInApi:
+    """Answers World Bank v2 queries from a fixture"""
+
+    def __init__(self, fixture, synthesize=False):
+        self.synthesize = synthesize
+        self.synthetic_indicators = {}
+        self.lock = threading.Lock()
+        self.sources = fixture["sources"]
+        self.countries = fixture["countries"]
+        self.indicators = {ind["id"]: ind for ind in fixture["indicators"]}
+        self.data = fixture["data"]
+        self.country_by_code = {}
+        for country in self.countries:
+            self.country_by_code[country["id"].upper()] = country
+            if country.get("iso2Code"):
+                self.country_by_code.setdefault(country["iso2Code"].upper(), country)
+        self.source_by_id = {str(source["id"]): source for source in self.sources}
+
+    def page(self, rows, query, extra=None):
+        per_page = int(query.get("per_page", 50))
+        page = int(query.get("page", 1))
+        meta = {
+            "page": page,
+            "pages": max(1, -(-len(rows) // per_page)),
+            "per_page": per_page,
+            "total": len(rows)
+        }
+        meta.update(extra or {})
+        # The real API sends null rather than [] when nothing matches
+        return [meta, rows[(page - 1) * per_page:page * per_page] or None]
+
+    def resolve_countries(self, codes):
+        if codes.lower() == "all":
+            return self.countries
+        countries = []
+        for code in codes.split(";"):
+            country = self.country_by_code.get(code.upper())
+            if country is None:
+                if not self.synthesize:
+                    return None
+                country = country_record(code.upper(), f"Country {code.upper()}")
+            countries.append(country)
+        return countries
+
+    def indicator(self, indicator_code):
+        """Indicator metadata (made up on first use when synthesizing)"""
+        if indicator_code in self.indicators or not self.synthesize:
+            return self.indicators.get(indicator_code)
+        # Kept out of the catalogue so its total stays stable
+        with self.lock:
+            return self.synthetic_indicators.setdefault(
+                indicator_code, indicator_record(indicator_code, f"Synthetic {indicator_code}")
+            )
+
+    def country_values(self, indicator_code, country_code):
+        series = self.data.get(indicator_code, {})
+        if country_code not in series and self.synthesize:
+            return synthetic_values(indicator_code, country_code)
+        return series.get(country_code, {})
+
+    def series_rows(self, countries, indicator_code, query):
+        indicator = self.indicator(indicator_code)
+        all_values = {country["id"]: self.country_values(indicator_code, country["id"]) for country in countries}
+        years = sorted({year for values in all_values.values() for year in values}, reverse=True)
+
+        if "date" in query:
+            start, _, end = query["date"].partition(":")
+            end = end or start
+            years = [str(year) for year in range(int(end[:4]), int(start[:4]) - 1, -1)]
+
+        mrv = int(query.get("mrv", 0))
+        mrnev = int(query.get("mrnev", 0))
+
+        rows = []
+        for country in countries:
+            values = all_values[country["id"]]
+            if mrnev:
+                country_years = [year for year in years if values.get(year) is not None][:mrnev]
+            elif mrv:
+                country_years = years[:mrv]
+            else:
+                country_years = years
+            for year in country_years:
+                rows.append({
+                    "indicator": {"id": indicator_code, "value": indicator["name"]},
+                    "country": {"id": country.get("iso2Code") or country["id"], "value": country["name"]},
+                    "countryiso3code": country["id"],
+                    "date": year,
+                    "value": values.get(year),
+                    "unit": "",
+                    "obs_status": "",
+                    "decimal": 1
+                })
+        return rows
+
+    def answer(self, parts, query):
+        """JSON body for /v2/<parts> (parts already split on '/')"""
+        if parts and parts[0] == "v2":
+            parts = parts[1:]
+        if not parts:
+            return INVALID_VALUE
+
+        if parts[0] in ("source", "sources"):
+            return self.page(self.sources, query)
+
+        if parts[0] == "topic":
+            names = sorted({t["value"] for ind in self.indicators.values() for t in ind["topics"]})
+            topics = [{"id": str(i + 1), "value": name, "sourceNote": ""} for i, name in enumerate(names)]
+            return self.page(topics, query)
+
+        if parts[0] == "indicator":
+            if len(parts) == 1:
+                return self.page(list(self.indicators.values()), query)
+            found = [self.indicator(code) for code in parts[1].split(";") if self.indicator(code)]
+            return self.page(found, query) if found else INDICATOR_NOT_FOUND
+
+        if parts[0] == "country":
+            if len(parts) == 1:
+                return self.page(self.countries, query)
+            countries = self.resolve_countries(parts[1])
+            if countries is None:
+                return INVALID_VALUE
+            if len(parts) == 2:
+                return self.page(countries, query)
+            if len(parts) == 4 and parts[2] == "indicator":
+                indicator = self.indicator(parts[3])
+                if indicator is None:
+                    return INDICATOR_NOT_FOUND
+                source = self.source_by_id.get(indicator["source"]["id"], DEFAULT_SOURCE)
+                rows = self.series_rows(countries, parts[3], query)
+                return self.page(rows, query, {
+                    "sourceid": source["id"],
+                    "lastupdated": source.get("lastupdated")
+                })
+
+        return INVALID_VALUE
+
+
+class FaultInjector:
+    """Latency, rate cap, random 429s and random 500s"""
+
+    def __init__(self, latency=0.0, jitter=0.0, max_rps=None, throttle_rate=0.0,
+                 error_rate=0.0, retry_after=1, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.max_rps = max_rps
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.tokens = float(max_rps or 0)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def delay(self):
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, self.latency + jitter))
+
+    def fault(self):
+        """Status code to fail this request with, or None"""
+        with self.lock:
+            if self.max_rps:
+                now = time.monotonic()
+                self.tokens = min(self.max_rps, self.tokens + (now - self.last_refill) * self.max_rps)
+                self.last_refill = now
+                if self.tokens < 1.0:
+                    return 429
+                self.tokens -= 1.0
+            roll = self.rng.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+
+class RequestStats:
+    """Request counts by status (and "connections"), shared by handler threads"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.lock = threading.Lock()
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counts)
+
+
+def respond(api, faults, stats, target, request_headers):
+    """Answer one GET: (status, headers, body), faults and ETags applied"""
+    url = urlsplit(target)
+    faults.delay()
+
+    if url.path == "/__stats":
+        return 200, {}, json.dumps(stats.snapshot()).encode()
+
+    status = faults.fault()
+    if status is not None:
+        headers = {"Retry-After": str(faults.retry_after)} if status == 429 else {}
+        return status, headers, json.dumps({"error": "injected"}).encode()
+
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+    body = json.dumps(api.answer(parts, query)).encode()
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+    if request_headers.get("if-none-match") == etag:
+        return 304, {"ETag": etag}, b""
+    return 200, {"ETag": etag}, body
+
+
+def make_handler(api, faults, stats):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            stats.count("connections")
+
+        def do_GET(self):
+            request_headers = {name.lower(): value for name, value in self.headers.items()}
+            status, headers, body = respond(api, faults, stats, self.path, request_headers)
+            stats.count(status)
+
+            self.send_response(status)
+            if status != 304:
+                self.send_header("Content-Type", "application/json;charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class Http2Connection:
+    """One cleartext HTTP/2 (prior knowledge) connection to the stand-in
+
+    Each stream is answered on its own thread, so injected latency overlaps
+    across multiplexed requests the way it would on a real server.
+    """
+
+    def __init__(self, sock, api, faults, stats):
+        self.sock = sock
+        self.api = api
+        self.faults = faults
+        self.stats = stats
+        self.conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        # Guards the h2 state machine and the socket; waited on for flow control
+        self.cond = threading.Condition()
+        self.reset_streams = set()
+        self.closed = False
+
+    def flush(self):
+        data = self.conn.data_to_send()
+        if data:
+            self.sock.sendall(data)
+
+    def run(self):
+        with self.cond:
+            self.conn.initiate_connection()
+            self.flush()
+        try:
+            while not self.closed:
+                data = self.sock.recv(65536)
+                if not data:
+                    break
+                with self.cond:
+                    for event in self.conn.receive_data(data):
+                        if isinstance(event, h2.events.RequestReceived):
+                            threading.Thread(target=self.answer, args=(event.stream_id, dict(event.headers)),
+                                             daemon=True).start()
+                        elif isinstance(event, h2.events.StreamReset):
+                            self.reset_streams.add(event.stream_id)
+                        elif isinstance(event, h2.events.ConnectionTerminated):
+                            self.closed = True
+                    self.flush()
+                    self.cond.notify_all()
+        except (OSError, h2.exceptions.ProtocolError):
+            pass
+        finally:
+            with self.cond:
+                self.closed = True
+                self.cond.notify_all()
+            self.sock.close()
+
+    def answer(self, stream_id, request_headers):
+        status, headers, body = respond(self.api, self.faults, self.stats,
+                                        request_headers[":path"], request_headers)
+        self.stats.count(status)
+        response_headers = [(":status", str(status)), ("content-length", str(len(body)))]
+        if status != 304:
+            response_headers.append(("content-type", "application/json;charset=utf-8"))
+        response_headers.extend((name.lower(), value) for name, value in headers.items())
+
+        try:
+            with self.cond:
+                if self.closed or stream_id in self.reset_streams:
+                    return
+                self.conn.send_headers(stream_id, response_headers, end_stream=not body)
+                self.flush()
+
+                sent = 0
+                while sent < len(body):
+                    if self.closed or stream_id in self.reset_streams:
+                        return
+                    window = min(self.conn.local_flow_control_window(stream_id),
+                                 self.conn.max_outbound_frame_size)
+                    if window <= 0:
+                        self.cond.wait()  # for a WINDOW_UPDATE from the reader
+                        continue
+                    chunk = body[sent:sent + window]
+                    sent += len(chunk)
+                    self.conn.send_data(stream_id, chunk, end_stream=sent == len(body))
+                    self.flush()
+        except (OSError, h2.exceptions.ProtocolError, h2.exceptions.StreamClosedError):
+            pass
+
+
+def serve_h2(server_sock, api, faults, stats):
+    while True:
+        sock, _ = server_sock.accept()
+        stats.count("connections")
+        threading.Thread(target=Http2Connection(sock, api, faults, stats).run, daemon=True).start()
+
+
+def serve(fixture, host="127.0.0.1", port=8765, faults=None, synthesize=False, http2=False):
+    """Run the stand-in until interrupted; returns the request counts
+
+    http2=True speaks cleartext HTTP/2 only (clients need prior knowledge,
+    e.g. HTTP_TRANSPORT=http2).
+    """
+    stats = RequestStats()
+    api = StandInApi(fixture, synthesize)
+    faults = faults or FaultInjector()
+
+    print(f"🌍 World Bank stand-in at http://{host}:{port}/v2" + (" (HTTP/2)" if http2 else ""))
+    print(f"   {len(fixture['countries'])} countries, {len(fixture['indicators'])} indicators")
+    print(f"   export WORLD_BANK_API_URL=http://{host}:{port}/v2")
+
+    if http2:
+        if h2 is None:
+            raise SystemExit("--http2 needs the h2 package: pip install h2")
+        server_sock = socket.create_server((host, port), backlog=128)
+        try:
+            serve_h2(server_sock, api, faults, stats)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server_sock.close()
+        print(f"\nRequests by status: {stats.snapshot()}")
+        return stats.snapshot()
+
+    server = ThreadingHTTPServer((host, port), make_handler(api, faults, stats))
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"\nRequests by status: {stats.snapshot()}")
+    return stats.snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local World Bank v2 API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixture", help="fixture JSON file")
+    parser.add_argument("--store", help="WorldBankCompleteDownloader results directory")
+    parser.add_argument("--countries", type=int, default=300, help="synthetic countries")
+    parser.add_argument("--indicators", type=int, default=200, help="synthetic indicators")
+    parser.add_argument("--latency", type=float, default=0.0, help="added latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latency jitter in ms (+/-)")
+    parser.add_argument("--max-rps", type=float, help="429 above this many requests/second")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of random 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of random 500s")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429")
+    parser.add_argument("--seed", type=int, help="seed for injected faults")
+    parser.add_argument("--http2", action="store_true", help="serve cleartext HTTP/2 (prior knowledge)")
+    parser.add_argument("--record", metavar="FILE", help="record live data for INDICATOR... into FILE")
+    parser.add_argument("indicator_codes", nargs="*", metavar="INDICATOR")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixture(args.record, args.indicator_codes)
+        return
+
+    if args.fixture:
+        with open(args.fixture, 'r') as f:
+            fixture = json.load(f)
+    elif args.store:
+        fixture = fixture_from_store(args.store)
+    else:
+        fixture = synthetic_fixture(args.countries, args.indicators)
+
+    faults = FaultInjector(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        max_rps=args.max_rps,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    serve(fixture, args.host, args.port, faults, synthesize=not (args.fixture or args.store),
+          http2=args.http2)
+
+
+if __name__ == "__main__":
+    main()